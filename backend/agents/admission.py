@@ -0,0 +1,209 @@
+import asyncio
+import contextvars
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from utils.logger import get_logger
+from utils.metrics import metrics
+from utils.profiling import PROFILING_ENABLED, profiled
+
+logger = get_logger(__name__)
+
+# Concurrency limits for agent executions
+AGENT_MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", "16"))
+# Per-model limits, e.g. "openai:gpt-4o-mini=8,groq:qwen-qwq-32b=4"
+AGENT_MODEL_CONCURRENCY = os.getenv("AGENT_MODEL_CONCURRENCY", "")
+AGENT_MAX_QUEUE = int(os.getenv("AGENT_MAX_QUEUE", "64"))
+AGENT_QUEUE_TIMEOUT = float(os.getenv("AGENT_QUEUE_TIMEOUT", "30"))
+AGENT_RETRY_AFTER = int(os.getenv("AGENT_RETRY_AFTER", "5"))
+AGENT_WORKER_THREADS = int(
+    os.getenv("AGENT_WORKER_THREADS", str(AGENT_MAX_CONCURRENCY))
+)
+
+# Dedicated pool for blocking agent/LLM calls, separate from the default
+# threadpool used by sync routes such as ingestion
+agent_executor = ThreadPoolExecutor(
+    max_workers=AGENT_WORKER_THREADS, thread_name_prefix="agent"
+)
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request cannot be admitted (queue full or wait timed out).
+    """
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+def parse_model_limits(spec: str) -> dict[str, int]:
+    """
+    Parses a "model=limit,model=limit" string into a dict.
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        model, _, limit = item.rpartition("=")
+        if not model or not limit.isdigit():
+            logger.warning("⚠️ Ignoring invalid model concurrency entry: %s", item)
+            continue
+        limits[model] = int(limit)
+    return limits
+
+
+class AdmissionController:
+    """
+    Bounds concurrent agent executions globally and per model, keeps a bounded
+    wait queue in front of them and serializes requests sharing a session.
+
+    Requests beyond the queue bound are rejected immediately (429); requests
+    that wait longer than the queue timeout are rejected with 503. Both carry
+    a Retry-After hint.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = AGENT_MAX_CONCURRENCY,
+        model_limits: dict[str, int] | None = None,
+        max_queue: int = AGENT_MAX_QUEUE,
+        queue_timeout: float = AGENT_QUEUE_TIMEOUT,
+        retry_after: int = AGENT_RETRY_AFTER,
+    ):
+        self.max_concurrency = max_concurrency
+        self.model_limits = model_limits or {}
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._models: dict[str, asyncio.Semaphore] = {}
+        self._sessions: dict[str, list] = {}  # session_id -> [lock, refcount]
+        self._waiting = 0
+
+    def _model_semaphore(self, model: str) -> asyncio.Semaphore | None:
+        limit = self.model_limits.get(model)
+        if limit is None:
+            return None
+        if model not in self._models:
+            self._models[model] = asyncio.Semaphore(limit)
+        return self._models[model]
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        entry = self._sessions.setdefault(session_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        return entry[0]
+
+    def _release_session(self, session_id: str):
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._sessions[session_id]
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    def _reject(self, status_code: int, reason: str, detail: str):
+        metrics.inc("agent_rejections_total", reason=reason)
+        logger.warning("🚦 Rejected agent request (%s): %s", reason, detail)
+        raise AdmissionRejected(status_code, detail, self.retry_after)
+
+    @asynccontextmanager
+    async def admit(self, model: str, session_id: str | None = None, slots: int = 1):
+        """
+        Waits for a free execution slot, holding it for the duration of the block.
+
+        Args:
+            model (str): Model configuration string used for per-model limits.
+            session_id (str, optional): Requests with the same session run one at a time.
+            slots (int): Slots wanted for parallel executions (e.g. a batch). Only the
+                first is waited for; more are taken only if free right away.
+
+        Yields:
+            int: Number of slots held, between 1 and `slots`.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait times out.
+        """
+        if self._waiting >= self.max_queue:
+            self._reject(429, "queue_full", "Agent is at capacity, try again later.")
+
+        self._waiting += 1
+        metrics.set_gauge("agent_queue_depth", self._waiting)
+        acquired = []
+        start = time.perf_counter()
+
+        # Session lock first so queued same-session requests don't hold slots
+        primitives = []
+        if session_id is not None:
+            primitives.append(self._session_lock(session_id))
+        model_semaphore = self._model_semaphore(model)
+        if model_semaphore is not None:
+            primitives.append(model_semaphore)
+        primitives.append(self._global)
+
+        async def _acquire_all():
+            for primitive in primitives:
+                await primitive.acquire()
+                acquired.append(primitive)
+
+        try:
+            await asyncio.wait_for(_acquire_all(), timeout=self.queue_timeout)
+        except BaseException as e:
+            # Timed out or cancelled (e.g. client disconnect): undo partial acquisition
+            for primitive in reversed(acquired):
+                primitive.release()
+            if session_id is not None:
+                self._release_session(session_id)
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject(
+                    503, "queue_timeout", "Timed out waiting for agent capacity."
+                )
+            raise
+        finally:
+            self._waiting -= 1
+            metrics.set_gauge("agent_queue_depth", self._waiting)
+
+        metrics.observe("agent_queue_wait_seconds", time.perf_counter() - start)
+        # Extra slots never wait, so partial holders can't block each other
+        granted = 1
+        slot_primitives = [p for p in (model_semaphore, self._global) if p is not None]
+        while granted < slots and not any(p.locked() for p in slot_primitives):
+            for primitive in slot_primitives:
+                await primitive.acquire()
+                acquired.append(primitive)
+            granted += 1
+        metrics.add_gauge("agent_in_flight", granted, model=model)
+        try:
+            yield granted
+        finally:
+            metrics.add_gauge("agent_in_flight", -granted, model=model)
+            for primitive in reversed(acquired):
+                primitive.release()
+            if session_id is not None:
+                self._release_session(session_id)
+
+
+async def run_in_agent_executor(fn, *args, **kwargs):
+    """
+    Runs a blocking function on the dedicated agent thread pool,
+    propagating the caller's context variables.
+    """
+    if PROFILING_ENABLED:
+        fn = profiled(fn)
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await loop.run_in_executor(agent_executor, call)
+
+
+# Process-wide controller used by the agent routes
+admission = AdmissionController(
+    model_limits=parse_model_limits(AGENT_MODEL_CONCURRENCY)
+)
@@ -1,4 +1,7 @@
-from agents.graph_builder import GraphBuilder
+import threading
+from typing import Optional
+
+from agents.graph_builder import AGENT_ROUTING_MODEL, DEFAULT_MODEL, GraphBuilder
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -6,17 +9,55 @@ logger = get_logger(__name__)
 
 class AgentLoader:
     """
-    Instantiates and preloads a GraphBuilder agent into memory.
-    Called at application startup.
+    Instantiates and caches GraphBuilder agents, one per model configuration
+    (primary model and optional routing model). The default agent is preloaded
+    at application startup.
 
     Returns:
         GraphBuilder: The initialized agent instance.
     """
 
-    _instance = None
+    # Agent class to build; benchmarks swap in a stand-in implementation
+    agent_class = GraphBuilder
+    _instances = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_agent(
+        cls, model_config: str = DEFAULT_MODEL, routing_model: Optional[str] = None
+    ):
+        """
+        Returns the cached agent for a model configuration, building it on first use.
+
+        Args:
+            model_config (str): Primary model, e.g. 'openai:gpt-4o-mini'.
+            routing_model (str, optional): Fast tool-selection model. Defaults to
+                AGENT_ROUTING_MODEL; pass an empty string to disable routing.
+        """
+        if routing_model is None:
+            routing_model = AGENT_ROUTING_MODEL
+        key = (model_config, routing_model or None)
+        agent = cls._instances.get(key)
+        if agent is None:
+            with cls._lock:
+                agent = cls._instances.get(key)
+                if agent is None:
+                    agent = cls._instances[key] = cls.agent_class(
+                        model_config, routing_model=routing_model
+                    )
+                    logger.info(
+                        "🧠 Built agent for %s (routing: %s)",
+                        model_config,
+                        routing_model or "off",
+                    )
+        return agent
 
     @classmethod
-    def get_agent(cls):
-        if cls._instance is None:
-            cls._instance = GraphBuilder()
-        return cls._instance
+    def cached_agents(cls) -> list:
+        """
+        Returns the model configurations of the agents built so far.
+        """
+        return [
+            {"model": model, "routing_model": routing}
+            for model, routing in list(cls._instances)
+        ]
@@ -1,30 +1,109 @@
+import json
+import os
 import time
-from collections import defaultdict
-from typing import Annotated, List, TypedDict
-
-from langchain_core.chat_history import InMemoryChatMessageHistory
-from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, ToolMessage
-from langchain_core.runnables import RunnableLambda
-from langchain_core.runnables.history import RunnableWithMessageHistory
+from contextvars import ContextVar
+from typing import Annotated, Callable, Iterator, List, Optional, Tuple, TypedDict
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import (
+    AIMessage,
+    AnyMessage,
+    HumanMessage,
+    ToolMessage,
+    message_chunk_to_message,
+)
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_groq import ChatGroq
 from langchain_openai import ChatOpenAI
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import START, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
 
-from utils.logger import get_logger
+from utils.http_clients import provider_client_kwargs
+from utils.logger import PAYLOAD, get_logger
+from utils.metrics import metrics
 
+from .session_store import get_checkpointer, get_session_history
 from .tools import get_tools
 
 logger = get_logger(__name__)
 
-# Global memory store for managing per-session chat histories
-global_memory_store = defaultdict(InMemoryChatMessageHistory)
+DEFAULT_MODEL = "openai:gpt-4o-mini"
+SUPPORTED_MODEL_TYPES = ("openai", "groq")
+
+# Fast model used for tool-selection steps (e.g. 'groq:llama-3.1-8b-instant');
+# empty disables routing, so every step runs on the requested model
+AGENT_ROUTING_MODEL = os.getenv("AGENT_ROUTING_MODEL", "")
+# Models clients may request (comma-separated); one agent is built and cached per
+# model configuration, so the set must be bounded
+AGENT_ALLOWED_MODELS = frozenset(
+    m.strip()
+    for m in os.getenv(
+        "AGENT_ALLOWED_MODELS",
+        ",".join([DEFAULT_MODEL, "groq:qwen-qwq-32b", AGENT_ROUTING_MODEL]),
+    ).split(",")
+    if m.strip()
+)
+# Items of a batch run executed in parallel
+AGENT_BATCH_CONCURRENCY = int(os.getenv("AGENT_BATCH_CONCURRENCY", "8"))
+
+# Receives answer tokens while the current turn runs (set per streaming request)
+_token_sink: ContextVar[Optional[Callable[[str], None]]] = ContextVar(
+    "agent_token_sink", default=None
+)
+
+
+def add_llm_steps(left: List[dict], right: List[dict]) -> List[dict]:
+    """
+    Appends step records; an empty update starts a new turn, so checkpointed
+    sessions don't carry step records over from earlier turns.
+    """
+    return left + right if right else []
 
 
 # Type definition for agent state used in the graph
 class AgentState(TypedDict):
     messages: Annotated[List[AnyMessage], add_messages]
+    # Per-turn LLM step timings and token usage
+    llm_steps: Annotated[List[dict], add_llm_steps]
+
+
+def parse_model_config(model_config: str) -> Tuple[str, str]:
+    """
+    Splits and validates a model configuration string.
+
+    Args:
+        model_config (str): '<provider>:<model>', e.g. 'openai:gpt-4o-mini'.
+
+    Returns:
+        Tuple[str, str]: The provider and model name.
+
+    Raises:
+        ValueError: If the string is malformed or the provider is unsupported.
+    """
+    model_type, _, model_name = (model_config or "").partition(":")
+    if model_type not in SUPPORTED_MODEL_TYPES or not model_name:
+        raise ValueError(
+            f"Unsupported model '{model_config}' (expected '<provider>:<model>' "
+            f"with provider in {SUPPORTED_MODEL_TYPES})."
+        )
+    return model_type, model_name
+
+
+def check_model_allowed(model_config: str):
+    """
+    Rejects models that are not enabled on this server (see AGENT_ALLOWED_MODELS).
+
+    Raises:
+        ValueError: If the model is malformed or not in AGENT_ALLOWED_MODELS.
+    """
+    parse_model_config(model_config)
+    if model_config not in AGENT_ALLOWED_MODELS:
+        raise ValueError(
+            f"Model '{model_config}' is not enabled on this server "
+            f"(allowed: {', '.join(sorted(AGENT_ALLOWED_MODELS))})."
+        )
 
 
 class GraphBuilder:
@@ -32,48 +111,73 @@ class GraphBuilder:
     Constructs a conversational graph using LangGraph with support for memory, LLMs, and tools.
     """
 
-    def __init__(self, model_config: str = "openai:gpt-4o-mini"):
+    def __init__(
+        self,
+        model_config: str = DEFAULT_MODEL,
+        tools: Optional[list] = None,
+        routing_model: Optional[str] = None,
+        checkpointer: Optional[BaseCheckpointSaver] = None,
+    ):
         """
         Initializes the graph builder with a selected LLM and associated tools.
+        Uses the shared cached tools unless an explicit tool list is given.
+
+        With a routing model, tool-selection steps run on that (fast) model and
+        the final answer is synthesized by the primary model.
+
+        Sessions are kept in the configured checkpointer (SESSION_CHECKPOINTER),
+        or in the session history store when no checkpointer is configured.
         """
-        model_type, model_name = model_config.split(":")
-        self.tools = get_tools()
-        self.llm = self._init_llm(model_type, model_name).bind_tools(tools=self.tools)
+        self.model_config = model_config
+        self.routing_model = (
+            routing_model if routing_model and routing_model != model_config else None
+        )
+        self.tools = get_tools() if tools is None else tools
+        self.llm = self._init_llm(*model_config.split(":", 1)).bind_tools(
+            tools=self.tools
+        )
+        self.routing_llm = (
+            self._init_llm(*self.routing_model.split(":", 1)).bind_tools(
+                tools=self.tools
+            )
+            if self.routing_model
+            else None
+        )
         self.tool_node = ToolNode(self.tools)
-        self.graph = self._build_graph()
-
-        graph_input_adapter = RunnableLambda(
-            lambda x: {"messages": add_messages(x["messages"], x["input"])}
+        self.checkpointer = (
+            checkpointer if checkpointer is not None else get_checkpointer()
         )
-
-        self.graph_with_memory = RunnableWithMessageHistory(
-            graph_input_adapter | self.graph,
-            self._get_session_memory,
-            input_messages_key="input",
-            history_messages_key="messages",
+        # Stateless graph (single calls, batches) and, with a checkpointer, the
+        # session graph whose state is persisted per thread (= session id)
+        self.graph = self._build_graph()
+        self.session_graph = (
+            self._build_graph(self.checkpointer) if self.checkpointer else None
         )
 
     @staticmethod
-    def _get_session_memory(session_id: str) -> InMemoryChatMessageHistory:
+    def _get_session_memory(session_id: str) -> BaseChatMessageHistory:
         """
-        Retrieves or creates chat history for a given session.
+        Retrieves or creates chat history for a given session
+        from the configured session store backend.
         """
-        return global_memory_store[session_id]
+        return get_session_history(session_id)
 
     def _init_llm(self, model_type: str, model_name: str):
         """
-        Initializes the selected LLM backend (OpenAI or Groq).
+        Initializes the selected LLM backend (OpenAI or Groq) on the shared
+        HTTP connection pool.
         """
+        client_kwargs = provider_client_kwargs()
         return (
-            ChatGroq(model=model_name)
+            ChatGroq(model=model_name, **client_kwargs)
             if model_type == "groq"
-            else ChatOpenAI(model=model_name)
+            else ChatOpenAI(model=model_name, stream_usage=True, **client_kwargs)
         )
 
-    def _llm_tool_node(self, state: AgentState):
+    @staticmethod
+    def _filter_messages(state: AgentState) -> List[AnyMessage]:
         """
-        Node logic for LLM invocation with message filtering.
-        Filters out invalid or irrelevant messages before invoking the model.
+        Filters out invalid or irrelevant messages before invoking a model.
         """
         raw_messages = state.get("messages", [])
         filtered_messages = [
@@ -85,34 +189,132 @@ class GraphBuilder:
 
         if not filtered_messages:
             raise ValueError("LLM node received no valid messages after filtering.")
+        return filtered_messages
 
-        logger.debug("🤖 Messages going to LLM:\n%s", filtered_messages)
-        start = time.time()
-        response = self.llm.invoke(filtered_messages)
-        logger.info("⏱️ LLM invocation took %.2f seconds", time.time() - start)
+    def _invoke_llm(self, llm, model_config: str, step: str, state: AgentState):
+        """
+        Invokes a model on the filtered state and records the step's latency and
+        token usage, both in the metrics registry and in the turn's `llm_steps`.
+
+        Returns:
+            Tuple[AIMessage, dict]: The model response and its step record.
+        """
+        messages = self._filter_messages(state)
+        logger.debug(
+            "🤖 Sending %d messages to %s (%s)", len(messages), model_config, step
+        )
+        logger.debug("🤖 Messages going to LLM:\n%s", messages, extra=PAYLOAD)
+
+        start = time.perf_counter()
+        on_token = _token_sink.get()
+        if on_token is None or step == "select":
+            response = llm.invoke(messages)
+        else:
+            # Forward answer tokens as they arrive, then merge them into one message
+            merged = None
+            for chunk in llm.stream(messages):
+                if isinstance(chunk.content, str) and chunk.content:
+                    on_token(chunk.content)
+                merged = chunk if merged is None else merged + chunk
+            response = message_chunk_to_message(merged)
+        elapsed = time.perf_counter() - start
+        logger.info(
+            "⏱️ LLM %s step on %s took %.2f seconds", step, model_config, elapsed
+        )
 
-        return {"messages": [response]}
+        usage = getattr(response, "usage_metadata", None) or {}
+        record = {
+            "step": step,
+            "model": model_config,
+            "latency_ms": round(elapsed * 1000, 1),
+            "input_tokens": usage.get("input_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            "tool_calls": len(getattr(response, "tool_calls", None) or []),
+        }
+        metrics.observe("agent_llm_seconds", elapsed, step=step, model=model_config)
+        for kind in ("input", "output"):
+            metrics.inc(
+                "agent_llm_tokens_total",
+                record[f"{kind}_tokens"],
+                step=step,
+                model=model_config,
+                kind=kind,
+            )
+        return response, record
 
-    def _build_graph(self):
+    def _llm_tool_node(self, state: AgentState):
         """
-        Constructs the full agent state graph with conditional logic for tool usage.
+        Node logic for LLM invocation with message filtering (no routing):
+        the primary model both selects tools and answers.
         """
-        builder = StateGraph(AgentState)
-        builder.add_node("tool_calling_llm", self._llm_tool_node)
+        response, record = self._invoke_llm(
+            self.llm, self.model_config, "respond", state
+        )
+        return {"messages": [response], "llm_steps": [record]}
 
-        # Tool node that invokes tools and updates message history
-        def tool_node_with_messages(state: AgentState):
-            result = self.tool_node.invoke(state)
-            new_messages = result.get("messages", [])
-            return {"messages": add_messages(state["messages"], new_messages)}
+    def _select_tools_node(self, state: AgentState):
+        """
+        Routing mode: asks the fast model which tools to call next. A direct
+        answer from the fast model is discarded so that the primary model
+        synthesizes the reply.
+        """
+        response, record = self._invoke_llm(
+            self.routing_llm, self.routing_model, "select", state
+        )
+        return {
+            "messages": [response] if response.tool_calls else [],
+            "llm_steps": [record],
+        }
+
+    def _synthesize_node(self, state: AgentState):
+        """
+        Routing mode: the primary model writes the final answer from the
+        gathered tool results (it may still request another tool).
+        """
+        response, record = self._invoke_llm(
+            self.llm, self.model_config, "synthesize", state
+        )
+        return {"messages": [response], "llm_steps": [record]}
+
+    @staticmethod
+    def _route_after_selection(state: AgentState) -> str:
+        """
+        Goes to the tools if the fast model requested any, otherwise to synthesis.
+        """
+        last = state["messages"][-1]
+        if isinstance(last, AIMessage) and last.tool_calls:
+            return "tools"
+        return "synthesize"
 
-        # Define edges and transitions in the graph
-        builder.add_node("tools", tool_node_with_messages)
-        builder.add_edge(START, "tool_calling_llm")
-        builder.add_conditional_edges("tool_calling_llm", tools_condition)
-        builder.add_edge("tools", "tool_calling_llm")
+    def _build_graph(self, checkpointer: Optional[BaseCheckpointSaver] = None):
+        """
+        Constructs the full agent state graph with conditional logic for tool usage.
+        """
+        builder = StateGraph(AgentState)
 
-        return builder.compile()
+        # Define edges and transitions in the graph. The tool node returns only
+        # its new tool messages; the state reducer appends them.
+        builder.add_node("tools", self.tool_node)
+        if self.routing_llm is None:
+            builder.add_node("tool_calling_llm", self._llm_tool_node)
+            builder.add_edge(START, "tool_calling_llm")
+            builder.add_conditional_edges("tool_calling_llm", tools_condition)
+            builder.add_edge("tools", "tool_calling_llm")
+        else:
+            # Fast model picks tools until it has what it needs, then the
+            # primary model synthesizes the answer
+            builder.add_node("tool_calling_llm", self._select_tools_node)
+            builder.add_node("synthesize", self._synthesize_node)
+            builder.add_edge(START, "tool_calling_llm")
+            builder.add_conditional_edges(
+                "tool_calling_llm",
+                self._route_after_selection,
+                {"tools": "tools", "synthesize": "synthesize"},
+            )
+            builder.add_conditional_edges("synthesize", tools_condition)
+            builder.add_edge("tools", "tool_calling_llm")
+
+        return builder.compile(checkpointer=checkpointer)
 
     def invoke(self, messages: List[AnyMessage]) -> dict:
         """
@@ -120,25 +322,125 @@ class GraphBuilder:
         """
         return self.graph.invoke({"messages": messages})
 
-    def invoke_and_parse(self, messages: List[AnyMessage], session_id: str) -> dict:
+    def invoke_and_parse(
+        self,
+        messages: List[AnyMessage],
+        session_id: str,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> dict:
         """
-        Executes the graph using session-aware memory and parses the response.
+        Executes the graph using session-aware memory and parses the response
+        of the current turn.
+
+        Args:
+            messages (List[AnyMessage]): New messages for this turn.
+            session_id (str): Session whose history is loaded and extended.
+            on_token (Callable[[str], None], optional): Called with each answer token
+                as the model streams it (tool-selection steps are not streamed).
         """
         logger.debug(
             "📨 Session %s has %d messages before invoking", session_id, len(messages)
         )
 
         start = time.time()
-        raw_response = self.graph_with_memory.invoke(
-            {
-                "input": messages,
-                "messages": self._get_session_memory(session_id).messages,
-            },
-            config={"configurable": {"session_id": session_id}},
-        )
+        sink = _token_sink.set(on_token)
+        try:
+            if self.session_graph is not None:
+                turn = self._run_checkpointed_turn(messages, session_id)
+            else:
+                turn = self._run_history_turn(messages, session_id)
+        finally:
+            _token_sink.reset(sink)
         logger.info("🧠 Full graph invocation took %.2f seconds", time.time() - start)
 
-        return self._parse_response(raw_response)
+        return self._parse_response(turn)
+
+    def _run_checkpointed_turn(self, messages: List[AnyMessage], session_id: str):
+        """
+        Runs a turn on the checkpointed session graph: only the new messages are
+        sent, the graph appends them to the state stored for the session's thread.
+        """
+        config = {"configurable": {"thread_id": session_id}}
+        if self.session_graph.get_state(config).next:
+            # The previous turn stopped mid-graph (e.g. worker crash): finish it
+            # from its last checkpoint so no tool call is left unanswered
+            logger.warning("♻️ Resuming interrupted turn of session %s", session_id)
+            self.session_graph.invoke(None, config)
+
+        result = self.session_graph.invoke(
+            {"messages": messages, "llm_steps": []}, config
+        )
+        return {**result, "messages": self._current_turn(result["messages"])}
+
+    def _run_history_turn(self, messages: List[AnyMessage], session_id: str):
+        """
+        Runs a turn on the stateless graph with the session history prepended,
+        then appends only this turn's messages to the history store.
+        """
+        history = self._get_session_memory(session_id)
+        past_messages = history.messages
+        result = self.graph.invoke({"messages": past_messages + messages})
+        turn_messages = result["messages"][len(past_messages) :]
+        history.add_messages(turn_messages)
+        return {**result, "messages": turn_messages}
+
+    @staticmethod
+    def _current_turn(messages: List[AnyMessage]) -> List[AnyMessage]:
+        """
+        Returns the messages from the latest human message onwards.
+        """
+        start = max(
+            (i for i, m in enumerate(messages) if isinstance(m, HumanMessage)),
+            default=0,
+        )
+        return messages[start:]
+
+    def batch_and_parse(
+        self,
+        inputs: List[List[AnyMessage]],
+        max_concurrency: int = AGENT_BATCH_CONCURRENCY,
+    ) -> Iterator[Tuple[int, dict]]:
+        """
+        Runs independent single-turn conversations (no session memory) through the
+        graph with bounded concurrency, yielding parsed responses as they complete.
+
+        Args:
+            inputs (List[List[AnyMessage]]): Messages of each item.
+            max_concurrency (int): Number of items executed in parallel.
+
+        Yields:
+            Tuple[int, dict]: Item index and its parsed response, extended with
+            `latency_ms` and token `usage`, or `{"error": ...}` if the item failed.
+        """
+        start = time.time()
+        timed_graph = RunnableLambda(self._invoke_and_time)
+        for index, output in timed_graph.batch_as_completed(
+            [{"messages": messages} for messages in inputs],
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        ):
+            if isinstance(output, Exception):
+                logger.warning("⚠️ Batch item %d failed: %s", index, output)
+                yield index, {"error": str(output)}
+            else:
+                yield index, output
+        logger.info(
+            "🧠 Batch of %d items took %.2f seconds", len(inputs), time.time() - start
+        )
+
+    def _invoke_and_time(self, state: AgentState, config: RunnableConfig) -> dict:
+        """
+        Invokes the graph for one batch item and parses it, adding its latency and
+        total token usage.
+        """
+        start = time.perf_counter()
+        result = self._parse_response(self.graph.invoke(state, config))
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        result["usage"] = {
+            kind: sum(step[kind] for step in result["llm_steps"])
+            for kind in ("input_tokens", "output_tokens")
+        }
+        return result
 
     def _parse_response(self, response: dict) -> dict:
         """
@@ -147,9 +449,10 @@ class GraphBuilder:
         - Tools used
         - Retrieved data chunks
         - Full intermediate steps
+        - Per-step LLM latency and token usage for this turn
         """
         messages = response.get("messages", [])
-        logger.debug("🧩 Parsed messages: %s", messages)
+        logger.debug("🧩 Parsed messages: %s", messages, extra=PAYLOAD)
 
         final_output = None
         tools_used = []
@@ -161,7 +464,16 @@ class GraphBuilder:
                 intermediate_steps.append({"type": "human", "content": msg.content})
 
             elif isinstance(msg, AIMessage):
-                tool_calls = msg.additional_kwargs.get("tool_calls", [])
+                # Provider-native calls, or LangChain's parsed ones (e.g. stand-ins)
+                tool_calls = msg.additional_kwargs.get("tool_calls") or [
+                    {
+                        "function": {
+                            "name": c["name"],
+                            "arguments": json.dumps(c["args"]),
+                        }
+                    }
+                    for c in msg.tool_calls
+                ]
                 if tool_calls:
                     for call in tool_calls:
                         tool_name = call.get("function", {}).get("name")
@@ -195,10 +507,11 @@ class GraphBuilder:
                         {"tool": tool_name, "type": "text", "data": content}
                     )
         logger.debug("🛠️ Tools used by LLM: %s", tools_used)
-        logger.debug("📦 Retrieved chunks: %s", retrieved_chunks)
+        logger.debug("📦 Retrieved chunks: %s", retrieved_chunks, extra=PAYLOAD)
         return {
             "final_output": final_output,
             "tools_used": tools_used,
             "retrieved_chunks": retrieved_chunks,
             "intermediate_steps": intermediate_steps,
+            "llm_steps": response.get("llm_steps", []),
         }
@@ -0,0 +1,184 @@
+import os
+import re
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from llama_index.core.schema import NodeWithScore
+
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+# How the `vector_retriever` query is expanded before searching:
+#   "single"   - search the query as given (default)
+#   "template" - add rule-based rewrites (keywords only, no question phrasing); no LLM
+#   "llm"      - the rerank LLM writes alternative phrasings of the query
+#   "hyde"     - the rerank LLM writes a hypothetical answer passage, which is
+#                searched alongside the query (Hypothetical Document Embeddings)
+RETRIEVAL_QUERY_MODE = os.getenv("RETRIEVAL_QUERY_MODE", "single").lower()
+RETRIEVAL_QUERY_MODES = ("single", "template", "llm", "hyde")
+# Total number of searches per query, including the original one
+RETRIEVAL_QUERY_VARIANTS = int(os.getenv("RETRIEVAL_QUERY_VARIANTS", "3"))
+# Reciprocal rank fusion constant; larger values flatten the rank weighting
+RETRIEVAL_FUSION_K = int(os.getenv("RETRIEVAL_FUSION_K", "60"))
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can could do does did for from how i in is it me my "
+    "of on or please should tell the their there this to was what when where which "
+    "who whom why will with would you your about into".split()
+)
+
+MULTI_QUERY_PROMPT = (
+    "Write {n} different search queries for retrieving documents that answer the "
+    "question below. Vary the wording and use likely keywords from the documents. "
+    "Return one query per line, without numbering or explanations.\n\n"
+    "Question: {query}"
+)
+
+HYDE_PROMPT = (
+    "Write a short passage (2-4 sentences) from a technical document that answers "
+    "the question below. Do not mention the question.\n\nQuestion: {query}"
+)
+
+
+class QueryVariant(NamedTuple):
+    """
+    One search issued for a query: the text to embed and whether it is embedded
+    as a query or, for hypothetical answers, as a document passage.
+    """
+
+    text: str
+    kind: str = "query"  # "query" | "passage"
+
+
+def template_variants(query: str, limit: int) -> List[str]:
+    """
+    Rule-based rewrites of a query, without LLM calls: the query with its
+    question phrasing removed (closer to how documents state facts), and its
+    keywords only.
+    """
+    statement = re.sub(
+        r"^\s*(?:(?:what|which|who|how|why|when|where)\b\s*(?:\w+\s+)??)?"
+        r"(?:is|are|was|were|does|do|did|can|could|should|would|will)\s+",
+        "",
+        query.strip().rstrip("?"),
+        flags=re.IGNORECASE,
+    )
+    words = re.findall(r"[\w\-\.]+", query.lower())
+    keywords = " ".join(w for w in words if w not in STOPWORDS)
+    seen = {query.strip().rstrip("?").lower()}
+    variants = []
+    for variant in (statement, keywords):
+        if variant and variant.lower() not in seen:
+            seen.add(variant.lower())
+            variants.append(variant)
+    return variants[:limit]
+
+
+def _clean_lines(text: str) -> List[str]:
+    lines = []
+    for line in text.splitlines():
+        line = re.sub(r"^\s*(?:[-*•]|\d+[\.\)])\s*", "", line).strip().strip('"')
+        if line:
+            lines.append(line)
+    return lines
+
+
+class QueryExpander:
+    """
+    Expands a retrieval query into the variants searched in parallel
+    (see RETRIEVAL_QUERY_MODE). The original query is always the first variant;
+    if generating variants fails, only the original query is searched.
+
+    Args:
+        mode (str): One of RETRIEVAL_QUERY_MODES.
+        llm: LlamaIndex LLM used by the "llm" and "hyde" modes.
+        num_variants (int): Total searches per query, including the original.
+    """
+
+    def __init__(
+        self,
+        mode: str = RETRIEVAL_QUERY_MODE,
+        llm=None,
+        num_variants: int = RETRIEVAL_QUERY_VARIANTS,
+    ):
+        if mode not in RETRIEVAL_QUERY_MODES:
+            raise ValueError(
+                f"❌ Unsupported retrieval query mode: {mode} "
+                f"(expected one of {RETRIEVAL_QUERY_MODES})"
+            )
+        if mode in ("llm", "hyde") and llm is None:
+            raise ValueError(f"❌ Retrieval query mode '{mode}' requires an LLM")
+        self.mode = mode
+        self.llm = llm
+        self.num_variants = max(1, num_variants)
+
+    def expand(self, query: str) -> List[QueryVariant]:
+        variants = [QueryVariant(query)]
+        if self.mode == "single" or self.num_variants == 1:
+            return variants
+
+        start = time.perf_counter()
+        try:
+            if self.mode == "template":
+                extra = [
+                    QueryVariant(text)
+                    for text in template_variants(query, self.num_variants - 1)
+                ]
+            elif self.mode == "llm":
+                n = self.num_variants - 1
+                response = self.llm.complete(
+                    MULTI_QUERY_PROMPT.format(n=n, query=query)
+                )
+                extra = [QueryVariant(text) for text in _clean_lines(response.text)[:n]]
+            else:
+                response = self.llm.complete(HYDE_PROMPT.format(query=query))
+                extra = [QueryVariant(response.text.strip(), kind="passage")]
+        except Exception as e:
+            logger.warning("⚠️ Query expansion failed, searching the query only: %s", e)
+            extra = []
+        finally:
+            metrics.observe(
+                "retrieval_stage_seconds", time.perf_counter() - start, stage="rewrite"
+            )
+
+        seen = {query.strip().rstrip("?").lower()}
+        for variant in extra:
+            key = variant.text.strip().rstrip("?").lower()
+            if key and key not in seen:
+                seen.add(key)
+                variants.append(variant)
+        metrics.inc("retrieval_query_variants_total", len(variants), mode=self.mode)
+        logger.debug("🔀 Query variants: %s", [v.text for v in variants])
+        return variants
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[NodeWithScore]],
+    k: int = RETRIEVAL_FUSION_K,
+    top_k: Optional[int] = None,
+) -> List[NodeWithScore]:
+    """
+    Fuses ranked result lists with reciprocal rank fusion: every node scores
+    sum(1 / (k + rank)) over the lists it appears in. Nodes found by several
+    searches are merged into one result.
+
+    Args:
+        result_lists: One ranked node list per search.
+        k (int): Fusion constant.
+        top_k (int, optional): Number of fused nodes to return (all if None).
+
+    Returns:
+        List[NodeWithScore]: Deduplicated nodes ordered by fused score.
+    """
+    scores: Dict[str, float] = {}
+    nodes: Dict[str, NodeWithScore] = {}
+    for results in result_lists:
+        for rank, result in enumerate(results, start=1):
+            node_id = result.node.node_id
+            scores[node_id] = scores.get(node_id, 0.0) + 1.0 / (k + rank)
+            nodes.setdefault(node_id, result)
+
+    ranked = sorted(scores, key=scores.get, reverse=True)[:top_k]
+    return [NodeWithScore(node=nodes[i].node, score=scores[i]) for i in ranked]
@@ -0,0 +1,215 @@
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from llama_index.core import Settings, VectorStoreIndex
+from llama_index.core.postprocessor import LLMRerank
+from llama_index.core.retrievers import VectorIndexRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.core.vector_stores.types import MetadataFilters
+
+from ingestion.index_version import get_index_version
+from utils.logger import get_logger
+from utils.metrics import metrics
+from utils.singleflight import normalize_query
+
+from .multi_query import (
+    RETRIEVAL_QUERY_MODE,
+    QueryExpander,
+    QueryVariant,
+    reciprocal_rank_fusion,
+)
+from .retrieval_cache import RETRIEVAL_CACHE_ENABLED, RetrievalCache
+
+logger = get_logger(__name__)
+
+RETRIEVER_TOP_K = int(os.getenv("RETRIEVER_TOP_K", "5"))
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "true").lower() == "true"
+RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", "5"))
+# Fused candidates handed to the reranker in multi-query mode (default 2x top k)
+RETRIEVAL_FUSED_TOP_K = int(os.getenv("RETRIEVAL_FUSED_TOP_K", "0")) or None
+# Threads running the searches of one multi-query retrieval concurrently
+RETRIEVAL_FANOUT_THREADS = int(os.getenv("RETRIEVAL_FANOUT_THREADS", "8"))
+
+retrieval_executor = ThreadPoolExecutor(
+    max_workers=RETRIEVAL_FANOUT_THREADS, thread_name_prefix="retrieval"
+)
+
+
+class DocumentRetriever:
+    """
+    Vector retrieval pipeline used by the `vector_retriever` tool:
+    query embedding -> Qdrant similarity search -> optional LLM reranking.
+
+    With a query expander, the query is searched while it is expanded into
+    variants, whose searches (embedding + Qdrant) then run concurrently; all
+    results are fused with reciprocal rank fusion and deduplicated before reranking.
+
+    Query embeddings and final node lists are cached; cached results are
+    invalidated whenever the index version changes (see `create_index`).
+    """
+
+    def __init__(
+        self,
+        index: VectorStoreIndex,
+        reranker: Optional[LLMRerank] = None,
+        similarity_top_k: int = RETRIEVER_TOP_K,
+        cache: Optional[RetrievalCache] = None,
+        embed_model=None,
+        expander: Optional[QueryExpander] = None,
+        fused_top_k: Optional[int] = RETRIEVAL_FUSED_TOP_K,
+    ):
+        self.index = index
+        self.similarity_top_k = similarity_top_k
+        self.embed_model = embed_model or Settings.embed_model
+        self.reranker = reranker
+        self.cache = cache
+        self.expander = expander
+        # Without reranking, the fused list is the final result
+        self.fused_top_k = fused_top_k or (
+            2 * similarity_top_k if reranker else similarity_top_k
+        )
+        self.retriever = self._build_retriever()
+
+    def _build_retriever(
+        self, filters: Optional[MetadataFilters] = None
+    ) -> VectorIndexRetriever:
+        return VectorIndexRetriever(
+            index=self.index,
+            similarity_top_k=self.similarity_top_k,
+            embed_model=self.embed_model,
+            filters=filters,
+        )
+
+    def _embed(self, key, query: str, kind: str = "query") -> List[float]:
+        embedding = self.cache.get_embedding(key) if self.cache else None
+        if embedding is None:
+            start = time.perf_counter()
+            if kind == "passage":
+                # Hypothetical answers are compared document-to-document
+                embedding = self.embed_model.get_text_embedding(query)
+            else:
+                embedding = self.embed_model.get_query_embedding(query)
+            metrics.observe(
+                "retrieval_stage_seconds", time.perf_counter() - start, stage="embed"
+            )
+            if self.cache:
+                self.cache.put_embedding(key, embedding)
+        return embedding
+
+    def retrieve(
+        self, query: str, filters: Optional[MetadataFilters] = None
+    ) -> List[NodeWithScore]:
+        """
+        Retrieves (and reranks) the nodes most relevant to the query.
+
+        Args:
+            query (str): Free-text query from the agent.
+            filters (MetadataFilters, optional): Restricts the search to matching
+                payload metadata (evaluated by Qdrant during the search).
+
+        Returns:
+            List[NodeWithScore]: Final ranked nodes.
+        """
+        key = normalize_query(query)
+        results_key = (key, filters.model_dump_json()) if filters else key
+        index_version = get_index_version()
+        if self.cache:
+            cached = self.cache.get_results(results_key, index_version)
+            if cached is not None:
+                logger.debug("🎯 Retrieval cache hit for query")
+                return cached
+
+        retriever = self._build_retriever(filters) if filters else self.retriever
+        if self.expander and self.expander.mode != "single":
+            nodes = self._search_variants(retriever, query)
+        else:
+            nodes = self._search(retriever, QueryVariant(query))
+        query_bundle = QueryBundle(query_str=query)
+
+        if self.reranker and nodes:
+            start = time.perf_counter()
+            nodes = self.reranker.postprocess_nodes(nodes, query_bundle=query_bundle)
+            metrics.observe(
+                "retrieval_stage_seconds", time.perf_counter() - start, stage="rerank"
+            )
+
+        if self.cache:
+            self.cache.put_results(results_key, index_version, nodes)
+        return nodes
+
+    def _search(
+        self, retriever: VectorIndexRetriever, variant: QueryVariant
+    ) -> List[NodeWithScore]:
+        key = normalize_query(variant.text)
+        if variant.kind != "query":
+            key = (variant.kind, key)
+        query_bundle = QueryBundle(
+            query_str=variant.text,
+            embedding=self._embed(key, variant.text, variant.kind),
+        )
+        start = time.perf_counter()
+        nodes = retriever.retrieve(query_bundle)
+        metrics.observe(
+            "retrieval_stage_seconds", time.perf_counter() - start, stage="search"
+        )
+        return nodes
+
+    def _submit_search(self, retriever: VectorIndexRetriever, variant: QueryVariant):
+        return retrieval_executor.submit(
+            contextvars.copy_context().run, self._search, retriever, variant
+        )
+
+    def _search_variants(
+        self, retriever: VectorIndexRetriever, query: str
+    ) -> List[NodeWithScore]:
+        """
+        Searches the query while its variants are generated, then searches the
+        variants concurrently and fuses all results. Only the variant searches
+        wait for the rewrite (e.g. an LLM call).
+        """
+        start = time.perf_counter()
+        futures = [self._submit_search(retriever, QueryVariant(query))]
+        # The original query is always the first variant
+        variants = self.expander.expand(query)
+        futures += [self._submit_search(retriever, v) for v in variants[1:]]
+        result_lists = [future.result() for future in futures]
+        metrics.observe(
+            "retrieval_stage_seconds", time.perf_counter() - start, stage="fanout"
+        )
+        if len(result_lists) == 1:
+            # No variants (e.g. the rewrite failed): nothing to fuse
+            return result_lists[0]
+
+        start = time.perf_counter()
+        nodes = reciprocal_rank_fusion(result_lists, top_k=self.fused_top_k)
+        metrics.observe(
+            "retrieval_stage_seconds", time.perf_counter() - start, stage="fuse"
+        )
+        logger.debug(
+            "🔀 Fused %d results from %d searches into %d nodes",
+            sum(len(r) for r in result_lists),
+            len(variants),
+            len(nodes),
+        )
+        return nodes
+
+
+def build_document_retriever(index: VectorStoreIndex, llm=None) -> DocumentRetriever:
+    """
+    Builds the retriever pipeline from configuration.
+
+    Args:
+        index (VectorStoreIndex): Index backed by the Qdrant collection.
+        llm: LLM used for reranking and LLM query expansion (required when
+            either is enabled).
+
+    Returns:
+        DocumentRetriever: The configured retrieval pipeline.
+    """
+    reranker = LLMRerank(top_n=RERANK_TOP_N, llm=llm) if RERANK_ENABLED else None
+    cache = RetrievalCache() if RETRIEVAL_CACHE_ENABLED else None
+    expander = QueryExpander(llm=llm) if RETRIEVAL_QUERY_MODE != "single" else None
+    return DocumentRetriever(index, reranker=reranker, cache=cache, expander=expander)
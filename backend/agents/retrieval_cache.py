@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from utils.metrics import metrics
+
+RETRIEVAL_CACHE_ENABLED = os.getenv("RETRIEVAL_CACHE_ENABLED", "true").lower() == "true"
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "1024"))
+RETRIEVAL_CACHE_TTL = float(os.getenv("RETRIEVAL_CACHE_TTL", "3600"))
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with a per-entry time-to-live.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RetrievalCache:
+    """
+    Caches query embeddings and final (reranked) retrieval results.
+
+    Results are stored together with the index version they were computed
+    under and are discarded once the index version moves on. Embeddings only
+    depend on the embedding model, so they survive index updates.
+    """
+
+    def __init__(
+        self, max_size: int = RETRIEVAL_CACHE_SIZE, ttl: float = RETRIEVAL_CACHE_TTL
+    ):
+        self.embeddings = LRUCache(max_size, ttl)
+        self.results = LRUCache(max_size, ttl)
+
+    def get_embedding(self, key: Hashable) -> Optional[list[float]]:
+        embedding = self.embeddings.get(key)
+        metrics.inc(
+            "retrieval_cache_lookups_total",
+            kind="embedding",
+            outcome="hit" if embedding is not None else "miss",
+        )
+        return embedding
+
+    def put_embedding(self, key: Hashable, embedding: list[float]):
+        self.embeddings.put(key, embedding)
+
+    def get_results(self, key: Hashable, index_version: int) -> Optional[list]:
+        entry = self.results.get(key)
+        nodes = None
+        if entry is not None and entry[0] == index_version:
+            nodes = entry[1]
+        metrics.inc(
+            "retrieval_cache_lookups_total",
+            kind="results",
+            outcome="hit" if nodes is not None else "miss",
+        )
+        return nodes
+
+    def put_results(self, key: Hashable, index_version: int, nodes: list):
+        self.results.put(key, (index_version, nodes))
+
+    def clear(self):
+        self.embeddings.clear()
+        self.results.clear()
@@ -1,34 +1,72 @@
+import asyncio
+import json
+import os
 import time
+from contextlib import AsyncExitStack
 
 from fastapi import APIRouter, Body, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from langchain_core.messages import HumanMessage
 
 import agents.agent_loader as loader
-from utils.logger import get_logger
+from agents.admission import AdmissionRejected, admission, run_in_agent_executor
+from agents.graph_builder import AGENT_BATCH_CONCURRENCY, check_model_allowed
+from utils.logger import PAYLOAD, get_logger
+from utils.metrics import metrics
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Upper bound on the number of items in one /agent/batch request
+AGENT_BATCH_MAX_ITEMS = int(os.getenv("AGENT_BATCH_MAX_ITEMS", "5000"))
 
-@router.post("/agent/invoke")
-async def run_agent(inputs: dict = Body(...)):
+
+def _get_agent(inputs: dict):
     """
-    Endpoint to invoke an AI agent with user input.
+    Validates the model fields of a request body and returns the matching agent.
 
-    Accepts a JSON body with:
-        - input (str): The user message to process.
-        - model (str, optional): Model configuration string (e.g., 'openai:gpt-4o-mini').
-        - session_id (str, optional): Identifier for session-based memory.
+    Returns:
+        Tuple: (agent, model_config).
+
+    Raises:
+        HTTPException: If a model is invalid or not allowed (400) or the agent
+            cannot be initialized (500).
+    """
+    model_config = inputs.get("model", "openai:gpt-4o-mini")
+    # Omitted: server default (AGENT_ROUTING_MODEL); null or "": routing disabled
+    routing_model = (
+        (inputs.get("routing_model") or "") if "routing_model" in inputs else None
+    )
+
+    try:
+        check_model_allowed(model_config)
+        if routing_model:
+            check_model_allowed(routing_model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Check if the agent instance is initialized
+    try:
+        return loader.AgentLoader.get_agent(model_config, routing_model), model_config
+    except Exception:
+        logger.exception("❌ Agent initialization failed.")
+        raise HTTPException(status_code=500, detail="Agent not ready.")
+
+
+def _prepare_agent_request(inputs: dict):
+    """
+    Validates an agent request body and looks up the agent for its models.
 
     Returns:
-        dict: Parsed output from the agent including responses, tools used, etc.
+        Tuple: (agent, messages, model_config, session_id).
 
     Raises:
-        HTTPException: If input is invalid or agent execution fails.
+        HTTPException: If input or model is invalid (400) or the agent cannot be
+            initialized (500).
     """
     # Extract input parameters
     user_input = inputs.get("input", "")
-    model_config = inputs.get("model", "openai:gpt-4o-mini")
     session_id = inputs.get("session_id", "default")
 
     # Handle nested input payloads
@@ -41,25 +79,272 @@ async def run_agent(inputs: dict = Body(...)):
             status_code=400, detail="Field 'input' must be a non-empty string."
         )
 
-    # Check if the agent instance is initialized
-    try:
-        agent = loader.AgentLoader.get_agent()
-    except Exception:
-        logger.exception("❌ Agent initialization failed.")
-        raise HTTPException(status_code=500, detail="Agent not ready.")
+    agent, model_config = _get_agent(inputs)
 
     # Construct message list for the agent
     messages = [HumanMessage(content=user_input)]
     logger.info(
-        "💬 Session %s | Model: %s | Input: %s", session_id, model_config, user_input
+        "💬 Session %s | Model: %s | Routing: %s | Input: %d chars",
+        session_id,
+        model_config,
+        agent.routing_model or "off",
+        len(user_input),
+    )
+    logger.debug("💬 Input: %s", user_input, extra=PAYLOAD)
+    return agent, messages, model_config, session_id
+
+
+def _rejected(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=e.status_code,
+        detail=e.detail,
+        headers={"Retry-After": str(e.retry_after)},
     )
 
+
+def _ndjson(event: dict) -> str:
+    return json.dumps(jsonable_encoder(event)) + "\n"
+
+
+async def _admit_for_streaming(
+    model_config: str, session_id: str | None = None, slots: int = 1
+):
+    """
+    Takes execution slots before a streaming response starts, so capacity
+    errors keep their 429/503 status. The caller must close the returned stack.
+
+    Returns:
+        Tuple: (stack holding the slots, number of slots granted).
+    """
+    slot = AsyncExitStack()
     try:
-        # Invoke the agent and parse the response
-        start = time.time()
-        result = agent.invoke_and_parse(messages, session_id=session_id)
+        granted = await slot.enter_async_context(
+            admission.admit(model_config, session_id, slots)
+        )
+    except AdmissionRejected as e:
+        raise _rejected(e)
+    return slot, granted
+
+
+def _run_in_background(
+    slot: AsyncExitStack, events: asyncio.Queue, label: str, fn, *args, **kwargs
+) -> asyncio.Future:
+    """
+    Runs a blocking agent call on the agent executor. Puts None on `events` once it
+    is done, and only then releases the execution slot (even if the client left).
+    """
+
+    def on_done(task: asyncio.Future):
+        asyncio.ensure_future(slot.aclose())
+        error = "cancelled" if task.cancelled() else task.exception()
+        if error:
+            logger.error("❌ Agent execution failed for %s: %s", label, error)
+        events.put_nowait(None)
+
+    task = asyncio.ensure_future(run_in_agent_executor(fn, *args, **kwargs))
+    task.add_done_callback(on_done)
+    return task
+
+
+@router.post("/agent/invoke")
+async def run_agent(inputs: dict = Body(...)):
+    """
+    Endpoint to invoke an AI agent with user input.
+
+    Accepts a JSON body with:
+        - input (str): The user message to process.
+        - model (str, optional): Model configuration string (e.g., 'openai:gpt-4o-mini').
+        - session_id (str, optional): Identifier for session-based memory.
+        - routing_model (str, optional): Fast model for tool-selection steps, with the
+          final answer synthesized by `model`. Defaults to AGENT_ROUTING_MODEL;
+          null or "" disables routing for this request.
+
+    Returns:
+        dict: Parsed output from the agent including responses, tools used, etc.
+
+    Raises:
+        HTTPException: If input or model is invalid, the agent is at capacity (429/503 with
+            Retry-After) or agent execution fails.
+    """
+    agent, messages, model_config, session_id = _prepare_agent_request(inputs)
+
+    try:
+        # Wait for an execution slot, then run the blocking agent call off the event loop
+        async with admission.admit(model_config, session_id):
+            start = time.time()
+            result = await run_in_agent_executor(
+                agent.invoke_and_parse, messages, session_id=session_id
+            )
         logger.info("✅ Agent response completed in %.2fs", time.time() - start)
         return result
+    except AdmissionRejected as e:
+        raise _rejected(e)
     except Exception as e:
         logger.exception("❌ Agent execution failed for session: %s", session_id)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/agent/stream")
+async def stream_agent(inputs: dict = Body(...)):
+    """
+    Same as `/agent/invoke`, but streams the answer as newline-delimited JSON.
+
+    Events:
+        - {"type": "token", "content": str}: Answer tokens as the model generates them.
+        - {"type": "result", ...}: The full `/agent/invoke` payload once the turn is done.
+        - {"type": "error", "detail": str}: Execution failed after streaming started.
+
+    Raises:
+        HTTPException: Before streaming starts, with the same status codes as
+            `/agent/invoke` (400, 429/503 with Retry-After, 500).
+    """
+    agent, messages, model_config, session_id = _prepare_agent_request(inputs)
+
+    slot, _ = await _admit_for_streaming(model_config, session_id)
+
+    loop = asyncio.get_running_loop()
+    tokens: asyncio.Queue = asyncio.Queue()
+    start = time.time()
+
+    def on_token(text: str):
+        loop.call_soon_threadsafe(tokens.put_nowait, text)
+
+    task = _run_in_background(
+        slot,
+        tokens,
+        f"session {session_id}",
+        agent.invoke_and_parse,
+        messages,
+        session_id=session_id,
+        on_token=on_token,
+    )
+
+    async def events():
+        first = True
+        while (token := await tokens.get()) is not None:
+            if first:
+                metrics.observe(
+                    "agent_first_token_seconds", time.time() - start, model=model_config
+                )
+                first = False
+            yield _ndjson({"type": "token", "content": token})
+
+        error = "cancelled" if task.cancelled() else task.exception()
+        if error:
+            yield _ndjson({"type": "error", "detail": str(error)})
+            return
+        logger.info("✅ Agent stream completed in %.2fs", time.time() - start)
+        yield _ndjson({"type": "result", **task.result()})
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.post("/agent/batch")
+async def batch_agent(inputs: dict = Body(...)):
+    """
+    Runs many independent questions through the agent (e.g. evaluation sets) and
+    streams the results back as newline-delimited JSON, in completion order.
+    Items are single-turn and use no session memory.
+
+    Accepts a JSON body with:
+        - inputs (list): Questions, each a string or {"id": ..., "input": str}.
+        - model, routing_model (str, optional): As for `/agent/invoke`.
+        - max_concurrency (int, optional): Items run in parallel, at most
+          AGENT_BATCH_CONCURRENCY (the default). Each parallel item holds an
+          execution slot, so fewer run in parallel when the agent is busy.
+
+    Events:
+        - {"type": "item", "index": int, "id": ..., ...}: The `/agent/invoke` payload
+          plus `latency_ms` and token `usage`, or `error` if the item failed.
+        - {"type": "summary", ...}: Item and error counts, wall time, total usage.
+
+    Raises:
+        HTTPException: Before streaming starts, if the inputs are invalid or too many
+            (400), or the agent is at capacity (429/503 with Retry-After).
+    """
+    items = inputs.get("inputs")
+    if not isinstance(items, list) or not items:
+        raise HTTPException(
+            status_code=400, detail="Field 'inputs' must be a non-empty list."
+        )
+    if len(items) > AGENT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {AGENT_BATCH_MAX_ITEMS} inputs per batch.",
+        )
+
+    ids, messages = [], []
+    for index, item in enumerate(items):
+        item = item if isinstance(item, dict) else {"input": item}
+        text = item.get("input")
+        if not isinstance(text, str) or not text.strip():
+            raise HTTPException(
+                status_code=400,
+                detail=f"Input {index}: 'input' must be a non-empty string.",
+            )
+        ids.append(item.get("id", index))
+        messages.append([HumanMessage(content=text)])
+
+    max_concurrency = inputs.get("max_concurrency") or AGENT_BATCH_CONCURRENCY
+    if not isinstance(max_concurrency, int) or max_concurrency < 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Field 'max_concurrency' must be a positive integer.",
+        )
+    max_concurrency = min(max_concurrency, AGENT_BATCH_CONCURRENCY)
+
+    agent, model_config = _get_agent(inputs)
+
+    # One execution slot per item running in parallel: the batch waits for one slot
+    # and runs with as many more as are free, so it never exceeds the model's limits
+    slot, max_concurrency = await _admit_for_streaming(
+        model_config, slots=min(max_concurrency, len(items))
+    )
+    logger.info(
+        "📦 Batch | Model: %s | Routing: %s | %d items, concurrency %d",
+        model_config,
+        agent.routing_model or "off",
+        len(items),
+        max_concurrency,
+    )
+
+    loop = asyncio.get_running_loop()
+    results: asyncio.Queue = asyncio.Queue()
+    start = time.time()
+
+    def run_batch():
+        for index, result in agent.batch_and_parse(messages, max_concurrency):
+            loop.call_soon_threadsafe(results.put_nowait, (index, result))
+
+    task = _run_in_background(slot, results, "batch", run_batch)
+
+    async def events():
+        errors, usage = 0, {"input_tokens": 0, "output_tokens": 0}
+        while (entry := await results.get()) is not None:
+            index, result = entry
+            if "error" in result:
+                errors += 1
+            else:
+                for kind in usage:
+                    usage[kind] += result["usage"][kind]
+            metrics.inc(
+                "agent_batch_items_total",
+                outcome="error" if "error" in result else "ok",
+            )
+            yield _ndjson({"type": "item", "index": index, "id": ids[index], **result})
+
+        wall = time.time() - start
+        logger.info("✅ Batch of %d items completed in %.2fs", len(items), wall)
+        summary = {
+            "type": "summary",
+            "items": len(items),
+            "errors": errors,
+            "wall_ms": round(wall * 1000, 1),
+            "usage": usage,
+        }
+        error = "cancelled" if task.cancelled() else task.exception()
+        if error:
+            summary["error"] = str(error)
+        yield _ndjson(summary)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
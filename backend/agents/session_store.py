@@ -0,0 +1,222 @@
+import json
+import os
+import sqlite3
+from collections import defaultdict
+from functools import lru_cache
+from typing import Sequence
+
+from langchain_core.chat_history import (
+    BaseChatMessageHistory,
+    InMemoryChatMessageHistory,
+)
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Session state backend: "memory" (single process), "sqlite" (shared by workers
+# on one machine) or "redis" (shared across replicas)
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "memory").lower()
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", "./sessions.sqlite3")
+SESSION_STORE_URL = os.getenv("SESSION_STORE_URL", "redis://localhost:6379/0")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "0")) or None
+
+# LangGraph checkpointer holding session state instead of the history store above:
+# "none" (use the history store), "memory" (single process) or "sqlite" (shared by
+# workers on one machine, needs `langgraph-checkpoint-sqlite`)
+SESSION_CHECKPOINTER = os.getenv("SESSION_CHECKPOINTER", "none").lower()
+SESSION_CHECKPOINT_PATH = os.getenv("SESSION_CHECKPOINT_PATH", "./checkpoints.sqlite3")
+
+# Global memory store for managing per-session chat histories (memory backend)
+global_memory_store = defaultdict(InMemoryChatMessageHistory)
+
+# SQLite database files whose schema has already been created by this process
+_initialized_db_paths = set()
+
+
+class SQLiteChatMessageHistory(BaseChatMessageHistory):
+    """
+    Chat history persisted in a local SQLite database.
+
+    Every call opens a short-lived connection, so the same database file can be
+    shared safely by several worker processes on one machine (WAL mode).
+    """
+
+    def __init__(self, session_id: str, db_path: str = SESSION_STORE_PATH):
+        self.session_id = session_id
+        self.db_path = db_path
+        if db_path not in _initialized_db_paths:
+            self._create_schema()
+            _initialized_db_paths.add(db_path)
+
+    def _create_schema(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS message_store ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "session_id TEXT NOT NULL, "
+                    "message TEXT NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_message_store_session "
+                    "ON message_store (session_id)"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @property
+    def messages(self) -> list[BaseMessage]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT message FROM message_store WHERE session_id = ? ORDER BY id",
+                (self.session_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return messages_from_dict([json.loads(row[0]) for row in rows])
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO message_store (session_id, message) VALUES (?, ?)",
+                    [
+                        (self.session_id, json.dumps(message_to_dict(m)))
+                        for m in messages
+                    ],
+                )
+        finally:
+            conn.close()
+
+    def clear(self) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "DELETE FROM message_store WHERE session_id = ?", (self.session_id,)
+                )
+        finally:
+            conn.close()
+
+
+def get_session_history(session_id: str) -> BaseChatMessageHistory:
+    """
+    Retrieves or creates chat history for a given session from the configured backend.
+
+    Args:
+        session_id (str): Conversation identifier.
+
+    Returns:
+        BaseChatMessageHistory: History object backed by memory, SQLite or Redis.
+    """
+    if SESSION_STORE_BACKEND == "sqlite":
+        return SQLiteChatMessageHistory(session_id, db_path=SESSION_STORE_PATH)
+
+    if SESSION_STORE_BACKEND == "redis":
+        try:
+            from langchain_community.chat_message_histories import (
+                RedisChatMessageHistory,
+            )
+        except ImportError as e:
+            raise ImportError(
+                "The redis session backend requires the `redis` package."
+            ) from e
+        return RedisChatMessageHistory(
+            session_id, url=SESSION_STORE_URL, ttl=SESSION_TTL_SECONDS
+        )
+
+    if SESSION_STORE_BACKEND != "memory":
+        logger.warning(
+            "⚠️ Unknown SESSION_STORE_BACKEND '%s', falling back to memory.",
+            SESSION_STORE_BACKEND,
+        )
+    return global_memory_store[session_id]
+
+
+@lru_cache(maxsize=None)
+def get_checkpointer(backend: str = SESSION_CHECKPOINTER):
+    """
+    Returns the process-wide LangGraph checkpointer for session state.
+
+    Args:
+        backend (str): "none", "memory" or "sqlite".
+
+    Returns:
+        BaseCheckpointSaver | None: The checkpointer, or None when sessions are kept
+        in the message history store.
+    """
+    if backend == "memory":
+        from langgraph.checkpoint.memory import MemorySaver
+
+        return MemorySaver()
+
+    if backend == "sqlite":
+        try:
+            from langgraph.checkpoint.sqlite import SqliteSaver
+        except ImportError as e:
+            raise ImportError(
+                "The sqlite checkpointer requires the `langgraph-checkpoint-sqlite` package."
+            ) from e
+        # One connection shared by the agent threads; the saver serializes access
+        conn = sqlite3.connect(
+            SESSION_CHECKPOINT_PATH, check_same_thread=False, timeout=30
+        )
+        logger.info("💾 Session checkpoints stored in %s", SESSION_CHECKPOINT_PATH)
+        return SqliteSaver(conn)
+
+    if backend != "none":
+        logger.warning(
+            "⚠️ Unknown SESSION_CHECKPOINTER '%s', using the session history store.",
+            backend,
+        )
+    return None
+
+
+def get_session_store_stats() -> dict:
+    """
+    Returns the size of the session state held by this process, for the admin
+    memory endpoint.
+
+    Returns:
+        dict: Session and message counts per configured backend.
+    """
+    stats = {"backend": SESSION_STORE_BACKEND}
+    if SESSION_STORE_BACKEND == "sqlite" and os.path.exists(SESSION_STORE_PATH):
+        conn = sqlite3.connect(SESSION_STORE_PATH, timeout=30)
+        try:
+            sessions, messages = conn.execute(
+                "SELECT COUNT(DISTINCT session_id), COUNT(*) FROM message_store"
+            ).fetchone()
+        finally:
+            conn.close()
+        stats.update(
+            sessions=sessions,
+            messages=messages,
+            file_bytes=os.path.getsize(SESSION_STORE_PATH),
+        )
+    elif SESSION_STORE_BACKEND != "redis":
+        stats.update(
+            sessions=len(global_memory_store),
+            messages=sum(len(h.messages) for h in list(global_memory_store.values())),
+        )
+
+    checkpointer = get_checkpointer() if SESSION_CHECKPOINTER != "none" else None
+    if checkpointer is not None:
+        stats["checkpointer"] = {"backend": SESSION_CHECKPOINTER}
+        if hasattr(checkpointer, "storage"):
+            stats["checkpointer"]["threads"] = len(checkpointer.storage)
+        elif os.path.exists(SESSION_CHECKPOINT_PATH):
+            stats["checkpointer"]["file_bytes"] = os.path.getsize(
+                SESSION_CHECKPOINT_PATH
+            )
+    return stats
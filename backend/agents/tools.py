@@ -1,18 +1,102 @@
-from langchain.agents import Tool
+import json
+import logging
+import os
+from datetime import datetime
+from inspect import signature
+from typing import Any, Literal, Optional
+
 from langchain_community.tools import ArxivQueryRun, WikipediaQueryRun
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_community.utilities import ArxivAPIWrapper, WikipediaAPIWrapper
-from llama_index.core.postprocessor import LLMRerank
-from llama_index.core.retrievers import VectorIndexRetriever
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool, StructuredTool
 from llama_index.llms.openai import OpenAI
+from pydantic import BaseModel, Field
 
 from ingestion.index_builder import load_index
-from utils.logger import get_logger
+from ingestion.metadata import build_metadata_filters
+from utils.http_clients import provider_client_kwargs
+from utils.logger import PAYLOAD, get_logger
+from utils.singleflight import SingleFlight, normalize_query
+
+from .retrieval import build_document_retriever
 
 logger = get_logger(__name__)
 
 # Module-level cache to avoid rebuilding tools multiple times
 _cached_tools = None
+# Retriever behind the cached `vector_retriever` tool (for memory stats)
+_document_retriever = None
+
+# Share one in-flight call between concurrent identical tool/retriever calls
+COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "true").lower() == "true"
+retriever_flight = SingleFlight("vector_retriever")
+tool_flight = SingleFlight("external_tools")
+
+
+class CoalescedTool(BaseTool):
+    """
+    Wraps an external tool so that concurrent calls with identical arguments
+    share a single in-flight execution.
+    """
+
+    tool: BaseTool
+
+    def __init__(self, tool: BaseTool, **kwargs: Any):
+        super().__init__(
+            tool=tool,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            response_format=tool.response_format,
+            handle_tool_error=tool.handle_tool_error,
+            **kwargs,
+        )
+
+    def _run(
+        self, *args: Any, config: RunnableConfig, run_manager=None, **kwargs: Any
+    ) -> Any:
+        key = (self.name, json.dumps([args, kwargs], sort_keys=True, default=str))
+
+        # Forward the callback manager/config only if the wrapped tool accepts them
+        params = signature(self.tool._run).parameters
+        if "run_manager" in params:
+            kwargs["run_manager"] = run_manager
+        if "config" in params:
+            kwargs["config"] = config
+        return tool_flight.do(key, lambda: self.tool._run(*args, **kwargs))
+
+
+def coalesce(tool: BaseTool) -> BaseTool:
+    """
+    Returns the tool wrapped with request coalescing, unless disabled via config.
+    """
+    return CoalescedTool(tool) if COALESCE_REQUESTS else tool
+
+
+class VectorRetrieverInput(BaseModel):
+    """
+    Arguments of the `vector_retriever` tool. Filters narrow the search to
+    matching documents (indexed Qdrant payload fields).
+    """
+
+    query: str = Field(description="What to search for in the documents.")
+    source_type: Optional[Literal["docs", "sql", "website", "crawl"]] = Field(
+        None,
+        description="Only search one kind of source: uploaded files ('docs'), "
+        "FAQ entries ('sql') or web pages ('website', 'crawl').",
+    )
+    filename: Optional[str] = Field(
+        None, description="Words from the file name, e.g. 'thesis' or 'report 2024'."
+    )
+    source_uri: Optional[str] = Field(
+        None, description="Exact S3 URI or page URL of the document."
+    )
+    ingested_after: Optional[datetime] = Field(
+        None,
+        description="ISO date or date-time (UTC unless an offset is given); only "
+        "search documents added after it.",
+    )
 
 
 def build_tools():
@@ -24,50 +108,83 @@ def build_tools():
     Returns:
         list: A list of LangChain-compatible Tool objects.
     """
+    global _document_retriever
     tools = []
 
     # Add API tools
     tools.append(
-        WikipediaQueryRun(
-            api_wrapper=WikipediaAPIWrapper(top_k_results=1, doc_content_chars_max=200)
+        coalesce(
+            WikipediaQueryRun(
+                api_wrapper=WikipediaAPIWrapper(
+                    top_k_results=1, doc_content_chars_max=200
+                )
+            )
         )
     )
     tools.append(
-        ArxivQueryRun(
-            api_wrapper=ArxivAPIWrapper(top_k_results=1, doc_content_chars_max=200)
+        coalesce(
+            ArxivQueryRun(
+                api_wrapper=ArxivAPIWrapper(top_k_results=1, doc_content_chars_max=200)
+            )
         )
     )
-    tools.append(TavilySearchResults())
+    tools.append(coalesce(TavilySearchResults()))
 
     try:
         # Load pre-existing vector index from Qdrant Cloud
         index = load_index()
         if index:
-            # Retretiever with LLM reranking
-            llm = OpenAI(model="gpt-4o-mini")  # TODO: Make this configurable
-            reranker = LLMRerank(top_n=5, llm=llm)
-
-            retriever = VectorIndexRetriever(
-                index=index, similarity_top_k=5, postprocessors=[reranker]
-            )
+            # Retriever with LLM reranking and embedding/result caching
+            llm = OpenAI(
+                model="gpt-4o-mini", **provider_client_kwargs("llama_index")
+            )  # TODO: Make this configurable
+            retriever = _document_retriever = build_document_retriever(index, llm=llm)
 
             # Wrapper function for retrieval with logging
-            def query_debug(query: str):
-                logger.debug(f"🧠 Invoked vector retriever with query: {query}")
-                nodes = retriever.retrieve(query)
+            def query_debug(
+                query: str,
+                source_type: Optional[str] = None,
+                filename: Optional[str] = None,
+                source_uri: Optional[str] = None,
+                ingested_after: Optional[datetime] = None,
+            ):
+                logger.debug("🧠 Invoked vector retriever with query: %s", query)
+                filters = build_metadata_filters(
+                    source_type, filename, source_uri, ingested_after
+                )
+                if filters:
+                    logger.debug("🧠 Retrieval filters: %s", filters.filters)
+                if COALESCE_REQUESTS:
+                    key = normalize_query(query)
+                    if filters:
+                        key = (key, filters.model_dump_json())
+                    nodes = retriever_flight.do(
+                        key, lambda: retriever.retrieve(query, filters=filters)
+                    )
+                else:
+                    nodes = retriever.retrieve(query, filters=filters)
                 if not nodes:
                     logger.warning("⚠️ No nodes retrieved from Qdrant.")
                     return "Empty Response"
-                for i, node in enumerate(nodes):
-                    logger.debug(f"🔍 Node {i+1}: {node.get_text()[:300]}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    for i, node in enumerate(nodes):
+                        logger.debug(
+                            "🔍 Node %d: %s",
+                            i + 1,
+                            node.get_text()[:300],
+                            extra=PAYLOAD,
+                        )
                 return "\n---\n".join([node.get_text() for node in nodes])
 
-            retriever_tool = Tool(
-                name="vector_retriever",
+            retriever_tool = StructuredTool.from_function(
                 func=query_debug,
+                name="vector_retriever",
                 description=(
-                    "Use this tool to search and summarize uploaded documents like PDFs or master theses."
+                    "Use this tool to search and summarize uploaded documents like PDFs or master theses. "
+                    "Set the optional filters when the question is about a specific file, "
+                    "source or time range; leave them empty otherwise."
                 ),
+                args_schema=VectorRetrieverInput,
             )
 
             tools.append(retriever_tool)
@@ -94,3 +211,23 @@ def get_tools():
     if _cached_tools is None:
         _cached_tools = build_tools()
     return _cached_tools
+
+
+def get_tool_stats() -> dict:
+    """
+    Returns what the tool cache currently holds, for the admin memory endpoint.
+
+    Returns:
+        dict: Loaded tool names and the retrieval cache sizes.
+    """
+    stats = {
+        "loaded": _cached_tools is not None,
+        "tools": [getattr(t, "name", type(t).__name__) for t in _cached_tools or []],
+    }
+    cache = _document_retriever.cache if _document_retriever else None
+    if cache:
+        stats["retrieval_cache"] = {
+            "embeddings": len(cache.embeddings),
+            "results": len(cache.results),
+        }
+    return stats
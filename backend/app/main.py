@@ -1,3 +1,4 @@
+import asyncio
 import os
 import time
 from contextlib import asynccontextmanager
@@ -6,12 +7,23 @@ import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 
+from agents.admission import agent_executor
 from agents.agent_loader import AgentLoader
+from agents.retrieval import retrieval_executor
 from agents.routes import router as agent_router
+from app.routes import router as ops_router
 from ingestion.index_builder import load_index
 from ingestion.routes import router as ingestion_router
+from ingestion.upload_handler import ingestion_executor
 from logging_config import setup_logging
+from utils.http_clients import (
+    HTTP_WARMUP,
+    HTTP_WARMUP_INTERVAL,
+    close_http_clients,
+    warm_up_connections,
+)
 from utils.logger import get_logger
+from utils.profiling import PROFILING_ENABLED, profile_requests
 
 load_dotenv()
 setup_logging()
@@ -20,8 +32,22 @@ logger = get_logger(__name__)
 # TODO: DOCS FOLDER & SQL -> S3 BUCKET
 SQL_DB_PATH = os.getenv("SQL_DB_PATH")
 
+# Number of worker processes when started via `python -m app.main`
+# (the uvicorn CLI reads WEB_CONCURRENCY natively)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
 
-# Executed once at app startup and once at shutdown for setup and teardown operations
+
+async def keep_connections_warm():
+    """
+    Re-pings the providers while idle, so pooled connections don't expire
+    between bursts of traffic.
+    """
+    while True:
+        await asyncio.sleep(HTTP_WARMUP_INTERVAL)
+        await asyncio.to_thread(warm_up_connections)
+
+
+# Executed once per worker process at startup and shutdown for setup and teardown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     try:
@@ -33,13 +59,27 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.exception("❌ Failed to load or create vector index: %s", e)
 
+    warmup_task = None
+    if HTTP_WARMUP:
+        # Open provider connections before the first request needs them
+        await asyncio.to_thread(warm_up_connections)
+        if HTTP_WARMUP_INTERVAL > 0:
+            warmup_task = asyncio.create_task(keep_connections_warm())
+
     try:
-        AgentLoader()
-        logger.info("🧠 Preloaded GraphBuilder agent at startup.")
+        # Warm up this worker's agent and tools before serving traffic
+        AgentLoader.get_agent()
+        logger.info("🧠 Preloaded GraphBuilder agent at startup (pid %d).", os.getpid())
     except Exception as e:
         logger.exception("❌ Failed to preload agent: %s", e)
 
     yield
+    if warmup_task:
+        warmup_task.cancel()
+    agent_executor.shutdown(wait=False, cancel_futures=True)
+    ingestion_executor.shutdown(wait=False, cancel_futures=True)
+    retrieval_executor.shutdown(wait=False, cancel_futures=True)
+    await close_http_clients()
     logger.info("🔚 Application shutdown complete.")
 
 
@@ -49,6 +89,7 @@ app = FastAPI(title="LangGraph Agent API", version="1.0", lifespan=lifespan)
 # Route registrations
 app.include_router(ingestion_router, prefix="/vectordb")
 app.include_router(agent_router, prefix="")
+app.include_router(ops_router, prefix="")
 
 
 # HTTP request timing middleware
@@ -62,5 +103,11 @@ async def log_request_time(request: Request, call_next):
     return response
 
 
+# On-demand request profiling (X-Profile header), only installed when enabled
+if PROFILING_ENABLED:
+    app.middleware("http")(profile_requests)
+    logger.info("🔬 Request profiling enabled (X-Profile: cpu,memory).")
+
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, workers=WEB_CONCURRENCY)
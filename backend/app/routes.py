@@ -0,0 +1,69 @@
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from agents.agent_loader import AgentLoader
+from agents.session_store import get_session_store_stats
+from agents.tools import get_tool_stats
+from ingestion.index_version import get_index_version
+from utils.metrics import metrics
+from utils.profiling import get_process_memory_stats, get_profile_report
+from utils.qdrant_utils import get_qdrant_client
+
+# Shared secret for the /admin endpoints (sent as X-Admin-Token); unset disables
+# them, so they are opt-in
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        # Not configured: behave as if the endpoints did not exist
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(x_admin_token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+
+@router.get("/metrics")
+def get_metrics():
+    """
+    Returns a snapshot of the in-process metrics (counters, gauges, summaries).
+    """
+    return metrics.snapshot()
+
+
+@router.get("/admin/memory", dependencies=[Depends(require_admin)])
+def get_memory_stats():
+    """
+    Returns memory statistics of this worker process: RSS and garbage collector
+    state, session store size, cached agents and tools, and index handles.
+    """
+    return {
+        "process": get_process_memory_stats(),
+        "sessions": get_session_store_stats(),
+        "agents": AgentLoader.cached_agents(),
+        "tools": get_tool_stats(),
+        "index": {
+            "qdrant_clients": get_qdrant_client.cache_info().currsize,
+            "index_version": get_index_version(),
+        },
+    }
+
+
+@router.get(
+    "/admin/profiles/{profile_id}",
+    dependencies=[Depends(require_admin)],
+    response_class=PlainTextResponse,
+)
+def get_profile(profile_id: str):
+    """
+    Returns a request profile report by the id sent back in `X-Profile-Id`.
+    """
+    report = get_profile_report(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return report
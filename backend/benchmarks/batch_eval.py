@@ -0,0 +1,82 @@
+"""
+Compares running an evaluation set through `/agent/invoke` one call at a time
+with a single `/agent/batch` request.
+
+Starts `benchmarks.standin_app` (one worker) and reports wall time and
+questions/second for both approaches.
+
+Usage:
+    python -m benchmarks.batch_eval --questions 200 --concurrency 8
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.worker_scaling import start_server, wait_until_ready
+
+
+def run_sequential(base_url: str, questions: list) -> float:
+    start = time.perf_counter()
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        for i, question in enumerate(questions):
+            response = client.post(
+                "/agent/invoke", json={"input": question, "session_id": f"eval-{i}"}
+            )
+            response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def run_batch(base_url: str, questions: list, concurrency: int) -> float:
+    start = time.perf_counter()
+    items = 0
+    with httpx.Client(base_url=base_url, timeout=600) as client:
+        with client.stream(
+            "POST",
+            "/agent/batch",
+            json={"inputs": questions, "max_concurrency": concurrency},
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line and json.loads(line)["type"] == "item":
+                    items += 1
+    assert items == len(questions), f"got {items} of {len(questions)} results"
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8200)
+    args = parser.parse_args()
+
+    os.environ["AGENT_BATCH_CONCURRENCY"] = str(args.concurrency)
+    questions = [f"What is LangGraph? ({i})" for i in range(args.questions)]
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = start_server(1, args.port, os.path.join(tmp, "sessions.sqlite3"))
+        try:
+            wait_until_ready(base_url)
+            results = {
+                "sequential": run_sequential(base_url, questions),
+                f"batch x{args.concurrency}": run_batch(
+                    base_url, questions, args.concurrency
+                ),
+            }
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"{'mode':<12} {'wall s':>8} {'q/s':>8}")
+    for mode, wall in results.items():
+        print(f"{mode:<12} {wall:>8.2f} {len(questions) / wall:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
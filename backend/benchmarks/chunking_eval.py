@@ -0,0 +1,151 @@
+"""
+Offline evaluation of chunking profiles on a fixture corpus.
+
+For every profile/chunk size combination the corpus is chunked, embedded and
+indexed in memory, then each fixture question is retrieved. Reports index size,
+ingest time, retrieval latency, recall@k and the number of context tokens the
+agent would receive per answer.
+
+Usage:
+    python -m benchmarks.chunking_eval
+    python -m benchmarks.chunking_eval --profiles sentence markdown none --chunk-sizes 256 512
+    python -m benchmarks.chunking_eval --embed openai   # real embeddings (needs OPENAI_API_KEY)
+    python -m benchmarks.chunking_eval --embed local    # EMBED_MODEL via sentence-transformers
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from llama_index.core import Document, Settings, VectorStoreIndex
+
+from benchmarks.standins import HashingEmbedding
+from ingestion.chunking import chunk_documents
+from ingestion.embeddings import (
+    DEFAULT_EMBED_MODELS,
+    EMBED_BACKEND,
+    EMBED_MODEL,
+    build_embed_model,
+)
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "chunking"
+
+
+def load_corpus(corpus_dir: Path) -> dict:
+    """
+    Loads fixture documents grouped by source type, plus the evaluation questions.
+    """
+    docs = [
+        Document(text=path.read_text(), metadata={"filename": path.name})
+        for path in sorted((corpus_dir / "docs").glob("*.md"))
+    ]
+    faq = [
+        Document(text=f"Q: {row['question']}\nA: {row['answer']}")
+        for row in map(json.loads, (corpus_dir / "faq.jsonl").read_text().splitlines())
+    ]
+    questions = [
+        json.loads(line)
+        for line in (corpus_dir / "questions.jsonl").read_text().splitlines()
+    ]
+    return {"sources": {"docs": docs, "sql": faq}, "questions": questions}
+
+
+def count_tokens(text: str) -> int:
+    try:
+        import tiktoken
+
+        return len(tiktoken.get_encoding("cl100k_base").encode(text))
+    except ImportError:
+        return len(text.split())
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def evaluate(corpus: dict, profile: str, chunk_size: int, overlap: int, top_k: int):
+    start = time.perf_counter()
+    nodes = []
+    for source_type, documents in corpus["sources"].items():
+        nodes.extend(
+            chunk_documents(
+                documents,
+                source_type,
+                profile=None if profile == "auto" else profile,
+                chunk_size=chunk_size,
+                chunk_overlap=overlap,
+            )
+        )
+    index = VectorStoreIndex(nodes, embed_model=Settings.embed_model)
+    ingest_seconds = time.perf_counter() - start
+
+    retriever = index.as_retriever(similarity_top_k=top_k)
+    latencies, hits, context_tokens = [], 0, []
+    for item in corpus["questions"]:
+        start = time.perf_counter()
+        results = retriever.retrieve(item["question"])
+        latencies.append(time.perf_counter() - start)
+
+        texts = [r.node.get_content() for r in results]
+        hits += any(normalize(item["expected"]) in normalize(t) for t in texts)
+        context_tokens.append(sum(count_tokens(t) for t in texts))
+
+    dim = len(Settings.embed_model.get_text_embedding("probe"))
+    text_bytes = sum(len(n.get_content().encode()) for n in nodes)
+    return {
+        "profile": profile,
+        "chunk_size": chunk_size,
+        "nodes": len(nodes),
+        "index_kb": (text_bytes + len(nodes) * dim * 4) / 1024,
+        "ingest_ms": ingest_seconds * 1000,
+        "retrieval_ms": statistics.mean(latencies) * 1000,
+        "recall": hits / len(corpus["questions"]),
+        "ctx_tokens": statistics.mean(context_tokens),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=["auto", "sentence", "markdown", "semantic", "none"],
+        help="'auto' applies the per-source default profiles",
+    )
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[256, 512])
+    parser.add_argument("--overlap", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument(
+        "--embed", choices=["hashing", "openai", "local"], default="hashing"
+    )
+    parser.add_argument("--corpus", type=Path, default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    if args.embed == "hashing":
+        Settings.embed_model = HashingEmbedding()
+    else:
+        # EMBED_MODEL only applies to the configured backend
+        model = EMBED_MODEL if args.embed == EMBED_BACKEND else None
+        Settings.embed_model = build_embed_model(
+            args.embed, model or DEFAULT_EMBED_MODELS[args.embed], None
+        )
+
+    corpus = load_corpus(args.corpus)
+    print(
+        f"{'profile':<10} {'size':>5} {'nodes':>6} {'index KB':>9} {'ingest ms':>10} "
+        f"{'retr ms':>8} {'recall@' + str(args.top_k):>9} {'ctx tok':>8}"
+    )
+    for profile in args.profiles:
+        for chunk_size in args.chunk_sizes:
+            r = evaluate(corpus, profile, chunk_size, args.overlap, args.top_k)
+            print(
+                f"{r['profile']:<10} {r['chunk_size']:>5} {r['nodes']:>6} "
+                f"{r['index_kb']:>9.1f} {r['ingest_ms']:>10.1f} {r['retrieval_ms']:>8.2f} "
+                f"{r['recall']:>9.2f} {r['ctx_tokens']:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Measures the effect of the shared provider connection pool and warm-up pings.
+
+Starts the OpenAI-compatible stand-in provider behind a local TCP proxy that delays
+every new connection by `--handshake-ms` (standing in for DNS + TCP + TLS setup to a
+remote provider), then times ChatOpenAI calls: the first call, back-to-back calls,
+and a call after an idle gap longer than httpx's default 5s keep-alive.
+
+Usage:
+    python -m benchmarks.http_pool --handshake-ms 150 --idle 7
+"""
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from utils import http_clients
+
+
+class HandshakeDelayProxy:
+    """
+    TCP proxy that sleeps before relaying each new connection and counts them.
+    """
+
+    def __init__(self, target_port: int, delay_ms: float):
+        self.target_port = target_port
+        self.delay = delay_ms / 1000
+        self.connections = 0
+        self.port = None
+        self._ready = threading.Event()
+
+    async def _pipe(self, reader, writer):
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, client_reader, client_writer):
+        self.connections += 1
+        await asyncio.sleep(self.delay)
+        upstream_reader, upstream_writer = await asyncio.open_connection(
+            "127.0.0.1", self.target_port
+        )
+        await asyncio.gather(
+            self._pipe(client_reader, upstream_writer),
+            self._pipe(upstream_reader, client_writer),
+        )
+
+    async def _serve(self):
+        server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with server:
+            await server.serve_forever()
+
+    def start(self) -> "HandshakeDelayProxy":
+        threading.Thread(target=lambda: asyncio.run(self._serve()), daemon=True).start()
+        self._ready.wait()
+        return self
+
+
+def start_provider(port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "benchmarks.standin_provider:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            # Providers keep idle connections open much longer than uvicorn's 5s default
+            "--timeout-keep-alive",
+            "300",
+        ]
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/v1", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Stand-in provider did not start in time.")
+
+
+def timed_call(llm: ChatOpenAI) -> float:
+    start = time.perf_counter()
+    llm.invoke("What is LangGraph?")
+    return (time.perf_counter() - start) * 1000
+
+
+def run(scenario: str, base_url: str, proxy: HandshakeDelayProxy, args) -> dict:
+    asyncio.run(http_clients.close_http_clients())  # fresh shared pool per scenario
+    kwargs = {"model": "standin", "base_url": base_url, "api_key": "standin"}
+    if scenario != "sdk-default":
+        kwargs.update(http_clients.provider_client_kwargs())
+    llm = ChatOpenAI(**kwargs)
+
+    connections_before = proxy.connections
+    if scenario == "shared-pool+warmup":
+        http_clients.warm_up_connections({"standin": base_url})
+
+    first = timed_call(llm)
+    warm = [timed_call(llm) for _ in range(args.calls)]
+    time.sleep(args.idle)
+    after_idle = timed_call(llm)
+    return {
+        "scenario": scenario,
+        "first_ms": first,
+        "warm_p50_ms": statistics.median(warm),
+        "after_idle_ms": after_idle,
+        "connections": proxy.connections - connections_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--handshake-ms", type=float, default=150)
+    parser.add_argument("--idle", type=float, default=7)
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8200)
+    args = parser.parse_args()
+
+    provider = start_provider(args.port)
+    try:
+        proxy = HandshakeDelayProxy(args.port, args.handshake_ms).start()
+        base_url = f"http://127.0.0.1:{proxy.port}/v1"
+        print(
+            f"{'scenario':<20} {'first ms':>9} {'warm p50':>9} {'after idle':>11} {'conns':>6}"
+        )
+        for scenario in ["sdk-default", "shared-pool", "shared-pool+warmup"]:
+            r = run(scenario, base_url, proxy, args)
+            print(
+                f"{r['scenario']:<20} {r['first_ms']:>9.1f} {r['warm_p50_ms']:>9.1f} "
+                f"{r['after_idle_ms']:>11.1f} {r['connections']:>6}"
+            )
+    finally:
+        provider.terminate()
+        provider.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Measures vector search latency of the embedded Qdrant modes (and optionally the
+remote server at QDRANT_HOST) for a few corpus sizes.
+
+Random vectors are inserted into a scratch collection through the same vector
+store the retriever uses, then queried `--queries` times without and with a
+`source_type` filter. Reports p50/p95 query latency in milliseconds.
+
+Usage:
+    python -m benchmarks.local_vector_store
+    python -m benchmarks.local_vector_store --sizes 1000 5000 --modes local remote
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+import uuid
+
+import numpy as np
+from llama_index.core.schema import TextNode
+from llama_index.core.vector_stores.types import (
+    MetadataFilter,
+    MetadataFilters,
+    VectorStoreQuery,
+)
+
+from utils import qdrant_utils
+
+COLLECTION = "bench-local-vector-store"
+
+
+def use_mode(mode: str, path: str):
+    qdrant_utils.VECTOR_STORE_MODE = mode
+    qdrant_utils.EMBEDDED_VECTOR_STORE = mode != "remote"
+    qdrant_utils.QDRANT_PATH = path
+    qdrant_utils.get_qdrant_client.cache_clear()
+
+
+def measure(vector_store, queries: np.ndarray, filters=None) -> list:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        vector_store.query(
+            VectorStoreQuery(
+                query_embedding=query.tolist(), similarity_top_k=5, filters=filters
+            )
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def run(size: int, dim: int, queries: int) -> dict:
+    client = qdrant_utils.get_qdrant_client()
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    qdrant_utils.create_collection(dim, COLLECTION)
+    vector_store = qdrant_utils.get_vector_store(COLLECTION)
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((size, dim)).astype(np.float32)
+    for start in range(0, size, 1000):
+        vector_store.add(
+            [
+                TextNode(
+                    text=f"chunk {i}",
+                    id_=str(uuid.UUID(int=i)),
+                    embedding=vectors[i].tolist(),
+                    metadata={"source_type": "docs" if i % 2 else "sql"},
+                )
+                for i in range(start, min(start + 1000, size))
+            ]
+        )
+
+    query_vectors = rng.standard_normal((queries, dim)).astype(np.float32)
+    filters = MetadataFilters(filters=[MetadataFilter(key="source_type", value="docs")])
+    results = {
+        "none": measure(vector_store, query_vectors),
+        "source": measure(vector_store, query_vectors, filters),
+    }
+    client.delete_collection(COLLECTION)
+    return {
+        name: (statistics.median(latencies), statistics.quantiles(latencies, n=20)[18])
+        for name, latencies in results.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["memory", "local"],
+        choices=qdrant_utils.VECTOR_STORE_MODES,
+    )
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'chunks':>8} {'filter':<8} {'p50 ms':>8} {'p95 ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.modes:
+            use_mode(mode, tmp)
+            for size in args.sizes:
+                for name, (p50, p95) in run(size, args.dim, args.queries).items():
+                    print(f"{mode:<8} {size:>8} {name:<8} {p50:>8.2f} {p95:>8.2f}")
+            qdrant_utils.get_qdrant_client().close()
+
+
+if __name__ == "__main__":
+    main()
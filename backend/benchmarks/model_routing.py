@@ -0,0 +1,86 @@
+"""
+Compares single-model turns against model routing (fast tool selection, primary
+model synthesis) on turns with 0..N tool calls.
+
+Both agents run the real LangGraph graph with stand-in models: the primary model
+is slow, the routing model fast. Reports end-to-end latency per turn, the number
+of primary-model calls and the prompt tokens sent to the primary model (the
+expensive ones).
+
+Usage:
+    python -m benchmarks.model_routing
+    python -m benchmarks.model_routing --tool-rounds 0 1 3 --primary-ms 600 --fast-ms 60
+"""
+
+import argparse
+import statistics
+import time
+
+from langchain_core.messages import HumanMessage
+from langchain_core.tools import tool
+
+from benchmarks.standins import StandInGraphBuilder
+
+
+@tool
+def lookup(query: str) -> str:
+    """Looks up reference material for a query."""
+    time.sleep(0.02)
+    return f"Reference material for: {query}. " * 20
+
+
+def run(agent: StandInGraphBuilder, turns: int) -> dict:
+    latencies, primary_calls, primary_tokens = [], [], []
+    for i in range(turns):
+        start = time.perf_counter()
+        result = agent.invoke([HumanMessage(f"What is LangGraph? ({i})")])
+        latencies.append(time.perf_counter() - start)
+
+        primary = [s for s in result["llm_steps"] if s["model"] == agent.model_config]
+        primary_calls.append(len(primary))
+        primary_tokens.append(sum(s["input_tokens"] for s in primary))
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "primary_calls": statistics.mean(primary_calls),
+        "primary_tokens": statistics.mean(primary_tokens),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tool-rounds", type=int, nargs="+", default=[0, 1, 2, 3])
+    parser.add_argument("--primary-ms", type=float, default=400)
+    parser.add_argument("--fast-ms", type=float, default=80)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'tool rounds':>11} {'mode':<8} {'p50 ms':>8} "
+        f"{'primary calls':>14} {'primary tok':>12}"
+    )
+    for rounds in args.tool_rounds:
+        settings = {
+            "standin:primary": {"latency_ms": args.primary_ms, "tool_rounds": rounds},
+            "standin:fast": {"latency_ms": args.fast_ms, "tool_rounds": rounds},
+        }
+        agents = {
+            "single": StandInGraphBuilder(
+                "standin:primary", model_settings=settings, tools=[lookup]
+            ),
+            "routed": StandInGraphBuilder(
+                "standin:primary",
+                model_settings=settings,
+                tools=[lookup],
+                routing_model="standin:fast",
+            ),
+        }
+        for mode, agent in agents.items():
+            r = run(agent, args.turns)
+            print(
+                f"{rounds:>11} {mode:<8} {r['p50_ms']:>8.0f} "
+                f"{r['primary_calls']:>14.1f} {r['primary_tokens']:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
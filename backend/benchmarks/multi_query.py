@@ -0,0 +1,142 @@
+"""
+Compares single-query retrieval with multi-query retrieval (query variants
+searched concurrently, then fused) on the chunking fixture corpus.
+
+The corpus is indexed into an in-memory Qdrant with the offline hashing
+embedding. Embedding and search round trips are simulated with fixed latencies
+(`--embed-ms`, `--search-ms`) so the effect of the parallel fan-out on latency is
+visible. Reports recall@k, p50/p95 retrieval latency and the mean time of every stage.
+
+Usage:
+    python -m benchmarks.multi_query
+    python -m benchmarks.multi_query --modes single template --embed-ms 80 --search-ms 20
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from llama_index.core import StorageContext, VectorStoreIndex
+from qdrant_client import QdrantClient
+
+from agents.multi_query import QueryExpander
+from agents.retrieval import DocumentRetriever
+from benchmarks.chunking_eval import FIXTURE_DIR, load_corpus, normalize
+from benchmarks.standins import HashingEmbedding
+from ingestion.chunking import chunk_documents
+from utils import qdrant_utils
+from utils.metrics import metrics
+
+COLLECTION = "bench-multi-query"
+STAGES = ("rewrite", "embed", "search", "fanout", "fuse")
+
+
+class SlowHashingEmbedding(HashingEmbedding):
+    """
+    Hashing embedding that waits `latency_s` per query, like a provider call.
+    """
+
+    latency_s: float = 0.0
+
+    def _get_query_embedding(self, query: str):
+        time.sleep(self.latency_s)
+        return super()._get_query_embedding(query)
+
+
+class SlowSearch:
+    """
+    Wraps a retriever and adds a fixed network round trip to every search.
+    """
+
+    def __init__(self, retriever, latency_s: float):
+        self.retriever = retriever
+        self.latency_s = latency_s
+
+    def retrieve(self, query_bundle):
+        time.sleep(self.latency_s)
+        return self.retriever.retrieve(query_bundle)
+
+
+def build_index(corpus: dict, embed_model) -> VectorStoreIndex:
+    nodes = []
+    for source_type, documents in corpus["sources"].items():
+        nodes.extend(chunk_documents(documents, source_type))
+    qdrant_utils.create_collection(embed_model.dim, COLLECTION)
+    storage_context = StorageContext.from_defaults(
+        vector_store=qdrant_utils.get_vector_store(COLLECTION)
+    )
+    return VectorStoreIndex(
+        nodes, storage_context=storage_context, embed_model=embed_model
+    )
+
+
+def stage_means() -> dict:
+    summaries = metrics.snapshot()["summaries"].get("retrieval_stage_seconds", [])
+    by_stage = {s["labels"]["stage"]: s["value"] for s in summaries}
+    return {
+        stage: by_stage[stage]["sum"] / by_stage[stage]["count"] * 1000
+        for stage in STAGES
+        if stage in by_stage
+    }
+
+
+def evaluate(index, corpus: dict, mode: str, args) -> dict:
+    embed_model = SlowHashingEmbedding(latency_s=args.embed_ms / 1000)
+    expander = (
+        QueryExpander(mode, num_variants=args.variants) if mode != "single" else None
+    )
+    retriever = DocumentRetriever(
+        index,
+        similarity_top_k=args.top_k,
+        embed_model=embed_model,
+        expander=expander,
+    )
+    retriever.retriever = SlowSearch(retriever.retriever, args.search_ms / 1000)
+
+    metrics.reset()
+    latencies, hits = [], 0
+    for item in corpus["questions"]:
+        start = time.perf_counter()
+        results = retriever.retrieve(item["question"])
+        latencies.append((time.perf_counter() - start) * 1000)
+        texts = [r.node.get_content() for r in results]
+        hits += any(normalize(item["expected"]) in normalize(t) for t in texts)
+
+    return {
+        "recall": hits / len(corpus["questions"]),
+        "p50": statistics.median(latencies),
+        "p95": statistics.quantiles(latencies, n=20)[18],
+        "stages": stage_means(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modes", nargs="+", default=["single", "template"])
+    parser.add_argument("--variants", type=int, default=3)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--embed-ms", type=float, default=80)
+    parser.add_argument("--search-ms", type=float, default=20)
+    parser.add_argument("--corpus", type=Path, default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    client = QdrantClient(location=":memory:")
+    qdrant_utils.get_qdrant_client = lambda: client
+    corpus = load_corpus(args.corpus)
+    index = build_index(corpus, HashingEmbedding())
+
+    print(
+        f"{'mode':<10} {'recall@' + str(args.top_k):>9} {'p50 ms':>8} {'p95 ms':>8}  "
+        "stage mean ms"
+    )
+    for mode in args.modes:
+        r = evaluate(index, corpus, mode, args)
+        stages = " ".join(f"{k}={v:.1f}" for k, v in r["stages"].items())
+        print(
+            f"{mode:<10} {r['recall']:>9.2f} {r['p50']:>8.1f} {r['p95']:>8.1f}  {stages}"
+        )
+
+
+if __name__ == "__main__":
+    main()
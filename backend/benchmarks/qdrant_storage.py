@@ -0,0 +1,156 @@
+"""
+Compares Qdrant storage configurations on memory, search latency and recall.
+
+Each configuration (quantization, on-disk vectors, HNSW parameters) gets its own
+collection on a local Qdrant, filled with the same synthetic clustered vectors.
+Queries run with the configured search params and are compared against exact
+(brute-force) search to compute recall@k.
+
+Usage:
+    docker run -p 6333:6333 qdrant/qdrant
+    python -m benchmarks.qdrant_storage --points 50000 --dim 1536
+    python -m benchmarks.qdrant_storage --configs float32 scalar binary --ef 64 128
+"""
+
+import argparse
+import statistics
+import time
+
+import httpx
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as rest
+
+from utils.qdrant_utils import build_quantization_config
+
+# name -> (quantization, on-disk vectors)
+CONFIGS = {
+    "float32": ("none", False),
+    "float32-disk": ("none", True),
+    "scalar": ("scalar", False),
+    "scalar-disk": ("scalar", True),
+    "binary": ("binary", False),
+    "binary-disk": ("binary", True),
+}
+
+
+def make_vectors(points: int, queries: int, dim: int, seed: int = 0):
+    """
+    Generates unit vectors around random cluster centres, which is closer to real
+    embedding distributions than uniform noise.
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(max(points // 500, 8), dim))
+    labels = rng.integers(len(centres), size=points + queries)
+    vectors = centres[labels] + 0.5 * rng.normal(size=(points + queries, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors.astype(np.float32)
+    return vectors[:points], vectors[points:]
+
+
+def resident_memory(url: str) -> float:
+    """
+    Returns Qdrant's resident memory in bytes from its Prometheus endpoint.
+    """
+    for line in httpx.get(f"{url}/metrics", timeout=10).text.splitlines():
+        if line.startswith("memory_resident_bytes"):
+            return float(line.split()[-1])
+    return float("nan")
+
+
+def wait_for_indexing(client: QdrantClient, collection: str, timeout: float = 600):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if client.get_collection(collection).status == rest.CollectionStatus.GREEN:
+            return
+        time.sleep(0.5)
+    raise RuntimeError(f"Collection {collection} was not indexed in time.")
+
+
+def load_collection(client: QdrantClient, name: str, config: str, data, args):
+    quantization, on_disk = CONFIGS[config]
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config=rest.VectorParams(
+            size=args.dim, distance=rest.Distance.COSINE, on_disk=on_disk
+        ),
+        hnsw_config=rest.HnswConfigDiff(m=args.m, ef_construct=args.ef_construct),
+        quantization_config=build_quantization_config(quantization),
+        on_disk_payload=on_disk,
+    )
+    client.upload_collection(name, vectors=data, batch_size=256, parallel=1)
+    wait_for_indexing(client, name)
+
+
+def search_all(client: QdrantClient, name: str, queries, top_k: int, params):
+    latencies, ids = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = client.search(
+            name, query_vector=query.tolist(), limit=top_k, search_params=params
+        )
+        latencies.append(time.perf_counter() - start)
+        ids.append({hit.id for hit in hits})
+    return latencies, ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=CONFIGS)
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construct", type=int, default=100)
+    parser.add_argument("--ef", type=int, nargs="+", default=[64, 128])
+    parser.add_argument("--oversampling", type=float, default=2.0)
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url, timeout=120)
+    data, queries = make_vectors(args.points, args.queries, args.dim)
+
+    print(
+        f"{'config':<13} {'ef':>4} {'rescore':>7} {'mem MB':>8} "
+        f"{'p50 ms':>7} {'p95 ms':>7} {'recall@' + str(args.top_k):>9}"
+    )
+    for config in args.configs:
+        name = f"bench-{config}"
+        baseline = resident_memory(args.url)
+        load_collection(client, name, config, data, args)
+        memory_mb = (resident_memory(args.url) - baseline) / 1024**2
+
+        _, exact = search_all(
+            client, name, queries, args.top_k, rest.SearchParams(exact=True)
+        )
+        quantized = CONFIGS[config][0] != "none"
+        for ef in args.ef:
+            for rescore in [True, False] if quantized else [False]:
+                params = rest.SearchParams(
+                    hnsw_ef=ef,
+                    quantization=(
+                        rest.QuantizationSearchParams(
+                            rescore=rescore, oversampling=args.oversampling
+                        )
+                        if quantized
+                        else None
+                    ),
+                )
+                latencies, found = search_all(client, name, queries, args.top_k, params)
+                latencies.sort()
+                recall = statistics.mean(
+                    len(f & e) / args.top_k for f, e in zip(found, exact)
+                )
+                print(
+                    f"{config:<13} {ef:>4} {str(rescore if quantized else '-'):>7} "
+                    f"{memory_mb:>8.1f} {statistics.median(latencies) * 1000:>7.2f} "
+                    f"{latencies[int(len(latencies) * 0.95)] * 1000:>7.2f} {recall:>9.3f}"
+                )
+        client.delete_collection(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measures per-turn session state overhead as a conversation grows.
+
+Runs long conversations on the stand-in agent (no LLM latency) with each session
+backend and reports the time per turn at a few points, plus the number of stored
+messages at the end.
+
+Usage:
+    python -m benchmarks.session_state --turns 200
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from agents.session_store import SQLiteChatMessageHistory
+from benchmarks.standins import StandInGraphBuilder
+
+
+def run(agent: StandInGraphBuilder, turns: int, checkpoints: list) -> dict:
+    timings = {}
+    for turn in range(1, turns + 1):
+        start = time.perf_counter()
+        agent.invoke_and_parse([HumanMessage(f"Question {turn}")], session_id="bench")
+        if turn in checkpoints:
+            timings[turn] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+    checkpoints = sorted({1, args.turns // 10, args.turns // 2, args.turns} - {0})
+    settings = {"standin:standin": {"latency_ms": 0, "cpu_ms": 0}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history_db = os.path.join(tmp, "sessions.sqlite3")
+        history_agent = StandInGraphBuilder(model_settings=settings)
+        history_agent._get_session_memory = lambda session_id: SQLiteChatMessageHistory(
+            session_id, db_path=history_db
+        )
+        backends = {
+            "history-sqlite": history_agent,
+            "ckpt-memory": StandInGraphBuilder(
+                model_settings=settings, checkpointer=MemorySaver()
+            ),
+            "ckpt-sqlite": StandInGraphBuilder(
+                model_settings=settings,
+                checkpointer=SqliteSaver(
+                    sqlite3.connect(
+                        os.path.join(tmp, "checkpoints.sqlite3"),
+                        check_same_thread=False,
+                    )
+                ),
+            ),
+        }
+
+        header = " ".join(f"{'turn ' + str(t) + ' ms':>12}" for t in checkpoints)
+        print(f"{'backend':<15} {header}")
+        for name, agent in backends.items():
+            timings = run(agent, args.turns, checkpoints)
+            row = " ".join(f"{timings[t]:>12.2f}" for t in checkpoints)
+            print(f"{name:<15} {row}")
+
+
+if __name__ == "__main__":
+    main()
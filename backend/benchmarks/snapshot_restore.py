@@ -0,0 +1,103 @@
+"""
+Compares bootstrapping an empty collection by re-ingesting the documents (chunk,
+embed, insert) with restoring it from a snapshot.
+
+Runs against an in-memory Qdrant. Embedding calls are simulated with a fixed
+latency per batch (`--embed-ms`), in place of the embedding provider's round trip.
+Reports wall time, embedding requests and the snapshot size.
+
+Usage:
+    python -m benchmarks.snapshot_restore --documents 500 --embed-ms 300
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from llama_index.core import Document
+from llama_index.core.embeddings import MockEmbedding
+from qdrant_client import QdrantClient
+
+from ingestion import snapshots
+from ingestion.chunking import chunk_documents
+from utils import qdrant_utils
+
+PARAGRAPH = (
+    "LangGraph models agents as graphs of nodes that read and update a shared "
+    "state. Checkpointers persist that state between steps. "
+)
+
+
+class SlowEmbedding(MockEmbedding):
+    """
+    Mock embedding model that waits `latency_s` per batch, like a provider call.
+    """
+
+    latency_s: float = 0.0
+    requests: int = 0
+
+    def _get_text_embeddings(self, texts):
+        time.sleep(self.latency_s)
+        self.requests += 1
+        return super()._get_text_embeddings(texts)
+
+
+def reingest(documents, embed_model, batch_size: int) -> float:
+    start = time.perf_counter()
+    qdrant_utils.create_collection(embed_model.embed_dim, "reingest")
+    vector_store = qdrant_utils.get_vector_store("reingest")
+    nodes = chunk_documents(documents, "docs")
+    for i in range(0, len(nodes), batch_size):
+        batch = nodes[i : i + batch_size]
+        embeddings = embed_model.get_text_embedding_batch(
+            [n.get_content(metadata_mode="embed") for n in batch]
+        )
+        for node, embedding in zip(batch, embeddings):
+            node.embedding = embedding
+        vector_store.add(batch)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--embed-ms", type=float, default=300)
+    parser.add_argument("--embed-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    client = QdrantClient(location=":memory:")
+    qdrant_utils.get_qdrant_client = snapshots.get_qdrant_client = lambda: client
+    snapshots.get_embedding_dimension = lambda: args.dim
+    embed_model = SlowEmbedding(
+        embed_dim=args.dim,
+        embed_batch_size=args.embed_batch,
+        latency_s=args.embed_ms / 1000,
+    )
+    documents = [
+        Document(text=PARAGRAPH * 20, id_=f"doc-{i}") for i in range(args.documents)
+    ]
+
+    reingest_s = reingest(documents, embed_model, args.embed_batch)
+    points = client.count("reingest").count
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "snapshot.zip")
+        start = time.perf_counter()
+        manifest = snapshots.export_snapshot(path, "reingest")
+        export_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        snapshots.import_snapshot(path, "restored")
+        restore_s = time.perf_counter() - start
+
+    print(f"{points} chunks, {args.dim}-dim, snapshot {manifest['bytes'] / 1e6:.1f} MB")
+    print(f"{'bootstrap':<10} {'wall s':>8} {'embed requests':>15}")
+    print(f"{'re-ingest':<10} {reingest_s:>8.2f} {embed_model.requests:>15}")
+    print(f"{'restore':<10} {restore_s:>8.2f} {0:>15}")
+    print(f"(export took {export_s:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+FastAPI app serving the real agent routes on top of the stand-in agent.
+
+Run with e.g. `uvicorn benchmarks.standin_app:app --workers 4`.
+"""
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from agents.agent_loader import AgentLoader
+from agents.routes import router as agent_router
+from app.routes import router as ops_router
+from benchmarks.standins import StandInGraphBuilder
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Per-worker warm-up, mirroring app.main
+    AgentLoader.agent_class = StandInGraphBuilder
+    AgentLoader.get_agent()
+    yield
+
+
+app = FastAPI(title="LangGraph Agent API (stand-in)", lifespan=lifespan)
+app.include_router(agent_router, prefix="")
+app.include_router(ops_router, prefix="")
@@ -0,0 +1,49 @@
+"""
+OpenAI-compatible stand-in provider (`/v1/chat/completions`) answering with a fixed
+completion after STANDIN_LLM_LATENCY_MS, for benchmarking the client side offline.
+
+Run with e.g. `uvicorn benchmarks.standin_provider:app --port 8200`.
+"""
+
+import asyncio
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+
+from benchmarks.standins import STANDIN_LLM_LATENCY_MS, STANDIN_RESPONSE
+
+app = FastAPI(title="Stand-in LLM provider")
+
+
+@app.get("/v1")
+async def root():
+    return {"status": "ok"}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    await asyncio.sleep(STANDIN_LLM_LATENCY_MS / 1000)
+    prompt_tokens = sum(
+        len(str(m.get("content", "")).split()) for m in body["messages"]
+    )
+    completion_tokens = len(STANDIN_RESPONSE.split())
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "standin"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": STANDIN_RESPONSE},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
@@ -0,0 +1,202 @@
+"""
+Offline stand-ins for the external services used by the agent, so benchmarks can
+exercise the real FastAPI routes and LangGraph graph without API keys or network.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from llama_index.core.embeddings import BaseEmbedding
+
+from agents.graph_builder import GraphBuilder
+
+# Simulated provider latency and per-call CPU work (tokenization, parsing, ...)
+STANDIN_LLM_LATENCY_MS = float(os.getenv("STANDIN_LLM_LATENCY_MS", "50"))
+STANDIN_CPU_MS = float(os.getenv("STANDIN_CPU_MS", "5"))
+STANDIN_RESPONSE = (
+    "LangGraph is a library for building stateful, multi-actor LLM applications."
+)
+
+
+def burn_cpu(milliseconds: float):
+    """
+    Busy-loops for the given wall time, holding the GIL like real Python work.
+    """
+    deadline = time.perf_counter() + milliseconds / 1000
+    while time.perf_counter() < deadline:
+        pass
+
+
+class StandInChatModel(BaseChatModel):
+    """
+    Chat model that answers with a fixed response after a simulated delay.
+
+    With `tool_rounds` > 0 and tools bound, it first calls the first bound tool
+    that many times per turn (one call per step), then answers. By default the
+    graph ends after one LLM step.
+    """
+
+    latency_ms: float = STANDIN_LLM_LATENCY_MS
+    cpu_ms: float = STANDIN_CPU_MS
+    response: str = STANDIN_RESPONSE
+    tool_rounds: int = 0
+    tool_names: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "standin"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "StandInChatModel":
+        return self.model_copy(update={"tool_names": [t.name for t in tools]})
+
+    def _message(self, messages: List[BaseMessage]) -> AIMessage:
+        burn_cpu(self.cpu_ms)
+        prompt_tokens = sum(len(str(m.content).split()) for m in messages)
+
+        # Tool results received since the latest user message
+        turn_start = max(
+            (i for i, m in enumerate(messages) if isinstance(m, HumanMessage)),
+            default=0,
+        )
+        rounds = sum(isinstance(m, ToolMessage) for m in messages[turn_start:])
+        if self.tool_names and rounds < self.tool_rounds:
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": self.tool_names[0],
+                        "args": {"query": str(messages[turn_start].content)},
+                        "id": f"call_{rounds}",
+                    }
+                ],
+                usage_metadata={
+                    "input_tokens": prompt_tokens,
+                    "output_tokens": 10,
+                    "total_tokens": prompt_tokens + 10,
+                },
+            )
+
+        completion_tokens = len(self.response.split())
+        return AIMessage(
+            content=self.response,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency_ms / 1000)
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        message = self._message(messages)
+        if message.tool_calls:
+            time.sleep(self.latency_ms / 1000)
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": call["name"],
+                            "args": json.dumps(call["args"]),
+                            "id": call["id"],
+                            "index": i,
+                        }
+                        for i, call in enumerate(message.tool_calls)
+                    ],
+                    usage_metadata=message.usage_metadata,
+                )
+            )
+            return
+        tokens = message.content.split(" ")
+        for i, token in enumerate(tokens):
+            time.sleep(self.latency_ms / 1000 / len(tokens))
+            text = token if i == len(tokens) - 1 else token + " "
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+
+class StandInGraphBuilder(GraphBuilder):
+    """
+    GraphBuilder wired to stand-in chat models and no external tools.
+
+    `model_settings` maps a model config (e.g. 'standin:fast') to StandInChatModel
+    fields, so primary and routing models can get different latencies.
+    """
+
+    def __init__(
+        self,
+        model_config: str = "standin:standin",
+        model_settings: Optional[dict] = None,
+        **kwargs: Any,
+    ):
+        self.model_settings = model_settings or {}
+        super().__init__(model_config, tools=kwargs.pop("tools", []), **kwargs)
+
+    def _init_llm(self, model_type: str, model_name: str):
+        return StandInChatModel(
+            **self.model_settings.get(f"{model_type}:{model_name}", {})
+        )
+
+
+class HashingEmbedding(BaseEmbedding):
+    """
+    Deterministic bag-of-words embedding (hashed unigrams and bigrams).
+
+    Not a semantic model, but lexical overlap is enough to compare chunking and
+    retrieval configurations offline with meaningful recall numbers.
+    """
+
+    dim: int = 512
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "HashingEmbedding"
+
+    def _vector(self, text: str) -> List[float]:
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        vector = [0.0] * self.dim
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = hashlib.md5(feature.encode()).digest()
+            vector[int.from_bytes(digest[:4], "little") % self.dim] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._vector(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._vector(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._vector(text)
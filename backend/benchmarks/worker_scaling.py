@@ -0,0 +1,134 @@
+"""
+Measures /agent/invoke throughput as the number of uvicorn workers grows.
+
+Each run starts `benchmarks.standin_app` with N workers sharing a SQLite session
+store, drives it with concurrent clients for a fixed duration and reports
+requests/second and latency percentiles.
+
+Usage:
+    python -m benchmarks.worker_scaling --workers 1 2 4 --concurrency 32 --duration 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+
+def start_server(workers: int, port: int, session_db: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "SESSION_STORE_BACKEND": "sqlite",
+        "SESSION_STORE_PATH": session_db,
+        "LOG_LEVEL": "WARNING",
+        "AGENT_MAX_QUEUE": "10000",
+    }
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "benchmarks.standin_app:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/metrics", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError("Server did not become ready in time.")
+
+
+async def drive(base_url: str, concurrency: int, duration: float, sessions: int):
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client_id: int):
+        nonlocal errors
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            i = 0
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/agent/invoke",
+                    json={
+                        "input": f"What is LangGraph? ({i})",
+                        "session_id": f"bench-{(client_id + i) % sessions}",
+                    },
+                )
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+                i += 1
+
+    await asyncio.gather(*(client_loop(c) for c in range(concurrency)))
+    return latencies, errors
+
+
+def run(workers: int, args) -> dict:
+    port = args.port + workers
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        server = start_server(workers, port, os.path.join(tmp, "sessions.sqlite3"))
+        try:
+            wait_until_ready(base_url)
+            latencies, errors = asyncio.run(
+                drive(base_url, args.concurrency, args.duration, args.sessions)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / args.duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    print(
+        f"{'workers':>8} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}"
+    )
+    for workers in args.workers:
+        r = run(workers, args)
+        print(
+            f"{r['workers']:>8} {r['requests']:>9} {r['errors']:>7} "
+            f"{r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
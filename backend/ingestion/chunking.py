@@ -0,0 +1,131 @@
+import os
+from typing import Any, List, Optional, Sequence
+
+from llama_index.core import Settings
+from llama_index.core.node_parser import (
+    MarkdownNodeParser,
+    NodeParser,
+    SemanticSplitterNodeParser,
+    SentenceSplitter,
+)
+from llama_index.core.node_parser.node_utils import build_nodes_from_splits
+from llama_index.core.schema import BaseNode
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "512"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "50"))
+
+CHUNK_PROFILES = ("sentence", "markdown", "semantic", "none")
+
+# Default chunking profile per source type, overridable via CHUNK_PROFILE_<SOURCE>
+DEFAULT_SOURCE_PROFILES = {
+    "docs": "sentence",
+    "sql": "none",  # FAQ rows are already small, self-contained units
+    "website": "markdown",  # pages are converted to markdown by the reader
+    "crawl": "markdown",
+}
+
+
+class NoSplitNodeParser(NodeParser):
+    """
+    Turns every document into exactly one node, without splitting.
+    """
+
+    def _parse_nodes(
+        self, nodes: Sequence[BaseNode], show_progress: bool = False, **kwargs: Any
+    ) -> List[BaseNode]:
+        all_nodes: List[BaseNode] = []
+        for node in nodes:
+            all_nodes.extend(build_nodes_from_splits([node.get_content()], node))
+        return all_nodes
+
+
+def get_source_profile(source_type: str) -> str:
+    """
+    Returns the configured chunking profile for a source type.
+    """
+    return os.getenv(
+        f"CHUNK_PROFILE_{source_type.upper()}",
+        DEFAULT_SOURCE_PROFILES.get(source_type, "sentence"),
+    ).lower()
+
+
+def get_node_parsers(
+    profile: str,
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+) -> List[NodeParser]:
+    """
+    Builds the node parser chain for a chunking profile.
+
+    Args:
+        profile (str): One of 'sentence', 'markdown', 'semantic' or 'none'.
+        chunk_size (int, optional): Max tokens per chunk (defaults to CHUNK_SIZE).
+        chunk_overlap (int, optional): Token overlap between chunks (defaults to CHUNK_OVERLAP).
+
+    Returns:
+        List[NodeParser]: Parsers to apply in order.
+    """
+    sentence_splitter = SentenceSplitter(
+        chunk_size=chunk_size or CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP if chunk_overlap is None else chunk_overlap,
+    )
+
+    if profile == "sentence":
+        return [sentence_splitter]
+    if profile == "markdown":
+        # Split on headings first, then cap oversized sections
+        return [MarkdownNodeParser(), sentence_splitter]
+    if profile == "semantic":
+        # Break where consecutive sentences diverge in embedding space
+        return [
+            SemanticSplitterNodeParser(
+                embed_model=Settings.embed_model,
+                buffer_size=1,
+                breakpoint_percentile_threshold=95,
+            ),
+            sentence_splitter,
+        ]
+    if profile == "none":
+        return [NoSplitNodeParser()]
+
+    raise ValueError(
+        f"❌ Unsupported chunk profile: {profile} (expected one of {CHUNK_PROFILES})"
+    )
+
+
+def chunk_documents(
+    documents: Sequence[BaseNode],
+    source_type: str,
+    profile: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+) -> List[BaseNode]:
+    """
+    Splits documents into nodes using the profile configured for their source type.
+
+    Args:
+        documents (Sequence[BaseNode]): Documents to split.
+        source_type (str): Source type used to pick the default profile.
+        profile (str, optional): Explicit profile overriding the source default.
+        chunk_size (int, optional): Max tokens per chunk.
+        chunk_overlap (int, optional): Token overlap between chunks.
+
+    Returns:
+        List[BaseNode]: Nodes ready for embedding.
+    """
+    profile = (profile or get_source_profile(source_type)).lower()
+    nodes = list(documents)
+    for parser in get_node_parsers(profile, chunk_size, chunk_overlap):
+        nodes = parser.get_nodes_from_documents(nodes)
+
+    logger.info(
+        "✂️ Chunked %d documents into %d nodes (profile: %s)",
+        len(documents),
+        len(nodes),
+        profile,
+    )
+    return nodes
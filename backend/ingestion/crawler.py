@@ -0,0 +1,316 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import html2text
+import httpx
+from bs4 import BeautifulSoup
+from llama_index.core import Document
+
+from ingestion.ingest_state import get_collection_source_key, get_state, set_state
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", "2"))
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", "200"))
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "8"))
+# Max requests per second to a single host (0 disables the limit)
+CRAWL_RATE_LIMIT = float(os.getenv("CRAWL_RATE_LIMIT", "5"))
+CRAWL_TIMEOUT = float(os.getenv("CRAWL_TIMEOUT", "10"))
+CRAWL_BATCH_SIZE = int(os.getenv("CRAWL_BATCH_SIZE", "20"))
+CRAWL_RESPECT_ROBOTS = os.getenv("CRAWL_RESPECT_ROBOTS", "true").lower() == "true"
+CRAWL_USER_AGENT = os.getenv("CRAWL_USER_AGENT", "langgraph-rag-crawler/1.0")
+
+
+@dataclass
+class CrawledPage:
+    """
+    Result of fetching one page. `document` is None when the page was unchanged
+    since the last crawl (HTTP 304).
+    """
+
+    url: str
+    document: Optional[Document]
+    links: List[str]
+    validators: Dict[str, str] = field(default_factory=dict)
+
+
+class HostRateLimiter:
+    """
+    Spaces out requests to the same host to at most `rate` per second.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, host: str):
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        await asyncio.sleep(slot - now)
+
+
+def extract_links(html: str, base_url: str) -> List[str]:
+    """
+    Returns the absolute http(s) links of a page, without fragments.
+    """
+    links = []
+    for anchor in BeautifulSoup(html, "html.parser").find_all("a", href=True):
+        url, _ = urldefrag(urljoin(base_url, anchor["href"]))
+        if urlparse(url).scheme in ("http", "https"):
+            links.append(url)
+    return links
+
+
+def html_to_markdown(html: str) -> str:
+    converter = html2text.HTML2Text()
+    converter.ignore_images = True
+    converter.body_width = 0
+    return converter.handle(html)
+
+
+def get_crawl_source_key(start_url: str) -> str:
+    """
+    Returns the identifier of a crawled site. Its page validators are stored per
+    collection (see `get_collection_source_key`).
+    """
+    return f"crawl:{start_url}"
+
+
+class Crawler:
+    """
+    Concurrent same-domain crawler.
+
+    Follows links breadth-first up to `max_depth` from the start URL, with
+    `concurrency` fetches in flight, a per-host rate limit, and conditional
+    requests (ETag / Last-Modified) against the validators of the previous crawl.
+    Unchanged pages are not re-downloaded, but their stored links are still followed.
+    """
+
+    def __init__(
+        self,
+        start_url: str,
+        max_depth: int = CRAWL_MAX_DEPTH,
+        max_pages: int = CRAWL_MAX_PAGES,
+        concurrency: int = CRAWL_CONCURRENCY,
+        rate_limit: float = CRAWL_RATE_LIMIT,
+        respect_robots: bool = CRAWL_RESPECT_ROBOTS,
+        known_pages: Optional[Dict[str, dict]] = None,
+    ):
+        self.start_url = urldefrag(start_url)[0]
+        self.host = urlparse(self.start_url).netloc
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.rate_limiter = HostRateLimiter(rate_limit)
+        self.respect_robots = respect_robots
+        # url -> {"etag", "last_modified", "links"} from the previous crawl
+        self.known_pages = known_pages or {}
+        self._robots: Optional[RobotFileParser] = None
+
+    async def _load_robots(self, client: httpx.AsyncClient):
+        parsed = urlparse(self.start_url)
+        try:
+            response = await client.get(f"{parsed.scheme}://{parsed.netloc}/robots.txt")
+        except httpx.HTTPError:
+            return
+        if response.status_code == 200:
+            self._robots = RobotFileParser()
+            self._robots.parse(response.text.splitlines())
+
+    def _allowed(self, url: str) -> bool:
+        if urlparse(url).netloc != self.host:
+            return False
+        return self._robots is None or self._robots.can_fetch(CRAWL_USER_AGENT, url)
+
+    async def _fetch(
+        self, client: httpx.AsyncClient, url: str
+    ) -> Optional[CrawledPage]:
+        known = self.known_pages.get(url, {})
+        headers = {}
+        if known.get("etag"):
+            headers["If-None-Match"] = known["etag"]
+        if known.get("last_modified"):
+            headers["If-Modified-Since"] = known["last_modified"]
+
+        await self.rate_limiter.wait(self.host)
+        try:
+            response = await client.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            logger.warning(f"❌ Failed to fetch {url}: {e}")
+            metrics.inc("crawler_pages_total", outcome="error")
+            return None
+
+        if response.status_code == 304:
+            metrics.inc("crawler_pages_total", outcome="unchanged")
+            return CrawledPage(url, None, known.get("links", []))
+        if response.status_code != 200 or "html" not in response.headers.get(
+            "content-type", ""
+        ):
+            metrics.inc("crawler_pages_total", outcome="skipped")
+            return None
+
+        metrics.inc("crawler_pages_total", outcome="fetched")
+        html = response.text
+        validators = {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+        }
+        return CrawledPage(
+            url=url,
+            document=Document(id_=url, text=html_to_markdown(html)),
+            links=extract_links(html, str(response.url)),
+            validators={k: v for k, v in validators.items() if v},
+        )
+
+    async def crawl(self) -> AsyncIterator[CrawledPage]:
+        """
+        Crawls the site and yields pages as soon as they are fetched.
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue()
+        seen = {self.start_url}
+        pending.put_nowait((self.start_url, 0))
+
+        async def worker(client: httpx.AsyncClient):
+            while True:
+                url, depth = await pending.get()
+                try:
+                    page = await self._fetch(client, url)
+                    if page is None:
+                        continue
+                    if depth < self.max_depth:
+                        for link in page.links:
+                            if (
+                                link not in seen
+                                and len(seen) < self.max_pages
+                                and self._allowed(link)
+                            ):
+                                seen.add(link)
+                                pending.put_nowait((link, depth + 1))
+                    await results.put(page)
+                except Exception as e:
+                    logger.warning(f"❌ Failed to process {url}: {e}")
+                finally:
+                    pending.task_done()
+
+        async with httpx.AsyncClient(
+            timeout=CRAWL_TIMEOUT,
+            follow_redirects=True,
+            headers={"User-Agent": CRAWL_USER_AGENT},
+            limits=httpx.Limits(max_connections=self.concurrency),
+        ) as client:
+            if self.respect_robots:
+                await self._load_robots(client)
+            workers = [
+                asyncio.create_task(worker(client)) for _ in range(self.concurrency)
+            ]
+            done = asyncio.create_task(pending.join())
+            try:
+                while not (done.done() and results.empty()):
+                    get_result = asyncio.create_task(results.get())
+                    await asyncio.wait(
+                        {get_result, done}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if get_result.done():
+                        yield get_result.result()
+                    else:
+                        get_result.cancel()
+            finally:
+                for task in workers + [done]:
+                    task.cancel()
+                await asyncio.gather(*workers, done, return_exceptions=True)
+
+        logger.info(f"🕸️ Crawled {len(seen)} pages from {self.start_url}")
+
+
+def iter_crawl_batches(
+    start_url: str,
+    batch_size: int = CRAWL_BATCH_SIZE,
+    incremental: bool = True,
+    collection_name: Optional[str] = None,
+    **crawler_kwargs,
+) -> Iterator[List[Document]]:
+    """
+    Crawls a site on a background event loop and yields changed pages in batches,
+    so chunking and embedding start while the crawl is still running.
+
+    With `incremental`, page validators are stored once the consumer has processed
+    a batch (asks for the next one), so pages that failed to index are re-fetched
+    on the next crawl. Validators are kept per `collection_name`, so a new or
+    different collection gets every page.
+    """
+    source_key = get_collection_source_key(
+        get_crawl_source_key(start_url), collection_name
+    )
+    known_pages = (get_state(source_key, "pages") or {}) if incremental else {}
+    crawler = Crawler(start_url, known_pages=known_pages, **crawler_kwargs)
+
+    pages: queue.Queue = queue.Queue(maxsize=batch_size * 2)
+    stop = threading.Event()
+    done = object()
+
+    async def produce():
+        async for page in crawler.crawl():
+            # Wait for the consumer without blocking the crawler's event loop
+            while not stop.is_set():
+                try:
+                    pages.put_nowait(page)
+                    break
+                except queue.Full:
+                    await asyncio.sleep(0.05)
+            if stop.is_set():
+                return
+
+    def run():
+        try:
+            asyncio.run(produce())
+        except Exception as e:
+            logger.exception(f"❌ Crawl of {start_url} failed: {e}")
+        finally:
+            pages.put(done)
+
+    thread = threading.Thread(target=run, name="crawler", daemon=True)
+    thread.start()
+
+    def commit(batch: List[CrawledPage]):
+        if not incremental:
+            return
+        for page in batch:
+            known_pages[page.url] = {**page.validators, "links": page.links}
+        set_state(source_key, "pages", known_pages)
+
+    batch: List[CrawledPage] = []
+    try:
+        while True:
+            page = pages.get()
+            if page is done:
+                break
+            if page.document is None:
+                continue
+            batch.append(page)
+            if len(batch) >= batch_size:
+                yield [p.document for p in batch]
+                commit(batch)
+                batch = []
+        if batch:
+            yield [p.document for p in batch]
+            commit(batch)
+    finally:
+        stop.set()
+        while thread.is_alive():
+            try:
+                pages.get_nowait()
+            except queue.Empty:
+                thread.join(timeout=0.1)
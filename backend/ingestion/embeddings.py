@@ -0,0 +1,159 @@
+import os
+import re
+from typing import Any, List, Optional
+
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.embeddings import BaseEmbedding
+
+from utils.http_clients import provider_client_kwargs
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Embedding backend: 'openai' (API) or 'local' (CPU sentence-transformers, torch or ONNX)
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "openai").lower()
+DEFAULT_EMBED_MODELS = {
+    "openai": "text-embedding-ada-002",
+    "local": "BAAI/bge-small-en-v1.5",
+}
+EMBED_MODEL = os.getenv("EMBED_MODEL", DEFAULT_EMBED_MODELS.get(EMBED_BACKEND, ""))
+# Output dimensions: reduced size for text-embedding-3-*, Matryoshka truncation for local models
+EMBED_DIMENSIONS = (
+    int(os.getenv("EMBED_DIMENSIONS")) if os.getenv("EMBED_DIMENSIONS") else None
+)
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_LOCAL_RUNTIME = os.getenv("EMBED_LOCAL_RUNTIME", "torch").lower()  # torch | onnx
+
+# Native output size of known OpenAI embedding models
+OPENAI_EMBED_DIMENSIONS = {
+    "text-embedding-ada-002": 1536,
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+}
+
+_embed_model: Optional[BaseEmbedding] = None
+
+
+class SentenceTransformerEmbedding(BaseEmbedding):
+    """
+    Local embedding model served by sentence-transformers on CPU, optionally
+    through the ONNX runtime, with optional Matryoshka dimension truncation.
+    """
+
+    model: str
+    runtime: str = "torch"
+    dimensions: Optional[int] = None
+
+    _encoder: Any = PrivateAttr()
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "EMBED_BACKEND=local requires the 'sentence-transformers' package."
+            ) from e
+        self._encoder = SentenceTransformer(
+            self.model,
+            device="cpu",
+            backend=self.runtime,
+            truncate_dim=self.dimensions,
+        )
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "SentenceTransformerEmbedding"
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = self._encoder.encode(
+            texts, batch_size=self.embed_batch_size, normalize_embeddings=True
+        )
+        return vectors.tolist()
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._encode([query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._encode([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts)
+
+
+def build_embed_model(
+    backend: str = EMBED_BACKEND,
+    model: str = EMBED_MODEL,
+    dimensions: Optional[int] = EMBED_DIMENSIONS,
+) -> BaseEmbedding:
+    """
+    Builds the embedding model for the given backend.
+
+    Args:
+        backend (str): 'openai' or 'local'.
+        model (str): Model name (OpenAI model or sentence-transformers model id/path).
+        dimensions (int, optional): Reduced output dimensions.
+
+    Returns:
+        BaseEmbedding: The configured embedding model.
+    """
+    if backend == "openai":
+        from llama_index.embeddings.openai import OpenAIEmbedding
+
+        return OpenAIEmbedding(
+            model=model,
+            dimensions=dimensions,
+            embed_batch_size=EMBED_BATCH_SIZE,
+            **provider_client_kwargs("llama_index"),
+        )
+    if backend == "local":
+        return SentenceTransformerEmbedding(
+            model=model,
+            runtime=EMBED_LOCAL_RUNTIME,
+            dimensions=dimensions,
+            embed_batch_size=EMBED_BATCH_SIZE,
+        )
+    raise ValueError(f"❌ Unsupported embedding backend: {backend}")
+
+
+def get_embed_model() -> BaseEmbedding:
+    """
+    Returns the process-wide embedding model, building it on first use.
+    """
+    global _embed_model
+    if _embed_model is None:
+        logger.info(
+            "🧮 Loading embedding model %s (%s, dimensions: %s)",
+            EMBED_MODEL,
+            EMBED_BACKEND,
+            EMBED_DIMENSIONS or "native",
+        )
+        _embed_model = build_embed_model()
+    return _embed_model
+
+
+def get_embedding_dimension() -> int:
+    """
+    Returns the vector size produced by the configured embedding model.
+    Known OpenAI models are resolved without an API call; other models are probed.
+    """
+    if EMBED_DIMENSIONS:
+        return EMBED_DIMENSIONS
+    if EMBED_BACKEND == "openai" and EMBED_MODEL in OPENAI_EMBED_DIMENSIONS:
+        return OPENAI_EMBED_DIMENSIONS[EMBED_MODEL]
+    return len(get_embed_model().get_text_embedding("dimension probe"))
+
+
+def get_embedding_slug(
+    model: str = EMBED_MODEL, dimensions: Optional[int] = EMBED_DIMENSIONS
+) -> str:
+    """
+    Returns a collection-name-safe identifier for an embedding model and size,
+    e.g. 'text-embedding-3-small-512'.
+    """
+    name = model.rstrip("/").split("/")[-1].lower()
+    slug = re.sub(r"[^a-z0-9]+", "-", name).strip("-")
+    return f"{slug}-{dimensions}" if dimensions else slug
@@ -1,69 +1,120 @@
-import os
+import time
 
 from llama_index.core import Settings, VectorStoreIndex
-from llama_index.core.node_parser import SentenceSplitter
-from llama_index.embeddings.openai import OpenAIEmbedding
-from llama_index.vector_stores.qdrant import QdrantVectorStore
 
-from ingestion.sources import get_documents, list_s3_documents
+from ingestion.chunking import chunk_documents
+from ingestion.embeddings import (
+    get_embed_model,
+    get_embedding_dimension,
+    get_embedding_slug,
+)
+from ingestion.index_version import bump_index_version
+from ingestion.ingest_state import reset_collection_state
+from ingestion.metadata import SOURCE_METADATA_SCHEMA, annotate_documents
+from ingestion.snapshots import SNAPSHOT_URI, import_snapshot, restore_lock
+from ingestion.sources import (
+    iter_document_batches,
+    list_stored_documents,
+    reset_source_state,
+)
 from utils.logger import get_logger
-from utils.qdrant_utils import create_collection, get_qdrant_client
+from utils.qdrant_utils import (
+    create_collection,
+    create_payload_indexes,
+    get_collection_name,
+    get_collection_vector_size,
+    get_qdrant_client,
+    get_vector_store,
+    qdrant_collection_exists,
+)
 
 logger = get_logger(__name__)
 
-Settings.embed_model = OpenAIEmbedding(
-    model="text-embedding-ada-002"
-)  # TODO: Make this configurable
+Settings.embed_model = get_embed_model()
 
-QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "langgraph-rag-vectordb")
+# Collection holding the vectors of the configured embedding model
+QDRANT_COLLECTION = get_collection_name(get_embedding_slug())
 
+# Indexed payload fields: source metadata for filtered search, and the document id
+# used to replace re-ingested documents
+PAYLOAD_INDEXES = {"doc_id": "keyword", **SOURCE_METADATA_SCHEMA}
 
-def create_index(source_type: str, source_path: str):
+
+def create_index(
+    source_type: str,
+    source_path: str,
+    chunk_profile: str = None,
+    full_refresh: bool = False,
+):
     """
     Ingests documents from a local or remote source, processes them into chunks (nodes),
     and indexes them into a Qdrant vector store.
 
+    Documents are processed batch by batch (SQL and crawl sources are streamed, and
+    only rows/pages changed since the last ingest are read). Re-ingested documents
+    replace their previous chunks.
+
     Args:
         source_type (str): Type of document source ('docs', 'sql', etc.).
         source_path (str): Path or identifier for the source.
+        chunk_profile (str, optional): Chunking profile ('sentence', 'markdown',
+            'semantic', 'none'); defaults to the profile configured for the source type.
+        full_refresh (bool): Ignore stored watermarks/validators and re-ingest the
+            whole source.
 
     Returns:
         VectorStoreIndex: The index created and stored in Qdrant.
     """
     logger.info(f"📄 Ingesting documents from {source_type}: {source_path}")
-    documents = get_documents(source_type, source_path)
-
-    if not documents:
-        logger.warning("⚠️ No documents loaded for indexing.")
+    if not qdrant_collection_exists(QDRANT_COLLECTION):
+        # New, deleted or switched collection: stored watermarks/validators refer
+        # to vectors it doesn't hold, so every source is read in full
+        reset_collection_state(QDRANT_COLLECTION)
+    elif full_refresh:
+        reset_source_state(source_type, source_path, QDRANT_COLLECTION)
+
+    index, total_documents, total_nodes = None, 0, 0
+    ingested_at = int(time.time())
+    for documents in iter_document_batches(
+        source_type, source_path, collection_name=QDRANT_COLLECTION
+    ):
+        if not documents:
+            continue
+
+        # Preview first few documents for debugging
+        if total_documents == 0:
+            for i, doc in enumerate(documents[:3]):
+                logger.debug(f"📄 Document {i+1} preview:\n{doc.text[:300]}...\n")
+
+        # Attach filterable source metadata, then split documents into chunks (nodes)
+        annotate_documents(documents, source_type, source_path, ingested_at)
+        nodes = chunk_documents(documents, source_type, profile=chunk_profile)
+        total_documents += len(documents)
+        if not nodes:
+            continue
+
+        if index is None:
+            # Ensure the Qdrant collection exists before storing vectors
+            create_collection(get_embedding_dimension(), QDRANT_COLLECTION)
+            create_payload_indexes(PAYLOAD_INDEXES, QDRANT_COLLECTION)
+            vector_store = get_vector_store(QDRANT_COLLECTION)
+            index = VectorStoreIndex.from_vector_store(vector_store)
+
+        # Replace the chunks of documents that were ingested before
+        vector_store.delete_ref_docs([doc.id_ for doc in documents])
+        index.insert_nodes(nodes)
+        total_nodes += len(nodes)
+
+        # Invalidate cached retrieval results computed against the previous contents
+        bump_index_version()
+
+    if index is None:
+        logger.warning("⚠️ No new documents or nodes to index.")
         return load_index()
 
-    # Preview first few documents for debugging
-    for i, doc in enumerate(documents[:3]):
-        logger.debug(f"📄 Document {i+1} preview:\n{doc.text[:300]}...\n")
-
-    # Split documents into chunks (nodes) suitable for vector storage
-    splitter = SentenceSplitter(
-        chunk_size=512, chunk_overlap=50
-    )  # TODO: Make chunk size and overlap configurable
-    nodes = splitter.get_nodes_from_documents(documents)
-
-    if not nodes:
-        logger.warning("⚠️ No nodes created from documents.")
-        return load_index()
-
-    logger.info(f"✅ Parsed {len(nodes)} nodes from documents.")
-
-    # Ensure the Qdrant collection exists before storing vectors
-    create_collection()
-
-    # Create a Qdrant-backed vector store and build the index
-    vector_store = QdrantVectorStore(
-        client=get_qdrant_client(), collection_name=QDRANT_COLLECTION
+    logger.info(
+        f"✅ Indexed {total_nodes} nodes from {total_documents} documents in Qdrant."
     )
-    index = VectorStoreIndex.from_vector_store(vector_store)
-    index.insert_nodes(nodes)
-
-    logger.info("✅ Documents indexed and stored in Qdrant.")
     return index
 
 
@@ -78,17 +129,16 @@ def create_empty_index():
     logger.info("📭 Creating empty vector index in Qdrant...")
 
     # Ensure the Qdrant collection exists before storing vectors
-    create_collection()
-    vector_store = QdrantVectorStore(
-        client=get_qdrant_client(), collection_name=QDRANT_COLLECTION
-    )
+    create_collection(get_embedding_dimension(), QDRANT_COLLECTION)
+    vector_store = get_vector_store(QDRANT_COLLECTION)
     return VectorStoreIndex.from_vector_store(vector_store)
 
 
 def load_index():
     """
     Loads the existing vector index from Qdrant. If the collection doesn't exist,
-    attempts to load documents from an S3 bucket and create a new index.
+    restores it from SNAPSHOT_URI when configured, otherwise attempts to load the
+    uploaded documents (S3 or local storage) and create a new index.
 
     Returns:
         VectorStoreIndex: The loaded or newly created vector index.
@@ -96,15 +146,27 @@ def load_index():
     logger.info("📦 Loading vector index from Qdrant...")
 
     client = get_qdrant_client()
+    if not client.collection_exists(collection_name=QDRANT_COLLECTION) and SNAPSHOT_URI:
+        # Workers starting together restore once; the others wait and reuse it
+        with restore_lock():
+            if not client.collection_exists(collection_name=QDRANT_COLLECTION):
+                logger.info(
+                    f"📸 Restoring vector index from snapshot {SNAPSHOT_URI}..."
+                )
+                try:
+                    import_snapshot(SNAPSHOT_URI, QDRANT_COLLECTION, PAYLOAD_INDEXES)
+                except Exception as e:
+                    logger.exception(
+                        f"❌ Snapshot restore failed, re-ingesting instead: {e}"
+                    )
+
     if not client.collection_exists(collection_name=QDRANT_COLLECTION):
-        logger.warning("⚠️ Vector index not found. Checking S3 for documents...")
+        logger.warning("⚠️ Vector index not found. Checking storage for documents...")
 
-        # Attempt to retrieve documents from a pre-configured S3 bucket
-        s3_files = list_s3_documents(
-            bucket="langgraph-docs", prefix="uploads/"
-        )  # TODO: Make bucket configurable
+        # Attempt to retrieve previously uploaded documents
+        s3_files = list_stored_documents(prefix="uploads/")
         if s3_files:
-            logger.info("📄 Found documents in S3. Ingesting and creating index...")
+            logger.info("📄 Found stored documents. Ingesting and creating index...")
             index = None
             for path in s3_files:
                 try:
@@ -113,11 +175,18 @@ def load_index():
                     logger.warning(f"❌ Skipped {path} due to error: {e}")
             return index or create_empty_index()
         else:
-            logger.info("📭 No documents found in S3. Creating empty vector index.")
+            logger.info("📭 No stored documents found. Creating empty vector index.")
             return create_empty_index()
 
+    # Vectors from a different model (or size) cannot be searched with this one
+    vector_size = get_collection_vector_size(QDRANT_COLLECTION)
+    if vector_size != get_embedding_dimension():
+        raise ValueError(
+            f"❌ Collection {QDRANT_COLLECTION} stores {vector_size}-dim vectors, but the "
+            f"embedding model produces {get_embedding_dimension()}. Re-embed it with "
+            "`python -m ingestion.reembed` or enable QDRANT_COLLECTION_PER_MODEL."
+        )
+
     # Load the existing index from Qdrant
-    vector_store = QdrantVectorStore(
-        client=get_qdrant_client(), collection_name=QDRANT_COLLECTION
-    )
+    vector_store = get_vector_store(QDRANT_COLLECTION)
     return VectorStoreIndex.from_vector_store(vector_store)
@@ -0,0 +1,63 @@
+import fcntl
+import os
+import threading
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Optional file holding the index generation, shared by all workers on one host.
+# Without it the generation counter is process-local.
+INDEX_VERSION_FILE = os.getenv("INDEX_VERSION_FILE")
+
+_lock = threading.Lock()
+_local_version = 0
+
+
+def _read_file_version(fd: int) -> int:
+    os.lseek(fd, 0, os.SEEK_SET)
+    raw = os.read(fd, 32).strip()
+    return int(raw) if raw else 0
+
+
+def get_index_version() -> int:
+    """
+    Returns the current index generation. Any cached retrieval result computed
+    under an older generation must be treated as stale.
+    """
+    if not INDEX_VERSION_FILE:
+        return _local_version
+    try:
+        with open(INDEX_VERSION_FILE, "rb") as f:
+            raw = f.read().strip()
+        return int(raw) if raw else 0
+    except FileNotFoundError:
+        return 0
+
+
+def bump_index_version() -> int:
+    """
+    Increments the index generation after the collection has been written to.
+
+    Returns:
+        int: The new generation.
+    """
+    global _local_version
+    with _lock:
+        if not INDEX_VERSION_FILE:
+            _local_version += 1
+            version = _local_version
+        else:
+            fd = os.open(INDEX_VERSION_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                version = _read_file_version(fd) + 1
+                os.ftruncate(fd, 0)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, str(version).encode())
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    logger.info("🔄 Index version bumped to %d", version)
+    return version
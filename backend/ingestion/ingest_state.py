@@ -0,0 +1,97 @@
+import json
+import os
+import sqlite3
+from typing import Any, Optional
+
+# Local SQLite file with per-source incremental ingestion state (watermarks, ...)
+INGEST_STATE_PATH = os.getenv("INGEST_STATE_PATH", "./ingest_state.sqlite3")
+
+# Database files whose schema has already been created by this process
+_initialized_db_paths = set()
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    if db_path not in _initialized_db_paths:
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ingest_state ("
+                "source TEXT NOT NULL, "
+                "key TEXT NOT NULL, "
+                "value TEXT NOT NULL, "
+                "PRIMARY KEY (source, key))"
+            )
+        _initialized_db_paths.add(db_path)
+    return conn
+
+
+def get_state(source: str, key: str, db_path: Optional[str] = None) -> Any:
+    """
+    Returns a stored state value for a source, or None if unset.
+
+    Args:
+        source (str): Source identifier (e.g. 'sql:/data/faq.sqlite3:faq').
+        key (str): State key within the source (e.g. 'watermark').
+    """
+    conn = _connect(db_path or INGEST_STATE_PATH)
+    try:
+        row = conn.execute(
+            "SELECT value FROM ingest_state WHERE source = ? AND key = ?",
+            (source, key),
+        ).fetchone()
+    finally:
+        conn.close()
+    return json.loads(row[0]) if row else None
+
+
+def set_state(source: str, key: str, value: Any, db_path: Optional[str] = None):
+    """
+    Stores a JSON-serialisable state value for a source.
+    """
+    conn = _connect(db_path or INGEST_STATE_PATH)
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ingest_state (source, key, value) VALUES (?, ?, ?)",
+                (source, key, json.dumps(value)),
+            )
+    finally:
+        conn.close()
+
+
+def get_collection_source_key(source: str, collection_name: Optional[str]) -> str:
+    """
+    Scopes a source identifier to the collection its documents are indexed into,
+    so a new or different collection does not inherit the state of another one.
+    """
+    return f"{collection_name}/{source}" if collection_name else source
+
+
+def reset_collection_state(collection_name: str, db_path: Optional[str] = None):
+    """
+    Forgets the state of every source indexed into a collection, e.g. when the
+    collection is (re)created or restored and no longer holds what was ingested.
+    """
+    prefix = get_collection_source_key("", collection_name)
+    conn = _connect(db_path or INGEST_STATE_PATH)
+    try:
+        with conn:
+            conn.execute(
+                "DELETE FROM ingest_state WHERE substr(source, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+    finally:
+        conn.close()
+
+
+def reset_state(source: str, db_path: Optional[str] = None):
+    """
+    Forgets all state of a source, so the next ingest processes it in full.
+    """
+    conn = _connect(db_path or INGEST_STATE_PATH)
+    try:
+        with conn:
+            conn.execute("DELETE FROM ingest_state WHERE source = ?", (source,))
+    finally:
+        conn.close()
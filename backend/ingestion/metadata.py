@@ -0,0 +1,96 @@
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+
+from llama_index.core.schema import Document
+from llama_index.core.vector_stores.types import (
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+
+# Source metadata stored on every chunk, indexed in Qdrant for filtered search.
+# Values are Qdrant payload index types.
+SOURCE_METADATA_SCHEMA = {
+    "source_type": "keyword",
+    "source_uri": "keyword",
+    "filename": "text",  # full-text index, so partial names match
+    "ingested_at": "integer",  # unix timestamp
+}
+
+# Sources whose documents are individual pages identified by their URL
+URL_SOURCE_TYPES = ("website", "crawl")
+
+
+def annotate_documents(
+    documents: Sequence[Document],
+    source_type: str,
+    source_path: str,
+    ingested_at: Optional[int] = None,
+) -> Sequence[Document]:
+    """
+    Adds the source metadata fields to documents (inherited by their chunks).
+    The fields are kept out of the embedded and LLM-visible text.
+    """
+    ingested_at = ingested_at or int(time.time())
+    for doc in documents:
+        url = doc.id_ if source_type in URL_SOURCE_TYPES else None
+        metadata = {
+            "source_type": source_type,
+            "source_uri": url or source_path,
+            "ingested_at": ingested_at,
+        }
+        filename = doc.metadata.get("file_name")
+        if filename:
+            metadata["filename"] = filename
+        doc.metadata.update(metadata)
+        for excluded in (
+            doc.excluded_embed_metadata_keys,
+            doc.excluded_llm_metadata_keys,
+        ):
+            excluded.extend(key for key in metadata if key not in excluded)
+    return documents
+
+
+def build_metadata_filters(
+    source_type: Optional[str] = None,
+    filename: Optional[str] = None,
+    source_uri: Optional[str] = None,
+    ingested_after: Optional[datetime] = None,
+) -> Optional[MetadataFilters]:
+    """
+    Builds vector store filters from optional source metadata constraints.
+
+    Args:
+        source_type (str, optional): Exact source type ('docs', 'sql', ...).
+        filename (str, optional): Words of the file name (full-text match).
+        source_uri (str, optional): Exact source URI (S3 URI, URL, path).
+        ingested_after (datetime, optional): Only documents ingested at or after it
+            match. Naive values are taken as UTC.
+
+    Returns:
+        MetadataFilters | None: Filters combined with AND, or None if unconstrained.
+    """
+    filters: List[MetadataFilter] = []
+    if source_type:
+        filters.append(MetadataFilter(key="source_type", value=source_type))
+    if filename:
+        filters.append(
+            MetadataFilter(
+                key="filename", value=filename, operator=FilterOperator.TEXT_MATCH
+            )
+        )
+    if source_uri:
+        filters.append(MetadataFilter(key="source_uri", value=source_uri))
+    if ingested_after:
+        after = ingested_after
+        if after.tzinfo is None:
+            after = after.replace(tzinfo=timezone.utc)
+        filters.append(
+            MetadataFilter(
+                key="ingested_at",
+                value=int(after.timestamp()),
+                operator=FilterOperator.GTE,
+            )
+        )
+    return MetadataFilters(filters=filters) if filters else None
@@ -0,0 +1,94 @@
+"""
+Re-embeds an existing collection with another embedding model into a new collection,
+while the current one keeps serving traffic.
+
+Chunks are read back from the source collection's payloads, so the original sources
+do not need to be re-ingested. Once done, switch the deployment to the new model
+(EMBED_BACKEND / EMBED_MODEL / EMBED_DIMENSIONS with QDRANT_COLLECTION_PER_MODEL=true)
+and drop the old collection after the rollout.
+
+Usage:
+    python -m ingestion.reembed --source langgraph-rag-vectordb \\
+        --backend openai --model text-embedding-3-small --dimensions 512
+"""
+
+import argparse
+
+from ingestion.embeddings import build_embed_model, get_embedding_slug
+from utils.logger import get_logger
+from utils.qdrant_utils import (
+    create_collection,
+    create_payload_indexes,
+    get_collection_name,
+    get_qdrant_client,
+    get_vector_store,
+)
+
+logger = get_logger(__name__)
+
+
+def reembed_collection(
+    source: str, target: str, embed_model, batch_size: int = 256
+) -> int:
+    """
+    Copies every chunk of `source` into `target`, embedding it with `embed_model`.
+    Node ids are preserved, so re-running the copy overwrites instead of duplicating.
+
+    Returns:
+        int: Number of chunks copied.
+    """
+    client = get_qdrant_client()
+    source_store = get_vector_store(source)
+    dimension = len(embed_model.get_text_embedding("dimension probe"))
+    create_collection(dimension, target)
+    # Carry over the payload indexes used for filtered search
+    payload_schema = client.get_collection(source).payload_schema or {}
+    create_payload_indexes(
+        {name: info.data_type.value for name, info in payload_schema.items()}, target
+    )
+    target_store = get_vector_store(target)
+
+    copied, offset = 0, None
+    while True:
+        records, offset = client.scroll(
+            source, limit=batch_size, offset=offset, with_payload=True
+        )
+        if not records:
+            break
+        nodes = source_store.parse_to_query_result(records).nodes
+        embeddings = embed_model.get_text_embedding_batch(
+            [node.get_content(metadata_mode="embed") for node in nodes]
+        )
+        for node, embedding in zip(nodes, embeddings):
+            node.embedding = embedding
+        target_store.add(nodes)
+        copied += len(nodes)
+        logger.info(f"🔁 Re-embedded {copied} chunks into {target}")
+        if offset is None:
+            break
+    return copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--source", required=True, help="Collection to copy from")
+    parser.add_argument("--target", help="Defaults to the per-model collection name")
+    parser.add_argument("--backend", choices=["openai", "local"], default="openai")
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--dimensions", type=int)
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    target = args.target or get_collection_name(
+        get_embedding_slug(args.model, args.dimensions), per_model=True
+    )
+    if target == args.source:
+        parser.error("--target must differ from --source")
+
+    embed_model = build_embed_model(args.backend, args.model, args.dimensions)
+    copied = reembed_collection(args.source, target, embed_model, args.batch_size)
+    logger.info(f"✅ Copied {copied} chunks from {args.source} to {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,75 @@
+import asyncio
+from typing import List, Optional
+
 from fastapi import APIRouter, Body, File, UploadFile
 
 from utils.logger import get_logger
 
 from .index_builder import create_index
-from .upload_handler import save_uploaded_file
+from .upload_handler import run_in_ingestion_executor, save_uploaded_file
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
 
+async def _upload_and_index_one(file: UploadFile) -> dict:
+    try:
+        s3_uri = await run_in_ingestion_executor(save_uploaded_file, file)
+        await run_in_ingestion_executor(create_index, "docs", s3_uri)
+        return {"filename": file.filename, "s3_uri": s3_uri}
+    except Exception as e:
+        logger.exception(f"❌ Upload and indexing of {file.filename} failed: {e}")
+        return {"filename": file.filename, "error": str(e)}
+
+
 @router.post("/upload")
-async def upload_and_index(file: UploadFile = File(...)):
+async def upload_and_index(
+    file: Optional[UploadFile] = File(None),
+    files: Optional[List[UploadFile]] = File(None),
+):
     """
-    Uploads a document to S3 and indexes it into Qdrant.
+    Uploads one or more documents to S3 (or local storage) and indexes them into Qdrant.
+    Files are uploaded and indexed concurrently on the ingestion thread pool,
+    so the event loop stays free for other requests.
     """
-    try:
-        # Upload to S3 and get the S3 URI
-        s3_uri = save_uploaded_file(file)
+    uploads = ([file] if file else []) + (files or [])
+    if not uploads:
+        return {"error": "No file uploaded."}
 
-        # Index using the document source from S3
-        create_index("docs", s3_uri)
+    results = await asyncio.gather(*(_upload_and_index_one(f) for f in uploads))
+    indexed = [r["filename"] for r in results if "error" not in r]
+    if not indexed:
+        return {"error": "; ".join(f"{r['filename']}: {r['error']}" for r in results)}
 
-        return {"message": f"✅ Uploaded and indexed file: {file.filename}"}
-    except Exception as e:
-        logger.exception(f"❌ Upload and indexing failed: {e}")
-        return {"error": str(e)}
+    if len(uploads) == 1:
+        message = f"✅ Uploaded and indexed file: {indexed[0]}"
+    else:
+        message = f"✅ Uploaded and indexed {len(indexed)} of {len(uploads)} files"
+    return {"message": message, "files": results}
 
 
 @router.post("/create")
-def manual_ingest(source_type: str = Body(...), source_path: str = Body(...)):
+async def manual_ingest(
+    source_type: str = Body(...),
+    source_path: str = Body(...),
+    chunk_profile: str = Body(None),
+    full_refresh: bool = Body(False),
+):
     """
     Index documents from an existing source path (S3 URI).
+    Optionally overrides the chunking profile configured for the source type.
+    SQL and crawl sources only ingest rows/pages changed since the last run unless
+    `full_refresh` is set. Indexing runs on the ingestion thread pool.
     """
     try:
-        create_index(source_type, source_path)
+        await run_in_ingestion_executor(
+            create_index,
+            source_type,
+            source_path,
+            chunk_profile=chunk_profile,
+            full_refresh=full_refresh,
+        )
         return {"message": f"✅ Ingested and indexed from {source_type}"}
     except Exception as e:
         logger.exception(f"❌ Manual ingestion failed: {e}")
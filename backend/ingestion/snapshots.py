@@ -0,0 +1,366 @@
+"""
+Exports a vector collection (vectors, payloads and a manifest) into a snapshot file
+and bulk-restores it, so new environments and replicas start from the stored vectors
+instead of re-downloading and re-embedding every document.
+
+Snapshots are zip files holding `manifest.json` plus one float32 `.npy` vector block
+and one JSON-lines payload block per batch of points. They work with every
+VECTOR_STORE_MODE and can be written to / read from a local path or an S3 URI.
+
+A snapshot is restored into a new staging collection. Only after its point count
+checks out does the collection name become an alias of it, replacing the previous
+collection, so a failed restore never touches the collection being served.
+
+Usage:
+    python -m ingestion.snapshots export s3://langgraph-docs/snapshots/latest.zip
+    python -m ingestion.snapshots import ./snapshots/latest.zip --replace
+"""
+
+import argparse
+import fcntl
+import io
+import json
+import os
+import tempfile
+import time
+import uuid
+import zipfile
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import numpy as np
+from qdrant_client.http import models as rest
+
+from ingestion.embeddings import get_embedding_dimension, get_embedding_slug
+from ingestion.index_version import bump_index_version
+from ingestion.ingest_state import reset_collection_state
+from ingestion.sources import download_s3_file
+from ingestion.upload_handler import TRANSFER_CONFIG, s3
+from utils.logger import get_logger
+from utils.qdrant_utils import (
+    create_collection,
+    create_payload_indexes,
+    get_alias_target,
+    get_collection_name,
+    get_qdrant_client,
+)
+
+logger = get_logger(__name__)
+
+# Snapshot restored at startup when the collection does not exist yet
+SNAPSHOT_URI = os.getenv("SNAPSHOT_URI")
+# Points per vector/payload block, and per upload request when restoring
+SNAPSHOT_BATCH_SIZE = int(os.getenv("SNAPSHOT_BATCH_SIZE", "1000"))
+# Lock file serializing startup restores between the workers of one host
+SNAPSHOT_LOCK_FILE = os.getenv(
+    "SNAPSHOT_LOCK_FILE", os.path.join(tempfile.gettempdir(), "snapshot-restore.lock")
+)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+@contextmanager
+def restore_lock():
+    """
+    Holds an exclusive lock on SNAPSHOT_LOCK_FILE, so only one worker at a time
+    checks for and restores a missing collection.
+    """
+    fd = os.open(SNAPSHOT_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def _write_destination(local_path: str, destination: str):
+    if destination.startswith("s3://"):
+        parsed = urlparse(destination)
+        s3.upload_file(
+            local_path, parsed.netloc, parsed.path.lstrip("/"), Config=TRANSFER_CONFIG
+        )
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+        os.replace(local_path, destination)
+
+
+def export_snapshot(
+    destination: str,
+    collection_name: Optional[str] = None,
+    batch_size: int = SNAPSHOT_BATCH_SIZE,
+) -> dict:
+    """
+    Writes every point of a collection into a snapshot file.
+
+    Args:
+        destination (str): Local path or S3 URI of the snapshot.
+        collection_name (str, optional): Defaults to the configured model's collection.
+        batch_size (int): Points per block.
+
+    Returns:
+        dict: The snapshot manifest.
+    """
+    collection_name = collection_name or get_collection_name(get_embedding_slug())
+    client = get_qdrant_client()
+    info = client.get_collection(collection_name)
+    vectors_config = info.config.params.vectors
+    if isinstance(vectors_config, dict):
+        raise ValueError(
+            f"❌ Collection {collection_name} uses named vectors, which snapshots "
+            "do not support."
+        )
+
+    start = time.perf_counter()
+    fd, tmp_path = tempfile.mkstemp(suffix=".zip")
+    os.close(fd)
+    try:
+        points, part, offset = 0, 0, None
+        with zipfile.ZipFile(tmp_path, "w") as zf:
+            while True:
+                records, offset = client.scroll(
+                    collection_name,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+                if not records:
+                    break
+                vectors = io.BytesIO()
+                np.save(vectors, np.asarray([r.vector for r in records], np.float32))
+                zf.writestr(f"part-{part:05d}.npy", vectors.getvalue())
+                zf.writestr(
+                    f"part-{part:05d}.jsonl",
+                    "\n".join(
+                        json.dumps({"id": r.id, "payload": r.payload}) for r in records
+                    ),
+                    compress_type=zipfile.ZIP_DEFLATED,
+                )
+                points += len(records)
+                part += 1
+                logger.info(f"📸 Exported {points} points from {collection_name}")
+                if offset is None:
+                    break
+
+            manifest = {
+                "format_version": SNAPSHOT_FORMAT_VERSION,
+                "collection": collection_name,
+                "vector_size": vectors_config.size,
+                "distance": vectors_config.distance.value,
+                "embedding_slug": get_embedding_slug(),
+                "payload_schema": {
+                    name: field.data_type.value
+                    for name, field in (info.payload_schema or {}).items()
+                },
+                "points": points,
+                "parts": part,
+                "created_at": int(time.time()),
+            }
+            zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+
+        manifest["bytes"] = os.path.getsize(tmp_path)
+        _write_destination(tmp_path, destination)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    logger.info(
+        f"✅ Exported {points} points ({manifest['bytes'] / 1e6:.1f} MB) from "
+        f"{collection_name} to {destination} in {time.perf_counter() - start:.1f}s"
+    )
+    return manifest
+
+
+def _restore_points(
+    zf: zipfile.ZipFile, manifest: dict, collection_name: str, batch_size: int
+):
+    client = get_qdrant_client()
+    for part in range(manifest["parts"]):
+        vectors = np.load(io.BytesIO(zf.read(f"part-{part:05d}.npy")))
+        records = zf.read(f"part-{part:05d}.jsonl").decode("utf-8").splitlines()
+        client.upload_points(
+            collection_name,
+            points=[
+                rest.PointStruct(
+                    id=record["id"], vector=vector.tolist(), payload=record["payload"]
+                )
+                for record, vector in zip(map(json.loads, records), vectors)
+            ],
+            batch_size=batch_size,
+            wait=True,
+        )
+        logger.info(
+            f"📥 Restored part {part + 1}/{manifest['parts']} into {collection_name}"
+        )
+
+    restored = client.count(collection_name, exact=True).count
+    if restored != manifest["points"]:
+        raise RuntimeError(
+            f"❌ Restored {restored} of {manifest['points']} points into {collection_name}"
+        )
+
+
+def _is_populated(client, collection_name: str) -> bool:
+    return (
+        client.collection_exists(collection_name)
+        and client.count(collection_name, exact=True).count > 0
+    )
+
+
+def _swap_in(client, staging: str, collection_name: str, replace: bool):
+    """
+    Points the `collection_name` alias at the restored staging collection, then
+    drops the collection it replaces.
+    """
+    if not replace and _is_populated(client, collection_name):
+        # Populated meanwhile, e.g. by another replica restoring the same snapshot
+        raise ValueError(f"❌ Collection {collection_name} was populated meanwhile.")
+
+    previous = get_alias_target(collection_name)
+    operations = []
+    if previous:
+        operations.append(
+            rest.DeleteAliasOperation(
+                delete_alias=rest.DeleteAlias(alias_name=collection_name)
+            )
+        )
+    elif client.collection_exists(collection_name):
+        # A plain collection can't be swapped atomically; it is dropped only now
+        # that the restored data is complete
+        client.delete_collection(collection_name)
+    operations.append(
+        rest.CreateAliasOperation(
+            create_alias=rest.CreateAlias(
+                collection_name=staging, alias_name=collection_name
+            )
+        )
+    )
+    client.update_collection_aliases(change_aliases_operations=operations)
+    if previous:
+        client.delete_collection(previous)
+
+
+def import_snapshot(
+    source: str,
+    collection_name: Optional[str] = None,
+    payload_indexes: Optional[Dict[str, str]] = None,
+    replace: bool = False,
+    force: bool = False,
+    batch_size: int = SNAPSHOT_BATCH_SIZE,
+) -> dict:
+    """
+    Bulk-loads a snapshot into a new collection, keeping the point ids, and makes
+    `collection_name` an alias of it once all points are restored. On failure the
+    existing collection is left as it was.
+
+    Args:
+        source (str): Local path or S3 URI of the snapshot.
+        collection_name (str, optional): Defaults to the configured model's collection.
+        payload_indexes (dict, optional): Payload indexes to create in addition to
+            those recorded in the snapshot.
+        replace (bool): Replace an existing non-empty collection.
+        force (bool): Restore even if the snapshot was built with another embedding
+            model than the configured one.
+        batch_size (int): Points per upload request.
+
+    Returns:
+        dict: The snapshot manifest.
+    """
+    collection_name = collection_name or get_collection_name(get_embedding_slug())
+    client = get_qdrant_client()
+    start = time.perf_counter()
+    downloaded = source.startswith("s3://")
+    local_path = download_s3_file(source) if downloaded else source
+    try:
+        with zipfile.ZipFile(local_path) as zf:
+            manifest = json.loads(zf.read("manifest.json"))
+            if manifest["format_version"] != SNAPSHOT_FORMAT_VERSION:
+                raise ValueError(
+                    f"❌ Unsupported snapshot format {manifest['format_version']}"
+                )
+            if not force and (
+                manifest["embedding_slug"] != get_embedding_slug()
+                or manifest["vector_size"] != get_embedding_dimension()
+            ):
+                raise ValueError(
+                    f"❌ Snapshot was built with {manifest['embedding_slug']} "
+                    f"({manifest['vector_size']}-dim), but the configured embedding model "
+                    f"is {get_embedding_slug()} ({get_embedding_dimension()}-dim)."
+                )
+
+            if not replace and _is_populated(client, collection_name):
+                raise ValueError(
+                    f"❌ Collection {collection_name} is not empty; "
+                    "pass replace=True (--replace) to overwrite it."
+                )
+            staging = f"{collection_name}--restore-{uuid.uuid4().hex[:8]}"
+            create_collection(manifest["vector_size"], staging)
+            complete = False
+            try:
+                create_payload_indexes(
+                    {**manifest["payload_schema"], **(payload_indexes or {})}, staging
+                )
+                _restore_points(zf, manifest, staging, batch_size)
+                complete = True
+                _swap_in(client, staging, collection_name, replace)
+            except BaseException:
+                if complete and not client.collection_exists(collection_name):
+                    # The plain collection was dropped but the alias not created:
+                    # the restored copy is all that is left
+                    logger.error(
+                        f"❌ Restored points are kept in {staging}; create the alias "
+                        f"{collection_name} -> {staging} to serve them."
+                    )
+                else:
+                    # Drop the copy; the served collection is untouched
+                    client.delete_collection(staging)
+                raise
+    finally:
+        if downloaded:
+            os.remove(local_path)
+
+    # Cached retrieval results and incremental ingest state refer to the previous
+    # contents; sources are read in full on their next ingest
+    bump_index_version()
+    reset_collection_state(collection_name)
+    logger.info(
+        f"✅ Restored {manifest['points']} points into {collection_name} from {source} "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Write a snapshot")
+    export_parser.add_argument("destination", help="Local path or s3:// URI")
+    import_parser = subparsers.add_parser("import", help="Restore a snapshot")
+    import_parser.add_argument("source", help="Local path or s3:// URI")
+    import_parser.add_argument(
+        "--replace", action="store_true", help="Overwrite a non-empty collection"
+    )
+    import_parser.add_argument(
+        "--force", action="store_true", help="Skip the embedding model check"
+    )
+    for sub in (export_parser, import_parser):
+        sub.add_argument("--collection", help="Defaults to the configured collection")
+        sub.add_argument("--batch-size", type=int, default=SNAPSHOT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_snapshot(args.destination, args.collection, args.batch_size)
+    else:
+        import_snapshot(
+            args.source,
+            args.collection,
+            replace=args.replace,
+            force=args.force,
+            batch_size=args.batch_size,
+        )
+
+
+if __name__ == "__main__":
+    main()
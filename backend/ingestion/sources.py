@@ -1,12 +1,16 @@
 import os
-import sqlite3
 import tempfile
+from typing import Iterator, List, Optional
 from urllib.parse import urlparse
 
 import boto3
 from llama_index.core import Document, SimpleDirectoryReader
 from llama_index.readers.web import SimpleWebPageReader
 
+from ingestion.crawler import get_crawl_source_key, iter_crawl_batches
+from ingestion.ingest_state import get_collection_source_key, reset_state
+from ingestion.sql_source import get_sql_source_key, iter_sql_batches
+from ingestion.storage import STORAGE_BACKEND, list_local_documents
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -51,10 +55,23 @@ def list_s3_documents(bucket: str, prefix: str = "uploads/") -> list[str]:
         return []
 
 
+def list_stored_documents(prefix: str = "uploads/") -> list[str]:
+    """
+    Lists the uploaded documents in the configured storage backend
+    (S3 URIs, or file paths with STORAGE_BACKEND=local).
+    """
+    if STORAGE_BACKEND == "local":
+        return list_local_documents(prefix)
+    return list_s3_documents(
+        bucket="langgraph-docs", prefix=prefix
+    )  # TODO: Make bucket configurable
+
+
 def get_documents(source_type, source_path):
     if source_type == "website":
         logger.info("🌐 Fetching content from website...")
-        return SimpleWebPageReader().load_data(urls=[source_path])
+        # Convert HTML to markdown text so pages can be split on their headings
+        return SimpleWebPageReader(html_to_text=True).load_data(urls=[source_path])
 
     elif source_type == "docs":
         logger.info("📂 Loading document files...")
@@ -62,31 +79,76 @@ def get_documents(source_type, source_path):
             local_file_path = download_s3_file(source_path)
             local_dir = os.path.dirname(local_file_path)
             return SimpleDirectoryReader(local_dir).load_data()
+        elif os.path.isfile(source_path):
+            # Single stored file (local storage backend)
+            return SimpleDirectoryReader(input_files=[source_path]).load_data()
         else:
             return SimpleDirectoryReader(source_path).load_data()
 
-    elif source_type == "sql":
-        logger.info("🗄️ Reading FAQ entries from SQLite...")
-        if source_path.startswith("s3://"):
-            local_db_path = download_s3_file(source_path)
-        else:
-            local_db_path = source_path
-
-        conn = sqlite3.connect(local_db_path)
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("SELECT question, answer FROM faq")
-            rows = cursor.fetchall()
-        except sqlite3.Error as e:
-            logger.error(f"❌ SQLite error: {e}")
-            raise
-        finally:
-            conn.close()
-
+    elif source_type in ("sql", "crawl"):
+        logger.info(f"📥 Reading all documents from {source_type} source...")
         return [
-            Document(text=f"Q: {q.strip()}\nA: {a.strip()}") for q, a in rows if q and a
+            doc
+            for batch in iter_document_batches(
+                source_type, source_path, incremental=False
+            )
+            for doc in batch
         ]
 
     else:
         raise ValueError(f"❌ Unsupported source type: {source_type}")
+
+
+def iter_document_batches(
+    source_type: str,
+    source_path: str,
+    incremental: bool = True,
+    collection_name: Optional[str] = None,
+) -> Iterator[List[Document]]:
+    """
+    Yields the documents of a source in batches, so large sources can be chunked
+    and embedded without loading them into memory at once.
+
+    SQL sources are streamed from a cursor and crawled sites page by page; with
+    `incremental`, only rows/pages changed since the last ingest into
+    `collection_name` are read. Other sources yield a single batch.
+    """
+    if source_type == "crawl":
+        logger.info(f"🕸️ Crawling website from {source_path}...")
+        yield from iter_crawl_batches(
+            source_path, incremental=incremental, collection_name=collection_name
+        )
+        return
+    if source_type != "sql":
+        yield get_documents(source_type, source_path)
+        return
+
+    if source_path.startswith("s3://"):
+        local_db_path = download_s3_file(source_path)
+    else:
+        local_db_path = source_path
+    yield from iter_sql_batches(
+        local_db_path,
+        source_uri=source_path,
+        incremental=incremental,
+        collection_name=collection_name,
+    )
+
+
+def reset_source_state(
+    source_type: str, source_path: str, collection_name: Optional[str] = None
+):
+    """
+    Forgets the incremental state (watermark, page validators) of a source,
+    so the next ingest into `collection_name` reads it in full.
+    """
+    if source_type == "sql":
+        reset_state(
+            get_collection_source_key(get_sql_source_key(source_path), collection_name)
+        )
+    elif source_type == "crawl":
+        reset_state(
+            get_collection_source_key(
+                get_crawl_source_key(source_path), collection_name
+            )
+        )
@@ -0,0 +1,154 @@
+import os
+import re
+import sqlite3
+from typing import Iterator, List, Optional
+
+from llama_index.core import Document
+
+from ingestion.ingest_state import get_collection_source_key, get_state, set_state
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Table and columns read by the `sql` source; each row becomes one document
+SQL_TABLE = os.getenv("SQL_TABLE", "faq")
+SQL_COLUMNS = [
+    c.strip()
+    for c in os.getenv("SQL_COLUMNS", "question,answer").split(",")
+    if c.strip()
+]
+# Stable row identifier, used for document ids (re-ingested rows replace their vectors)
+SQL_ID_COLUMN = os.getenv("SQL_ID_COLUMN", "rowid")
+# Monotonic column used to sync only new/changed rows (e.g. rowid or updated_at)
+SQL_WATERMARK_COLUMN = os.getenv("SQL_WATERMARK_COLUMN", SQL_ID_COLUMN)
+# Optional extra filter, e.g. "published = 1"
+SQL_WHERE = os.getenv("SQL_WHERE")
+SQL_BATCH_SIZE = int(os.getenv("SQL_BATCH_SIZE", "500"))
+
+# Short labels for well-known columns, so FAQ rows read as "Q: ...\nA: ..."
+COLUMN_LABELS = {"question": "Q", "answer": "A"}
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _identifier(name: str) -> str:
+    """
+    Validates a configured table/column name before it is placed in a query.
+    """
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"❌ Invalid SQL identifier: {name!r}")
+    return f'"{name}"' if name.lower() != "rowid" else "rowid"
+
+
+def get_sql_source_key(source_uri: str, table: str = SQL_TABLE) -> str:
+    """
+    Returns the identifier of a SQL source, used as its document id prefix.
+    Its watermark is stored per collection (see `get_collection_source_key`).
+    """
+    return f"sql:{source_uri}:{table}"
+
+
+def build_sql_query(
+    table: str = SQL_TABLE,
+    columns: List[str] = SQL_COLUMNS,
+    id_column: str = SQL_ID_COLUMN,
+    watermark_column: str = SQL_WATERMARK_COLUMN,
+    where: Optional[str] = SQL_WHERE,
+    after_watermark: bool = False,
+) -> str:
+    """
+    Builds the row query, ordered by (watermark, id) so rows can be resumed
+    after the last processed one with a keyset condition.
+    """
+    id_col, wm_col = _identifier(id_column), _identifier(watermark_column)
+    selected = ", ".join(_identifier(c) for c in columns)
+
+    conditions = [f"({where})"] if where else []
+    if after_watermark:
+        conditions.append(
+            f"{id_col} > ?" if id_col == wm_col else f"({wm_col}, {id_col}) > (?, ?)"
+        )
+
+    query = f"SELECT {id_col}, {wm_col}, {selected} FROM {_identifier(table)}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    return query + f" ORDER BY {wm_col}, {id_col}"
+
+
+def format_row(columns: List[str], values: tuple) -> Optional[str]:
+    """
+    Renders a row as document text, or None if any column is empty.
+    """
+    if not all(v is not None and str(v).strip() for v in values):
+        return None
+    return "\n".join(
+        f"{COLUMN_LABELS.get(col, col)}: {str(value).strip()}"
+        for col, value in zip(columns, values)
+    )
+
+
+def iter_sql_batches(
+    db_path: str,
+    source_uri: Optional[str] = None,
+    batch_size: int = SQL_BATCH_SIZE,
+    incremental: bool = True,
+    collection_name: Optional[str] = None,
+) -> Iterator[List[Document]]:
+    """
+    Streams rows of the configured table as batches of documents.
+
+    With `incremental`, only rows after the stored watermark are read, and the
+    watermark advances once the consumer has processed a batch (i.e. when it
+    asks for the next one), so an interrupted ingest resumes where it stopped.
+
+    Args:
+        db_path (str): Local SQLite database path.
+        source_uri (str, optional): Stable source identifier (defaults to db_path).
+        batch_size (int): Rows per batch.
+        incremental (bool): Resume from and advance the stored watermark.
+        collection_name (str, optional): Collection the rows are indexed into; the
+            watermark is kept per collection.
+
+    Yields:
+        List[Document]: One document per row, with ids derived from the row id.
+    """
+    source_key = get_sql_source_key(source_uri or db_path)
+    state_key = get_collection_source_key(source_key, collection_name)
+    watermark = get_state(state_key, "watermark") if incremental else None
+    single_key = SQL_ID_COLUMN == SQL_WATERMARK_COLUMN
+
+    params = ()
+    if watermark:
+        params = (watermark[1],) if single_key else tuple(watermark)
+        logger.info(f"🔖 Resuming {source_key} after watermark {watermark}")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(
+            build_sql_query(after_watermark=watermark is not None), params
+        )
+        total = 0
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+
+            documents = []
+            for row_id, _, *values in rows:
+                text = format_row(SQL_COLUMNS, values)
+                if text:
+                    documents.append(Document(id_=f"{source_key}:{row_id}", text=text))
+            total += len(rows)
+
+            yield documents
+
+            if incremental:
+                last_id, last_watermark = rows[-1][0], rows[-1][1]
+                set_state(state_key, "watermark", [last_watermark, last_id])
+    except sqlite3.Error as e:
+        logger.error(f"❌ SQLite error: {e}")
+        raise
+    finally:
+        conn.close()
+
+    logger.info(f"🗄️ Read {total} rows from {source_key}")
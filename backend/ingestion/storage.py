@@ -0,0 +1,56 @@
+import os
+import shutil
+from typing import BinaryIO, List
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Where uploaded documents are stored: "s3" (S3_BUCKET_NAME) or "local" (a directory
+# on this machine, for development, offline runs and single-box deployments)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "s3").lower()
+LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "./storage")
+
+
+def _local_path(key: str) -> str:
+    root = os.path.abspath(LOCAL_STORAGE_DIR)
+    path = os.path.abspath(os.path.join(root, key))
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise ValueError(f"❌ Invalid storage key: {key}")
+    return path
+
+
+def save_local_file(fileobj: BinaryIO, key: str) -> str:
+    """
+    Stores a file under LOCAL_STORAGE_DIR and returns its absolute path.
+
+    Args:
+        fileobj (BinaryIO): File contents, read from the current position.
+        key (str): Relative path of the file, e.g. 'uploads/report.pdf'.
+
+    Returns:
+        str: Path of the stored file, usable as a `docs` source path.
+    """
+    path = _local_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        shutil.copyfileobj(fileobj, f)
+    logger.info(f"💾 Stored file locally: {path}")
+    return path
+
+
+def list_local_documents(prefix: str = "uploads/") -> List[str]:
+    """
+    Lists the files stored under a prefix of LOCAL_STORAGE_DIR.
+
+    Returns:
+        List[str]: Absolute paths of the stored files.
+    """
+    root = os.path.join(os.path.abspath(LOCAL_STORAGE_DIR), prefix)
+    file_paths = sorted(
+        os.path.join(dirpath, filename)
+        for dirpath, _, filenames in os.walk(root)
+        for filename in filenames
+    )
+    logger.info(f"📥 Found {len(file_paths)} documents in {root}")
+    return file_paths
@@ -1,24 +1,70 @@
+import asyncio
+import contextvars
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote_plus
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from fastapi import UploadFile
 
+from ingestion.storage import STORAGE_BACKEND, save_local_file
+from utils.profiling import PROFILING_ENABLED, profiled
+
 AWS_REGION = os.getenv("AWS_REGION")
 S3_BUCKET = os.getenv("S3_BUCKET_NAME")
 
+# Multipart transfer settings: files above the threshold are uploaded in parts
+# of S3_MULTIPART_CHUNKSIZE_MB, with up to S3_MAX_CONCURRENCY parts in flight
+S3_MULTIPART_THRESHOLD_MB = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "8"))
+S3_MULTIPART_CHUNKSIZE_MB = int(os.getenv("S3_MULTIPART_CHUNKSIZE_MB", "8"))
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "10"))
+# Threads running uploads and indexing, separate from the agent pool and the
+# default threadpool, so large uploads don't delay agent requests
+INGEST_WORKER_THREADS = int(os.getenv("INGEST_WORKER_THREADS", "4"))
+
+MB = 1024 * 1024
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=S3_MULTIPART_THRESHOLD_MB * MB,
+    multipart_chunksize=S3_MULTIPART_CHUNKSIZE_MB * MB,
+    max_concurrency=S3_MAX_CONCURRENCY,
+    use_threads=True,
+)
+
 # Initialize S3 client
 s3 = boto3.client("s3", region_name=AWS_REGION)
 
+ingestion_executor = ThreadPoolExecutor(
+    max_workers=INGEST_WORKER_THREADS, thread_name_prefix="ingest"
+)
+
 
 def save_uploaded_file(uploaded_file: UploadFile) -> str:
     """
     Uploads the uploaded file to the configured S3 bucket and returns the s3 URI.
+    Large files are sent as concurrent multipart uploads. With STORAGE_BACKEND=local
+    the file is stored in LOCAL_STORAGE_DIR and its path is returned instead.
     """
     s3_key = f"uploads/{quote_plus(uploaded_file.filename)}"
+    uploaded_file.file.seek(0)
+    if STORAGE_BACKEND == "local":
+        return save_local_file(uploaded_file.file, s3_key)
 
     # Upload the file to S3
-    s3.upload_fileobj(uploaded_file.file, S3_BUCKET, s3_key)
+    s3.upload_fileobj(uploaded_file.file, S3_BUCKET, s3_key, Config=TRANSFER_CONFIG)
 
     # Return the S3 URI
     return f"s3://{S3_BUCKET}/{s3_key}"
+
+
+async def run_in_ingestion_executor(fn, *args, **kwargs):
+    """
+    Runs a blocking upload/indexing function on the ingestion thread pool,
+    propagating the caller's context variables.
+    """
+    if PROFILING_ENABLED:
+        fn = profiled(fn)
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await loop.run_in_executor(ingestion_executor, call)
@@ -1,14 +1,85 @@
+import atexit
+import copy
+import json
 import logging
 import os
+import queue
+import random
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Standard LogRecord attributes, everything else passed via `extra` is emitted as a field
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+# Background listener draining the log queue (when LOG_QUEUE is enabled)
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as single-line JSON objects, including any `extra` fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class PayloadSamplingFilter(logging.Filter):
+    """
+    Lets through only a fraction of records marked as verbose payloads
+    (`extra=PAYLOAD`); all other records pass unchanged.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "payload", False):
+            return True
+        return self.rate >= 1.0 or random.random() < self.rate
+
+
+class DeferredFormattingQueueHandler(QueueHandler):
+    """
+    QueueHandler that interpolates the message when a record is enqueued, but
+    leaves formatting (timestamps, JSON, tracebacks) and I/O to the listener thread.
+
+    Arguments such as message lists and state dicts keep being mutated by the
+    logging thread, so they must not be read later on the listener. Records are
+    only prepared once they pass this handler's level and filters.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
 
 def setup_logging():
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+    # "text" (default) or "json" for structured, machine-readable logs
+    log_format = os.getenv("LOG_FORMAT", "text").lower()
+    # Fraction of verbose payload records (message dumps etc.) that are emitted
+    payload_sample_rate = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "1.0"))
+    # Hand records to a background thread instead of writing on the request path
+    use_queue = os.getenv("LOG_QUEUE", "false").lower() == "true"
 
     dictConfig(
         {
@@ -18,11 +89,19 @@ def setup_logging():
                 "default": {
                     "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
                 },
+                "json": {"()": JsonFormatter},
+            },
+            "filters": {
+                "payload_sampling": {
+                    "()": PayloadSamplingFilter,
+                    "rate": payload_sample_rate,
+                },
             },
             "handlers": {
                 "console": {
                     "class": "logging.StreamHandler",
-                    "formatter": "default",
+                    "formatter": "json" if log_format == "json" else "default",
+                    "filters": ["payload_sampling"],
                     "level": log_level,
                 },
             },
@@ -105,6 +184,45 @@ def setup_logging():
 
     restrict_third_party_loggers()
 
+    if use_queue:
+        enable_queue_logging()
+
+
+def enable_queue_logging():
+    """
+    Replaces the console handler on all configured loggers with a non-blocking
+    QueueHandler; a single background listener thread does the formatting and I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    loggers = [logging.getLogger()] + [
+        logger
+        for logger in logging.root.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)
+    ]
+    console = next(
+        (h for h in logging.getLogger().handlers if h.name == "console"), None
+    )
+    if console is None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredFormattingQueueHandler(log_queue)
+    # Level and sampling are applied before enqueueing, so dropped records are
+    # never interpolated (and sampled records are not sampled twice)
+    queue_handler.setLevel(console.level)
+    queue_handler.filters, console.filters = console.filters, []
+    for logger in loggers:
+        if console in logger.handlers:
+            logger.removeHandler(console)
+            logger.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, console, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
 
 def restrict_third_party_loggers():
     """
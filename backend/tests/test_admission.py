@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from agents.admission import AdmissionController, AdmissionRejected, parse_model_limits
+
+
+def test_parse_model_limits():
+    limits = parse_model_limits("openai:gpt-4o-mini=8, groq:qwen-qwq-32b=2,bad")
+    assert limits == {"openai:gpt-4o-mini": 8, "groq:qwen-qwq-32b": 2}
+
+
+def test_queue_full_is_rejected_with_429():
+    async def scenario():
+        controller = AdmissionController(
+            max_concurrency=1, max_queue=1, queue_timeout=1
+        )
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit("m"):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(AdmissionRejected) as exc:
+            async with controller.admit("m"):
+                pass
+        release.set()
+        await asyncio.gather(holder, waiter)
+        return exc.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 429
+    assert rejected.retry_after > 0
+
+
+def test_wait_timeout_is_rejected_with_503():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, queue_timeout=0.05)
+        async with controller.admit("m"):
+            with pytest.raises(AdmissionRejected) as exc:
+                async with controller.admit("m"):
+                    pass
+        return exc.value
+
+    assert asyncio.run(scenario()).status_code == 503
+
+
+def test_same_session_requests_are_serialized():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=4)
+        active, peak = 0, 0
+
+        async def run():
+            nonlocal active, peak
+            async with controller.admit("m", session_id="s1"):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(run() for _ in range(3)))
+        return peak, controller._sessions
+
+    peak, sessions = asyncio.run(scenario())
+    assert peak == 1
+    assert sessions == {}
+
+
+def test_extra_slots_are_only_taken_when_free():
+    async def scenario():
+        controller = AdmissionController(
+            max_concurrency=5, model_limits={"m": 3}, queue_timeout=0.05
+        )
+        async with controller.admit("other", slots=2) as other:
+            async with controller.admit("m", slots=8) as granted:
+                # The model limit is exhausted by the batch's slots
+                with pytest.raises(AdmissionRejected):
+                    async with controller.admit("m"):
+                        pass
+        return other, granted, controller._global._value
+
+    assert asyncio.run(scenario()) == (2, 3, 5)
@@ -0,0 +1,48 @@
+import json
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import HumanMessage
+
+import agents.agent_loader as loader
+from app.main import app
+from benchmarks.standins import STANDIN_RESPONSE, StandInGraphBuilder
+
+
+def test_batch_and_parse_yields_every_item_with_timings():
+    agent = StandInGraphBuilder(model_settings={"standin:standin": {"latency_ms": 20}})
+    inputs = [[HumanMessage(f"Question {i}")] for i in range(6)]
+
+    results = dict(agent.batch_and_parse(inputs, max_concurrency=3))
+
+    assert sorted(results) == list(range(6))
+    for result in results.values():
+        assert result["final_output"] == STANDIN_RESPONSE
+        assert result["latency_ms"] >= 20
+        assert result["usage"]["output_tokens"] == len(STANDIN_RESPONSE.split())
+
+
+def test_agent_batch_streams_items_and_summary(monkeypatch):
+    monkeypatch.setattr(loader.AgentLoader, "agent_class", StandInGraphBuilder)
+    monkeypatch.setattr(loader.AgentLoader, "_instances", {})
+
+    with TestClient(app).stream(
+        "POST",
+        "/agent/batch",
+        json={"inputs": ["What is LangGraph?", {"id": "q2", "input": "And Qdrant?"}]},
+    ) as response:
+        assert response.status_code == 200
+        events = [json.loads(line) for line in response.iter_lines() if line]
+
+    items = {e["id"]: e for e in events if e["type"] == "item"}
+    assert set(items) == {0, "q2"}
+    assert all(e["final_output"] == STANDIN_RESPONSE for e in items.values())
+    summary = events[-1]
+    assert summary["type"] == "summary"
+    assert summary["items"] == 2 and summary["errors"] == 0
+    assert summary["usage"]["input_tokens"] > 0
+
+
+def test_agent_batch_rejects_invalid_inputs():
+    client = TestClient(app)
+    assert client.post("/agent/batch", json={"inputs": []}).status_code == 400
+    assert client.post("/agent/batch", json={"inputs": ["ok", ""]}).status_code == 400
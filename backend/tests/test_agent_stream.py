@@ -0,0 +1,33 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import agents.agent_loader as loader
+from app.main import app
+from benchmarks.standins import STANDIN_RESPONSE, StandInGraphBuilder
+
+
+def test_agent_stream_sends_tokens_then_result(monkeypatch):
+    monkeypatch.setattr(loader.AgentLoader, "agent_class", StandInGraphBuilder)
+    monkeypatch.setattr(loader.AgentLoader, "_instances", {})
+
+    with TestClient(app).stream(
+        "POST",
+        "/agent/stream",
+        json={"input": "What is LangGraph?", "session_id": "stream-test"},
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.iter_lines() if line]
+
+    tokens = [e["content"] for e in events if e["type"] == "token"]
+    assert len(tokens) > 1
+    assert "".join(tokens) == STANDIN_RESPONSE
+    assert events[-1]["type"] == "result"
+    assert events[-1]["final_output"] == STANDIN_RESPONSE
+    assert events[-1]["llm_steps"][0]["step"] == "respond"
+
+
+def test_agent_stream_rejects_invalid_input_before_streaming():
+    response = TestClient(app).post("/agent/stream", json={"input": ""})
+    assert response.status_code == 400
@@ -0,0 +1,21 @@
+import pytest
+from llama_index.core import Document
+
+from ingestion.chunking import chunk_documents, get_node_parsers, get_source_profile
+
+
+def test_faq_rows_are_not_split():
+    rows = [Document(text=f"Q: question {i}?\nA: answer {i}.") for i in range(3)]
+    nodes = chunk_documents(rows, "sql")
+    assert [n.get_content() for n in nodes] == [r.text for r in rows]
+
+
+def test_source_profile_can_be_overridden(monkeypatch):
+    assert get_source_profile("sql") == "none"
+    monkeypatch.setenv("CHUNK_PROFILE_SQL", "sentence")
+    assert get_source_profile("sql") == "sentence"
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        get_node_parsers("paragraphs")
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ingestion import ingest_state
+from ingestion.crawler import HostRateLimiter, iter_crawl_batches
+
+PAGES = {
+    "index.html": '<h1>Home</h1><a href="a.html">A</a> <a href="b.html#top">B</a>'
+    ' <a href="https://example.com/">external</a>',
+    "a.html": '<h1>Page A</h1><a href="c.html">C</a> <a href="index.html">home</a>',
+    "b.html": "<h1>Page B</h1>",
+    "c.html": "<h1>Page C</h1>",
+}
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ingest_state, "INGEST_STATE_PATH", str(tmp_path / "state.sqlite3")
+    )
+    root = tmp_path / "site"
+    root.mkdir()
+    for name, html in PAGES.items():
+        (root / name).write_text(f"<html><body>{html}</body></html>")
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(QuietHandler, directory=str(root))
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/index.html", root
+    server.shutdown()
+
+
+def crawl(url, **kwargs):
+    return [
+        doc
+        for batch in iter_crawl_batches(
+            url, rate_limit=0, respect_robots=False, **kwargs
+        )
+        for doc in batch
+    ]
+
+
+def test_crawl_follows_same_domain_links_to_depth(site):
+    site, _ = site
+    base = site.rsplit("/", 1)[0]
+    shallow = crawl(site, max_depth=1, incremental=False)
+    assert sorted(d.id_ for d in shallow) == [
+        f"{base}/{p}" for p in ("a.html", "b.html", "index.html")
+    ]
+    assert any("# Page A" in d.text for d in shallow)
+
+    deep = crawl(site, max_depth=2, incremental=False)
+    assert len(deep) == 4
+
+
+def test_recrawl_skips_unchanged_pages_but_follows_their_links(site):
+    site, root = site
+    assert len(crawl(site, max_depth=2)) == 4
+    assert crawl(site, max_depth=2) == []
+
+    time.sleep(1.1)  # Last-Modified has one second resolution
+    (root / "c.html").write_text("<html><body><h1>Page C v2</h1></body></html>")
+    [changed] = crawl(site, max_depth=2)
+    assert changed.id_.endswith("/c.html") and "Page C v2" in changed.text
+
+
+def test_rate_limiter_spaces_requests_per_host():
+    async def run():
+        limiter = HostRateLimiter(rate=20)
+        start = time.monotonic()
+        for _ in range(5):
+            await limiter.wait("example.com")
+        await limiter.wait("other.com")
+        return time.monotonic() - start
+
+    assert 0.19 <= asyncio.run(run()) < 0.5
+
+
+def test_validators_are_kept_per_collection(site):
+    site, _ = site
+    assert len(crawl(site, max_depth=2, collection_name="a")) == 4
+    assert crawl(site, max_depth=2, collection_name="a") == []
+    # A new collection doesn't hold the pages, so they are fetched again
+    assert len(crawl(site, max_depth=2, collection_name="b")) == 4
+
+    ingest_state.reset_collection_state("a")
+    assert len(crawl(site, max_depth=2, collection_name="a")) == 4
@@ -0,0 +1,45 @@
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.schema import TextNode
+from qdrant_client import QdrantClient
+
+from ingestion import reembed
+from ingestion.embeddings import get_embedding_slug
+from utils import qdrant_utils
+
+
+def test_embedding_slug_is_collection_safe():
+    assert (
+        get_embedding_slug("text-embedding-3-small", 512)
+        == "text-embedding-3-small-512"
+    )
+    assert get_embedding_slug("BAAI/bge-small-en-v1.5") == "bge-small-en-v1-5"
+
+
+def test_collection_name_per_model():
+    base = qdrant_utils.QDRANT_COLLECTION
+    assert qdrant_utils.get_collection_name("bge", per_model=False) == base
+    assert qdrant_utils.get_collection_name("bge", per_model=True) == f"{base}--bge"
+
+
+def test_reembed_copies_chunks_into_new_collection(monkeypatch):
+    client = QdrantClient(location=":memory:")
+    monkeypatch.setattr(qdrant_utils, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(reembed, "get_qdrant_client", lambda: client)
+
+    qdrant_utils.create_collection(4, "old")
+    qdrant_utils.get_vector_store("old").add(
+        [
+            TextNode(
+                text=f"chunk {i}",
+                id_=f"00000000-0000-0000-0000-00000000000{i}",
+                embedding=[1.0, 0.0, 0.0, float(i)],
+            )
+            for i in range(3)
+        ]
+    )
+
+    copied = reembed.reembed_collection("old", "new", MockEmbedding(embed_dim=8))
+
+    assert copied == 3
+    assert qdrant_utils.get_collection_vector_size("new") == 8
+    assert client.count("new").count == 3
@@ -0,0 +1,44 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.http_clients import (
+    get_async_http_client,
+    get_http_client,
+    provider_client_kwargs,
+    warm_up_connections,
+)
+
+
+class NotFoundHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_providers_share_one_pool():
+    langchain_kwargs = provider_client_kwargs()
+    llama_kwargs = provider_client_kwargs("llama_index")
+    assert langchain_kwargs["http_client"] is get_http_client()
+    assert langchain_kwargs["http_async_client"] is get_async_http_client()
+    assert llama_kwargs["async_http_client"] is get_async_http_client()
+
+
+def test_warm_up_opens_connections_and_skips_unreachable_endpoints():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), NotFoundHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        timings = warm_up_connections(
+            {
+                "standin": f"http://127.0.0.1:{server.server_port}/v1",
+                "down": "http://127.0.0.1:1/v1",
+            }
+        )
+    finally:
+        server.shutdown()
+    assert list(timings) == ["standin"]
@@ -0,0 +1,74 @@
+import io
+
+import pytest
+from llama_index.core.schema import TextNode
+from llama_index.core.vector_stores.types import (
+    MetadataFilter,
+    MetadataFilters,
+    VectorStoreQuery,
+)
+
+from ingestion import sources, storage, upload_handler
+from utils import qdrant_utils
+
+
+@pytest.fixture
+def local_qdrant(tmp_path, monkeypatch):
+    monkeypatch.setattr(qdrant_utils, "VECTOR_STORE_MODE", "local")
+    monkeypatch.setattr(qdrant_utils, "EMBEDDED_VECTOR_STORE", True)
+    monkeypatch.setattr(qdrant_utils, "QDRANT_PATH", str(tmp_path / "qdrant"))
+    qdrant_utils.get_qdrant_client.cache_clear()
+    yield
+    qdrant_utils.get_qdrant_client().close()
+    qdrant_utils.get_qdrant_client.cache_clear()
+
+
+def test_embedded_vector_store_persists_and_filters(local_qdrant):
+    qdrant_utils.create_collection(4, "docs")
+    qdrant_utils.create_payload_indexes({"doc_id": "keyword"}, "docs")
+    vector_store = qdrant_utils.get_vector_store("docs")
+    vector_store.add(
+        [
+            TextNode(
+                text=f"chunk {i}",
+                id_=f"00000000-0000-0000-0000-00000000000{i}",
+                embedding=[1.0, 0.0, 0.0, float(i)],
+                metadata={"source_type": "docs" if i % 2 else "sql"},
+            )
+            for i in range(4)
+        ]
+    )
+
+    # Reopen the on-disk storage, as a restarted process would
+    qdrant_utils.get_qdrant_client().close()
+    qdrant_utils.get_qdrant_client.cache_clear()
+    result = qdrant_utils.get_vector_store("docs").query(
+        VectorStoreQuery(
+            query_embedding=[1.0, 0.0, 0.0, 3.0],
+            similarity_top_k=2,
+            filters=MetadataFilters(
+                filters=[MetadataFilter(key="source_type", value="docs")]
+            ),
+        )
+    )
+    assert [n.get_content() for n in result.nodes] == ["chunk 3", "chunk 1"]
+
+
+def test_local_storage_backend_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "LOCAL_STORAGE_DIR", str(tmp_path))
+    monkeypatch.setattr(upload_handler, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(sources, "STORAGE_BACKEND", "local")
+
+    class Upload:
+        filename = "notes.txt"
+        file = io.BytesIO(b"LangGraph builds agents as graphs.")
+
+    path = upload_handler.save_uploaded_file(Upload())
+
+    assert path == str(tmp_path / "uploads" / "notes.txt")
+    assert sources.list_stored_documents() == [path]
+    documents = sources.get_documents("docs", path)
+    assert documents[0].text == "LangGraph builds agents as graphs."
+
+    with pytest.raises(ValueError):
+        storage.save_local_file(io.BytesIO(b""), "../outside.txt")
@@ -0,0 +1,51 @@
+import json
+import logging
+
+from logging_config import JsonFormatter, PayloadSamplingFilter
+from utils.logger import PAYLOAD
+
+
+def make_record(**extra):
+    record = logging.makeLogRecord(
+        {
+            "name": "agents.routes",
+            "levelname": "INFO",
+            "msg": "took %.2fs",
+            "args": (1.5,),
+        }
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    entry = json.loads(JsonFormatter().format(make_record(session_id="s1")))
+    assert entry["message"] == "took 1.50s"
+    assert entry["logger"] == "agents.routes"
+    assert entry["session_id"] == "s1"
+
+
+def test_payload_records_are_sampled():
+    drop_all = PayloadSamplingFilter(rate=0.0)
+    assert drop_all.filter(make_record()) is True
+    assert drop_all.filter(make_record(**PAYLOAD)) is False
+    assert PayloadSamplingFilter(rate=1.0).filter(make_record(**PAYLOAD)) is True
+
+
+def test_queue_handler_snapshots_mutable_arguments():
+    import queue
+
+    from logging_config import DeferredFormattingQueueHandler
+
+    log_queue = queue.SimpleQueue()
+    handler = DeferredFormattingQueueHandler(log_queue)
+    handler.addFilter(PayloadSamplingFilter(rate=0.0))
+    messages = ["hello"]
+
+    handler.handle(make_record(msg="messages: %s", args=(messages,)))
+    handler.handle(make_record(msg="dropped %s", args=(messages,), **PAYLOAD))
+    messages.append("mutated later")
+
+    record = log_queue.get_nowait()
+    assert record.getMessage() == "messages: ['hello']"
+    assert log_queue.empty()
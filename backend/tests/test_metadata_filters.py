@@ -0,0 +1,92 @@
+from datetime import datetime
+
+import pytest
+from llama_index.core import Document, VectorStoreIndex
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.schema import MetadataMode
+from llama_index.core.vector_stores.types import FilterOperator
+from qdrant_client import QdrantClient
+
+from agents.retrieval import DocumentRetriever
+from agents.retrieval_cache import RetrievalCache
+from ingestion.metadata import (
+    SOURCE_METADATA_SCHEMA,
+    annotate_documents,
+    build_metadata_filters,
+)
+from utils import qdrant_utils
+
+
+def test_filters_from_tool_arguments():
+    assert build_metadata_filters() is None
+    filters = build_metadata_filters(
+        source_type="docs", filename="thesis", ingested_after=datetime(2024, 1, 1)
+    )
+    by_key = {f.key: f for f in filters.filters}
+    assert by_key["source_type"].value == "docs"
+    assert by_key["filename"].operator == FilterOperator.TEXT_MATCH
+    assert by_key["ingested_at"].value == 1704067200
+
+
+def test_source_metadata_is_not_embedded():
+    [doc] = annotate_documents(
+        [Document(text="body", metadata={"file_name": "thesis.pdf"})],
+        "docs",
+        "s3://bucket/uploads/thesis.pdf",
+    )
+    assert doc.metadata["source_uri"] == "s3://bucket/uploads/thesis.pdf"
+    assert doc.metadata["filename"] == "thesis.pdf"
+    assert "ingested_at" not in doc.get_content(metadata_mode=MetadataMode.EMBED)
+
+
+def test_filtered_retrieval_only_returns_matching_documents(monkeypatch):
+    client = QdrantClient(location=":memory:")
+    monkeypatch.setattr(qdrant_utils, "get_qdrant_client", lambda: client)
+    qdrant_utils.create_collection(8, "docs")
+    qdrant_utils.create_payload_indexes(SOURCE_METADATA_SCHEMA, "docs")
+
+    embed_model = MockEmbedding(embed_dim=8)
+    documents = annotate_documents(
+        [
+            Document(
+                text="thesis chapter", metadata={"file_name": "master_thesis.pdf"}
+            ),
+            Document(text="quarterly report", metadata={"file_name": "report.pdf"}),
+        ],
+        "docs",
+        "./docs",
+    )
+    index = VectorStoreIndex.from_vector_store(
+        qdrant_utils.get_vector_store("docs"), embed_model=embed_model
+    )
+    for doc in documents:
+        index.insert(doc)
+    retriever = DocumentRetriever(
+        index, cache=RetrievalCache(max_size=10, ttl=60), embed_model=embed_model
+    )
+
+    assert len(retriever.retrieve("chapter")) == 2
+    filtered = retriever.retrieve(
+        "chapter", filters=build_metadata_filters(filename="thesis")
+    )
+    assert [n.get_content() for n in filtered] == ["thesis chapter"]
+
+
+def test_retriever_tool_validates_ingested_after():
+    from langchain_core.tools import StructuredTool
+    from pydantic import ValidationError
+
+    from agents.tools import VectorRetrieverInput
+
+    received = []
+    tool = StructuredTool.from_function(
+        func=lambda query, **kwargs: received.append(kwargs) or "ok",
+        name="vector_retriever",
+        description="Searches documents.",
+        args_schema=VectorRetrieverInput,
+    )
+    tool.invoke({"query": "thesis", "ingested_after": "2024-01-01"})
+    assert received[0]["ingested_after"] == datetime(2024, 1, 1)
+
+    with pytest.raises(ValidationError):
+        tool.invoke({"query": "thesis", "ingested_after": "last week"})
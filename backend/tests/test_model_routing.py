@@ -0,0 +1,87 @@
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import HumanMessage
+from langchain_core.tools import tool
+
+from agents.graph_builder import parse_model_config
+from app.main import app
+from benchmarks.standins import StandInGraphBuilder
+from utils.metrics import metrics
+
+SETTINGS = {
+    "standin:primary": {"latency_ms": 0, "cpu_ms": 0, "tool_rounds": 2},
+    "standin:fast": {"latency_ms": 0, "cpu_ms": 0, "tool_rounds": 2},
+}
+
+
+@tool
+def lookup(query: str) -> str:
+    """Looks up reference material for a query."""
+    return f"notes on {query}"
+
+
+def test_single_model_runs_every_step_on_primary():
+    agent = StandInGraphBuilder(
+        "standin:primary", model_settings=SETTINGS, tools=[lookup]
+    )
+    result = agent.invoke([HumanMessage("What is LangGraph?")])
+
+    steps = [(s["step"], s["model"]) for s in result["llm_steps"]]
+    assert steps == [("respond", "standin:primary")] * 3
+
+
+def test_routing_selects_tools_on_fast_model_and_synthesizes_on_primary():
+    metrics.reset()
+    agent = StandInGraphBuilder(
+        "standin:primary",
+        model_settings=SETTINGS,
+        tools=[lookup],
+        routing_model="standin:fast",
+    )
+    result = agent.invoke([HumanMessage("What is LangGraph?")])
+
+    steps = [(s["step"], s["model"]) for s in result["llm_steps"]]
+    assert steps == [("select", "standin:fast")] * 3 + [
+        ("synthesize", "standin:primary")
+    ]
+    # The fast model's own answer is dropped, the primary model's is final
+    ai_messages = [m for m in result["messages"] if m.type == "ai"]
+    assert len(ai_messages) == 3
+    assert ai_messages[-1].content and not ai_messages[-1].tool_calls
+
+    assert metrics.get(
+        "agent_llm_tokens_total", step="select", model="standin:fast", kind="input"
+    ) == sum(s["input_tokens"] for s in result["llm_steps"][:3])
+    assert metrics.snapshot()["summaries"]["agent_llm_seconds"]
+
+
+def test_parse_model_config_rejects_unknown_providers():
+    assert parse_model_config("groq:llama-3.1-8b-instant") == (
+        "groq",
+        "llama-3.1-8b-instant",
+    )
+    with pytest.raises(ValueError):
+        parse_model_config("standin")
+    with pytest.raises(ValueError):
+        parse_model_config("acme:model")
+
+
+def test_agent_invoke_rejects_invalid_routing_model():
+    response = TestClient(app).post(
+        "/agent/invoke",
+        json={"input": "What is LangGraph?", "routing_model": "acme:fast"},
+    )
+    assert response.status_code == 400
+
+
+def test_agent_invoke_rejects_models_outside_the_allowlist():
+    from agents.agent_loader import AgentLoader
+
+    cached = len(AgentLoader.cached_agents())
+    response = TestClient(app).post(
+        "/agent/invoke",
+        json={"input": "What is LangGraph?", "model": "openai:made-up-model-123"},
+    )
+    assert response.status_code == 400
+    assert "not enabled" in response.json()["detail"]
+    assert len(AgentLoader.cached_agents()) == cached
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+from llama_index.core import VectorStoreIndex
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from agents.multi_query import (
+    QueryExpander,
+    reciprocal_rank_fusion,
+    template_variants,
+)
+from agents.retrieval import DocumentRetriever
+
+
+def _nodes(*ids):
+    return [NodeWithScore(node=TextNode(text=i, id_=i), score=1.0) for i in ids]
+
+
+def test_reciprocal_rank_fusion_dedupes_and_rewards_agreement():
+    fused = reciprocal_rank_fusion(
+        [_nodes("a", "b", "c"), _nodes("b", "d"), _nodes("b", "a")], k=60
+    )
+    assert [n.node.node_id for n in fused] == ["b", "a", "d", "c"]
+    assert fused[0].score == pytest.approx(1 / 62 + 1 / 61 + 1 / 61)
+    assert len(reciprocal_rank_fusion([_nodes("a", "b")], top_k=1)) == 1
+
+
+def test_template_variants_strip_question_phrasing():
+    assert template_variants("What does the tool node do?", 2) == [
+        "the tool node do",
+        "tool node",
+    ]
+    assert template_variants("vector retriever", 2) == []
+
+
+def test_expander_falls_back_to_query_when_llm_fails():
+    class BrokenLLM:
+        def complete(self, prompt):
+            raise RuntimeError("provider down")
+
+    with pytest.raises(ValueError):
+        QueryExpander("hyde")
+    variants = QueryExpander("llm", llm=BrokenLLM()).expand("what is langgraph")
+    assert [v.text for v in variants] == ["what is langgraph"]
+
+
+def test_variant_searches_run_concurrently_and_are_fused():
+    class SlowRetriever:
+        def __init__(self):
+            self.threads = set()
+
+        def retrieve(self, query_bundle):
+            self.threads.add(threading.get_ident())
+            time.sleep(0.2)
+            return _nodes(query_bundle.query_str, "shared")
+
+    index = VectorStoreIndex([], embed_model=MockEmbedding(embed_dim=4))
+    retriever = DocumentRetriever(
+        index,
+        similarity_top_k=5,
+        embed_model=MockEmbedding(embed_dim=4),
+        expander=QueryExpander("template", num_variants=3),
+    )
+    retriever.retriever = SlowRetriever()
+
+    start = time.perf_counter()
+    nodes = retriever.retrieve("How does the agent loop stop?")
+    elapsed = time.perf_counter() - start
+
+    assert len(retriever.retriever.threads) == 3
+    assert elapsed < 0.5
+    # The node found by every search ranks first and appears once
+    assert [n.node.node_id for n in nodes][0] == "shared"
+    assert len(nodes) == 4
+
+
+def test_original_query_is_searched_while_variants_are_generated():
+    searched = []
+
+    class Retriever:
+        def retrieve(self, query_bundle):
+            searched.append(query_bundle.query_str)
+            return _nodes(query_bundle.query_str)
+
+    class SlowLLM:
+        def complete(self, prompt):
+            time.sleep(0.1)
+            # The original query's search ran during the rewrite
+            assert searched == ["what is langgraph"]
+            return type("Response", (), {"text": "langgraph overview"})()
+
+    index = VectorStoreIndex([], embed_model=MockEmbedding(embed_dim=4))
+    retriever = DocumentRetriever(
+        index,
+        embed_model=MockEmbedding(embed_dim=4),
+        expander=QueryExpander("llm", llm=SlowLLM(), num_variants=2),
+    )
+    retriever.retriever = Retriever()
+
+    nodes = retriever.retrieve("what is langgraph")
+    assert searched == ["what is langgraph", "langgraph overview"]
+    assert len(nodes) == 2
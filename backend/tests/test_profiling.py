@@ -0,0 +1,91 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+import app.routes as ops_routes
+from agents import admission
+from agents.admission import run_in_agent_executor
+from app.main import app
+from utils import profiling
+
+
+def busy_work(n: int) -> int:
+    data = [str(i) * 10 for i in range(n)]
+    return sum(len(s) for s in data)
+
+
+def make_profiled_app() -> FastAPI:
+    profiled_app = FastAPI()
+    profiled_app.middleware("http")(profiling.profile_requests)
+
+    @profiled_app.get("/work")
+    async def work():
+        return {"total": await run_in_agent_executor(busy_work, 20000)}
+
+    @profiled_app.get("/stream")
+    async def stream():
+        async def body():
+            yield str(await run_in_agent_executor(busy_work, 1000))
+
+        return StreamingResponse(body())
+
+    return profiled_app
+
+
+def test_profile_header_writes_cpu_and_memory_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(admission, "PROFILING_ENABLED", True)
+    client = TestClient(make_profiled_app())
+
+    response = client.get("/work", headers={"X-Profile": "cpu,memory"})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    report = (tmp_path / f"{profile_id}.txt").read_text()
+    assert "GET /work" in report
+    assert "1 executor calls profiled" in report
+    assert "busy_work" in report
+    assert "Memory (tracemalloc" in report
+    assert (tmp_path / f"{profile_id}.prof").exists()
+    assert not profiling.tracemalloc.is_tracing()
+
+    # Streamed responses are profiled until the body is complete
+    response = client.get("/stream?profile=cpu")
+    report = (tmp_path / f"{response.headers['X-Profile-Id']}.txt").read_text()
+    assert "busy_work" in report and "Memory" not in report
+
+    # Requests without the flag are not profiled
+    response = client.get("/work")
+    assert "X-Profile-Id" not in response.headers
+    assert len(list(tmp_path.glob("*.txt"))) == 2
+
+
+def test_parse_profile_kinds():
+    assert profiling.parse_profile_kinds("1") == {"cpu", "memory"}
+    assert profiling.parse_profile_kinds(" CPU ") == {"cpu"}
+    assert profiling.parse_profile_kinds("gpu") == set()
+    assert profiling.parse_profile_kinds(None) == set()
+
+
+def test_admin_memory_and_profile_endpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    (tmp_path / "abc123.txt").write_text("Profile abc123")
+    client = TestClient(app)
+    # Disabled unless a token is configured
+    monkeypatch.setattr(ops_routes, "ADMIN_TOKEN", "")
+    assert client.get("/admin/memory").status_code == 404
+    assert client.get("/admin/profiles/abc123").status_code == 404
+
+    monkeypatch.setattr(ops_routes, "ADMIN_TOKEN", "secret")
+    client.headers["X-Admin-Token"] = "secret"
+    stats = client.get("/admin/memory").json()
+    assert stats["process"]["rss_bytes"] > 0
+    assert {"sessions", "agents", "tools", "index"} <= stats.keys()
+    assert stats["sessions"]["backend"]
+
+    assert client.get("/admin/profiles/abc123").text == "Profile abc123"
+    assert client.get("/admin/profiles/missing").status_code == 404
+
+    assert (
+        client.get("/admin/memory", headers={"X-Admin-Token": "x"}).status_code == 403
+    )
@@ -0,0 +1,53 @@
+import pytest
+from llama_index.core.schema import TextNode
+from llama_index.core.vector_stores.types import VectorStoreQuery
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as rest
+
+from utils.qdrant_utils import (
+    TunedQdrantVectorStore,
+    build_quantization_config,
+    get_search_params,
+)
+
+
+def test_quantization_configs():
+    assert build_quantization_config("none") is None
+    assert isinstance(build_quantization_config("scalar"), rest.ScalarQuantization)
+    assert isinstance(build_quantization_config("binary"), rest.BinaryQuantization)
+    with pytest.raises(ValueError):
+        build_quantization_config("pq8")
+
+
+def test_search_params_enable_rescoring_for_quantized_collections():
+    assert get_search_params(quantization="none") is None
+    params = get_search_params(hnsw_ef=64, quantization="scalar")
+    assert params.hnsw_ef == 64
+    assert params.quantization.rescore is True
+
+
+def test_tuned_store_searches_with_params():
+    client = QdrantClient(location=":memory:")
+    store = TunedQdrantVectorStore(
+        client=client,
+        collection_name="test",
+        search_params=rest.SearchParams(hnsw_ef=32),
+    )
+    store.add(
+        [
+            TextNode(
+                text="apples",
+                id_="00000000-0000-0000-0000-00000000000a",
+                embedding=[1.0, 0.0],
+            ),
+            TextNode(
+                text="pears",
+                id_="00000000-0000-0000-0000-00000000000b",
+                embedding=[0.0, 1.0],
+            ),
+        ]
+    )
+    result = store.query(
+        VectorStoreQuery(query_embedding=[0.9, 0.1], similarity_top_k=1)
+    )
+    assert [n.get_content() for n in result.nodes] == ["apples"]
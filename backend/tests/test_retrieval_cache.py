@@ -0,0 +1,32 @@
+import time
+
+from agents.retrieval_cache import LRUCache, RetrievalCache
+from ingestion.index_version import bump_index_version, get_index_version
+
+
+def test_results_are_invalidated_by_index_version():
+    cache = RetrievalCache(max_size=10, ttl=60)
+    version = get_index_version()
+    cache.put_results("what is langgraph?", version, ["node"])
+    cache.put_embedding("what is langgraph?", [0.1, 0.2])
+
+    assert cache.get_results("what is langgraph?", version) == ["node"]
+
+    new_version = bump_index_version()
+    assert new_version == version + 1
+    assert cache.get_results("what is langgraph?", new_version) is None
+    # Embeddings don't depend on the index contents
+    assert cache.get_embedding("what is langgraph?") == [0.1, 0.2]
+
+
+def test_lru_eviction_and_ttl():
+    cache = LRUCache(max_size=2, ttl=0.05)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    time.sleep(0.06)
+    assert cache.get("a") is None
@@ -0,0 +1,75 @@
+import pytest
+from langchain_core.messages import HumanMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.checkpoint.memory import MemorySaver
+
+from agents.session_store import get_session_history
+from benchmarks.standins import STANDIN_RESPONSE, StandInGraphBuilder
+
+SETTINGS = {"standin:standin": {"latency_ms": 0, "cpu_ms": 0, "tool_rounds": 1}}
+
+
+class WorkerCrash(BaseException):
+    """Stands in for the process dying mid-turn (not handled by the tool node)."""
+
+
+def make_lookup(crash_once: bool):
+    state = {"crashed": not crash_once}
+
+    @tool
+    def lookup(query: str) -> str:
+        """Looks up reference material for a query."""
+        if not state["crashed"]:
+            state["crashed"] = True
+            raise WorkerCrash()
+        return f"notes on {query}"
+
+    return lookup
+
+
+def test_history_store_keeps_each_turn_once():
+    agent = StandInGraphBuilder(
+        model_settings=SETTINGS, tools=[make_lookup(crash_once=False)]
+    )
+    for i in range(3):
+        result = agent.invoke_and_parse([HumanMessage(f"q{i}")], session_id="hist-1")
+        assert result["tools_used"] == ["lookup"]
+
+    # human, tool call, tool result, answer per turn
+    assert len(get_session_history("hist-1").messages) == 3 * 4
+
+
+def test_checkpointer_parses_only_the_current_turn():
+    agent = StandInGraphBuilder(
+        model_settings=SETTINGS,
+        tools=[make_lookup(crash_once=False)],
+        checkpointer=MemorySaver(),
+    )
+    for i in range(3):
+        result = agent.invoke_and_parse([HumanMessage(f"q{i}")], session_id="ckpt-1")
+
+    assert result["final_output"] == STANDIN_RESPONSE
+    assert result["tools_used"] == ["lookup"]
+    assert [s["step"] for s in result["llm_steps"]] == ["respond", "respond"]
+    state = agent.session_graph.get_state({"configurable": {"thread_id": "ckpt-1"}})
+    assert len(state.values["messages"]) == 3 * 4
+
+
+def test_checkpointer_resumes_an_interrupted_turn():
+    agent = StandInGraphBuilder(
+        model_settings=SETTINGS,
+        tools=[make_lookup(crash_once=True)],
+        checkpointer=MemorySaver(),
+    )
+    with pytest.raises(WorkerCrash):
+        agent.invoke_and_parse([HumanMessage("first")], session_id="ckpt-2")
+
+    result = agent.invoke_and_parse([HumanMessage("second")], session_id="ckpt-2")
+    assert result["final_output"] == STANDIN_RESPONSE
+
+    messages = agent.session_graph.get_state(
+        {"configurable": {"thread_id": "ckpt-2"}}
+    ).values["messages"]
+    # The interrupted first turn was completed before the second one started
+    assert [m.type for m in messages] == ["human", "ai", "tool", "ai"] * 2
+    assert isinstance(messages[2], ToolMessage) and "first" in messages[2].content
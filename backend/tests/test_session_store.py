@@ -0,0 +1,17 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agents.session_store import SQLiteChatMessageHistory
+
+
+def test_sqlite_history_is_shared_between_instances(tmp_path):
+    db_path = str(tmp_path / "sessions.sqlite3")
+    writer = SQLiteChatMessageHistory("s1", db_path=db_path)
+    writer.add_messages([HumanMessage(content="hi"), AIMessage(content="hello")])
+
+    # A second instance (e.g. in another worker) sees the same conversation
+    reader = SQLiteChatMessageHistory("s1", db_path=db_path)
+    assert [m.content for m in reader.messages] == ["hi", "hello"]
+    assert SQLiteChatMessageHistory("s2", db_path=db_path).messages == []
+
+    reader.clear()
+    assert writer.messages == []
@@ -0,0 +1,49 @@
+import threading
+import time
+
+from utils.singleflight import SingleFlight, normalize_query
+
+
+def test_concurrent_identical_calls_are_coalesced():
+    flight = SingleFlight("test_coalesce")
+    calls = []
+    barrier = threading.Barrier(5)
+
+    def work():
+        calls.append(1)
+        time.sleep(0.2)
+        return "result"
+
+    results = []
+
+    def caller():
+        barrier.wait()
+        results.append(flight.do("same-key", work))
+
+    threads = [threading.Thread(target=caller) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert flight.stats()["coalesced"] == 4
+
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight("test_errors")
+
+    def boom():
+        raise RuntimeError("failed")
+
+    for _ in range(2):
+        try:
+            flight.do("key", boom)
+        except RuntimeError:
+            pass
+    assert flight.stats()["executions"] == 2
+
+
+def test_normalize_query():
+    assert normalize_query("  What IS   LangGraph? ") == "what is langgraph?"
@@ -0,0 +1,100 @@
+import pytest
+from llama_index.core.schema import TextNode
+from llama_index.core.vector_stores.types import VectorStoreQuery
+from qdrant_client import QdrantClient
+
+from ingestion import ingest_state, snapshots
+from utils import qdrant_utils
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        ingest_state, "INGEST_STATE_PATH", str(tmp_path / "state.sqlite3")
+    )
+    client = QdrantClient(location=":memory:")
+    monkeypatch.setattr(qdrant_utils, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(snapshots, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(snapshots, "get_embedding_dimension", lambda: 4)
+
+    qdrant_utils.create_collection(4, "docs")
+    qdrant_utils.get_vector_store("docs").add(
+        [
+            TextNode(
+                text=f"chunk {i}",
+                id_=f"00000000-0000-0000-0000-00000000000{i}",
+                embedding=[1.0, 0.0, 0.0, float(i)],
+                metadata={"source_type": "docs"},
+            )
+            for i in range(5)
+        ]
+    )
+    return client
+
+
+def test_export_and_restore_round_trip(client, tmp_path):
+    path = str(tmp_path / "snapshots" / "docs.zip")
+    manifest = snapshots.export_snapshot(path, "docs", batch_size=2)
+    assert (manifest["points"], manifest["parts"], manifest["vector_size"]) == (5, 3, 4)
+
+    with pytest.raises(ValueError):
+        # Refuses to overwrite a populated collection by default
+        snapshots.import_snapshot(path, "docs")
+
+    snapshots.import_snapshot(path, "restored", payload_indexes={"doc_id": "keyword"})
+    assert client.count("restored").count == 5
+
+    result = qdrant_utils.get_vector_store("restored").query(
+        VectorStoreQuery(query_embedding=[1.0, 0.0, 0.0, 4.0], similarity_top_k=1)
+    )
+    assert result.nodes[0].get_content() == "chunk 4"
+    assert result.nodes[0].metadata["source_type"] == "docs"
+
+
+def test_failed_replace_keeps_the_served_collection(client, tmp_path, monkeypatch):
+    path = str(tmp_path / "docs.zip")
+    snapshots.export_snapshot(path, "docs")
+    snapshots.import_snapshot(path, "docs", replace=True)
+    assert client.count("docs").count == 5
+
+    def fail(*args):
+        raise RuntimeError("upload failed")
+
+    monkeypatch.setattr(snapshots, "_restore_points", fail)
+    with pytest.raises(RuntimeError):
+        snapshots.import_snapshot(path, "docs", replace=True)
+
+    # The alias still points at the previous restore, and no staging copy is left
+    assert client.count("docs").count == 5
+    assert len(client.get_collections().collections) == 1
+
+
+def test_restore_rejects_other_embedding_model(client, tmp_path, monkeypatch):
+    path = str(tmp_path / "docs.zip")
+    snapshots.export_snapshot(path, "docs")
+    monkeypatch.setattr(snapshots, "get_embedding_dimension", lambda: 8)
+
+    with pytest.raises(ValueError):
+        snapshots.import_snapshot(path, "restored")
+    assert not client.collection_exists("restored")
+
+    snapshots.import_snapshot(path, "restored", force=True)
+    assert client.count("restored").count == 5
+
+
+def test_load_index_restores_missing_collection_from_snapshot(
+    client, tmp_path, monkeypatch
+):
+    from ingestion import index_builder
+
+    path = str(tmp_path / "docs.zip")
+    snapshots.export_snapshot(path, "docs")
+    monkeypatch.setattr(index_builder, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(index_builder, "get_embedding_dimension", lambda: 4)
+    monkeypatch.setattr(index_builder, "QDRANT_COLLECTION", "restored")
+    monkeypatch.setattr(index_builder, "SNAPSHOT_URI", path)
+
+    index = index_builder.load_index()
+
+    assert client.count("restored").count == 5
+    assert index.vector_store.collection_name == "restored"
@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+
+from ingestion import ingest_state
+from ingestion.sources import get_documents
+from ingestion.sql_source import build_sql_query, iter_sql_batches
+
+
+@pytest.fixture
+def faq_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ingest_state, "INGEST_STATE_PATH", str(tmp_path / "state.sqlite3")
+    )
+    db_path = str(tmp_path / "faq.sqlite3")
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("CREATE TABLE faq (question TEXT, answer TEXT)")
+        conn.executemany(
+            "INSERT INTO faq VALUES (?, ?)",
+            [(f"question {i}?", f"answer {i}.") for i in range(5)] + [("empty?", "")],
+        )
+    conn.close()
+    return db_path
+
+
+def add_row(db_path, question, answer):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("INSERT INTO faq VALUES (?, ?)", (question, answer))
+    conn.close()
+
+
+def test_rows_are_streamed_in_batches(faq_db):
+    batches = list(iter_sql_batches(faq_db, batch_size=2, incremental=False))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert batches[0][0].text == "Q: question 0?\nA: answer 0."
+    assert get_documents("sql", faq_db)[0].text == "Q: question 0?\nA: answer 0."
+
+
+def test_incremental_ingest_only_reads_new_rows(faq_db):
+    assert sum(len(b) for b in iter_sql_batches(faq_db)) == 5
+    assert sum(len(b) for b in iter_sql_batches(faq_db)) == 0
+
+    add_row(faq_db, "new question?", "new answer.")
+    [batch] = list(iter_sql_batches(faq_db))
+    assert [d.text for d in batch] == ["Q: new question?\nA: new answer."]
+    assert batch[0].id_.endswith(":7")
+
+
+def test_watermark_only_advances_after_batch_is_processed(faq_db):
+    batches = iter_sql_batches(faq_db, batch_size=2)
+    next(batches)
+    batches.close()  # interrupted before the first batch was confirmed
+
+    assert sum(len(b) for b in iter_sql_batches(faq_db, batch_size=2)) == 5
+
+
+def test_timestamp_watermark_uses_keyset_on_ties():
+    query = build_sql_query(
+        "faq", ["question"], "id", "updated_at", where=None, after_watermark=True
+    )
+    assert '("updated_at", "id") > (?, ?)' in query
+    assert query.endswith('ORDER BY "updated_at", "id"')
+
+
+def test_invalid_identifiers_are_rejected():
+    with pytest.raises(ValueError):
+        build_sql_query("faq; DROP TABLE faq", ["question"], "rowid", "rowid", None)
+
+
+def test_recreated_collection_is_ingested_in_full(faq_db, monkeypatch):
+    from llama_index.core import Settings
+    from llama_index.core.embeddings import MockEmbedding
+    from qdrant_client import QdrantClient
+
+    from ingestion import index_builder
+    from utils import qdrant_utils
+
+    client = QdrantClient(location=":memory:")
+    monkeypatch.setattr(qdrant_utils, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(index_builder, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(index_builder, "get_embedding_dimension", lambda: 8)
+    monkeypatch.setattr(index_builder, "QDRANT_COLLECTION", "faq")
+    monkeypatch.setattr(Settings, "embed_model", MockEmbedding(embed_dim=8))
+
+    index_builder.create_index("sql", faq_db)
+    assert client.count("faq").count == 5
+
+    # The watermark belongs to the dropped collection, not to the new one
+    client.delete_collection("faq")
+    index_builder.create_index("sql", faq_db)
+    assert client.count("faq").count == 5
@@ -9,3 +9,31 @@ def test_manual_ingest_invalid():
     })
     assert response.status_code == 200
     assert "error" in response.json()
+
+
+def test_upload_processes_files_concurrently(monkeypatch):
+    import time
+
+    import ingestion.routes as routes
+
+    def slow_upload(file):
+        time.sleep(0.2)
+        return f"s3://bucket/uploads/{file.filename}"
+
+    indexed = []
+    monkeypatch.setattr(routes, "save_uploaded_file", slow_upload)
+    monkeypatch.setattr(
+        routes, "create_index", lambda source_type, uri: indexed.append(uri)
+    )
+
+    start = time.perf_counter()
+    response = client.post(
+        "/vectordb/upload",
+        files=[("files", (f"doc{i}.txt", b"text")) for i in range(3)],
+    )
+    elapsed = time.perf_counter() - start
+
+    body = response.json()
+    assert body["message"] == "✅ Uploaded and indexed 3 of 3 files"
+    assert sorted(indexed) == [f"s3://bucket/uploads/doc{i}.txt" for i in range(3)]
+    assert elapsed < 0.5  # sequential uploads would take 0.6s
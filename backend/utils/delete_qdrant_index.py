@@ -1,38 +1,55 @@
 import os
+import sys
 from pathlib import Path
 
 from dotenv import load_dotenv
-from qdrant_client import QdrantClient
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+# Runnable as a file (python backend/utils/delete_qdrant_index.py) and as a module
+# (python -m utils.delete_qdrant_index from backend/)
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
 
 # Load environment variables from .env file
-env_path = Path(__file__).resolve().parents[2] / ".env"
+env_path = BACKEND_DIR.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
 # Qdrant configuration
 QDRANT_HOST = os.getenv("QDRANT_HOST")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
-QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "langgraph-rag-vectordb")
+VECTOR_STORE_MODE = os.getenv("VECTOR_STORE_MODE", "remote").lower()
 
 
 def delete_qdrant_index():
-    if not QDRANT_HOST or not QDRANT_API_KEY:
+    if VECTOR_STORE_MODE == "remote" and (not QDRANT_HOST or not QDRANT_API_KEY):
         print("❌ QDRANT_HOST or QDRANT_API_KEY not set. Please check your .env file.")
         return
 
-    client = QdrantClient(url=QDRANT_HOST, api_key=QDRANT_API_KEY)
+    # Imported after loading .env, so the client and collection name follow it
+    # (VECTOR_STORE_MODE, QDRANT_COLLECTION_PER_MODEL, EMBED_MODEL, ...)
+    from ingestion.embeddings import get_embedding_slug
+    from utils.qdrant_utils import (
+        delete_collection,
+        get_collection_name,
+        get_qdrant_client,
+    )
+
+    collection_name = get_collection_name(get_embedding_slug())
+    client = get_qdrant_client()
 
-    if client.collection_exists(QDRANT_COLLECTION):
+    if client.collection_exists(collection_name):
         confirm = input(
-            f"⚠️ Are you sure you want to delete collection '{QDRANT_COLLECTION}'? This cannot be undone. (yes/no): "
+            f"⚠️ Are you sure you want to delete collection '{collection_name}'? This cannot be undone. (yes/no): "
         )
         if confirm.strip().lower() != "yes":
             print("❌ Deletion aborted.")
             return
 
-        client.delete_collection(QDRANT_COLLECTION)
-        print(f"✅ Qdrant collection '{QDRANT_COLLECTION}' deleted successfully.")
+        # Restored snapshots are served through an alias of the same name
+        delete_collection(collection_name)
+        print(f"✅ Qdrant collection '{collection_name}' deleted successfully.")
     else:
-        print(f"ℹ️ Collection '{QDRANT_COLLECTION}' does not exist.")
+        print(f"ℹ️ Collection '{collection_name}' does not exist.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Shared connection pool for all LLM / embedding provider calls
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+# Idle connections are kept open this long (httpx default: 5s)
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "120"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+# Retries of failed provider calls (429/5xx/connection errors), done by the provider SDKs
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+# Open provider connections at startup, and re-ping them while idle (0 disables)
+HTTP_WARMUP = os.getenv("HTTP_WARMUP", "true").lower() == "true"
+HTTP_WARMUP_INTERVAL = float(os.getenv("HTTP_WARMUP_INTERVAL", "60"))
+
+# Provider base URLs warmed at startup when their API key is configured
+PROVIDER_ENDPOINTS = {
+    "openai": (
+        "OPENAI_API_KEY",
+        os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+    ),
+    "groq": ("GROQ_API_KEY", os.getenv("GROQ_BASE_URL", "https://api.groq.com")),
+}
+
+_lock = threading.Lock()
+_sync_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("⚠️ HTTP2_ENABLED is set but the 'h2' package is missing.")
+        return False
+    return True
+
+
+def _client_kwargs() -> dict:
+    return {
+        "http2": _http2_available(),
+        "limits": httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        "follow_redirects": True,
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Returns the process-wide HTTP client shared by all synchronous provider calls.
+    Created lazily, so each worker process gets its own pool after fork.
+    """
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_client = httpx.Client(**_client_kwargs())
+    return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide HTTP client shared by all async provider calls
+    (used from the server's event loop).
+    """
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(**_client_kwargs())
+    return _async_client
+
+
+def provider_client_kwargs(flavor: str = "langchain") -> dict:
+    """
+    Keyword arguments wiring a provider model to the shared clients and retry policy.
+
+    Args:
+        flavor (str): 'langchain' (ChatOpenAI, ChatGroq) or 'llama_index'
+            (OpenAI LLM, OpenAIEmbedding), which name the async client differently.
+    """
+    async_key = "http_async_client" if flavor == "langchain" else "async_http_client"
+    return {
+        "http_client": get_http_client(),
+        async_key: get_async_http_client(),
+        "max_retries": HTTP_MAX_RETRIES,
+    }
+
+
+def warm_up_connections(endpoints: Optional[Dict[str, str]] = None) -> Dict[str, float]:
+    """
+    Opens (or refreshes) pooled connections to the provider endpoints, so the first
+    real calls skip DNS, TCP and TLS setup. Any HTTP response counts as success.
+
+    Returns:
+        dict: Provider -> round-trip seconds for the endpoints that responded.
+    """
+    if endpoints is None:
+        endpoints = {
+            name: url
+            for name, (key_env, url) in PROVIDER_ENDPOINTS.items()
+            if os.getenv(key_env)
+        }
+
+    client = get_http_client()
+    timings = {}
+    for name, url in endpoints.items():
+        start = time.perf_counter()
+        try:
+            client.get(url, timeout=HTTP_CONNECT_TIMEOUT)
+        except httpx.HTTPError as e:
+            logger.warning("⚠️ Warm-up of %s (%s) failed: %s", name, url, e)
+            continue
+        timings[name] = time.perf_counter() - start
+        metrics.observe("http_warmup_seconds", timings[name], provider=name)
+    if timings:
+        logger.info(
+            "🔥 Warmed up provider connections: %s",
+            ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in timings.items()),
+        )
+    return timings
+
+
+async def close_http_clients():
+    """
+    Closes the shared clients at shutdown.
+    """
+    global _sync_client, _async_client
+    with _lock:
+        sync_client, async_client = _sync_client, _async_client
+        _sync_client = _async_client = None
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None:
+        await async_client.aclose()
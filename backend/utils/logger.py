@@ -1,9 +1,13 @@
 import logging
-import os
+
+# Pass as `extra=PAYLOAD` on records that dump large objects (message histories,
+# retrieved chunks, ...). Such records are subject to LOG_PAYLOAD_SAMPLE_RATE.
+PAYLOAD = {"payload": True}
 
 
 def get_logger(name: str) -> logging.Logger:
-    logger = logging.getLogger(name)
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-    logger.setLevel(getattr(logging, log_level, logging.INFO))
-    return logger
+    """
+    Returns a module logger. Levels and handlers are configured centrally in
+    `logging_config.setup_logging`, so this does not touch the logger's level.
+    """
+    return logging.getLogger(name)
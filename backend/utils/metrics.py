@@ -0,0 +1,99 @@
+import threading
+from collections import defaultdict
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class MetricsRegistry:
+    """
+    Minimal thread-safe, in-process metrics registry.
+
+    Supports counters, gauges and summaries (count/sum/max) keyed by metric name
+    and an optional set of labels. Exposed as JSON through the `/metrics` endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._gauges = {}
+        self._summaries = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """
+        Increments a counter.
+        """
+        with self._lock:
+            self._counters[(name, _label_key(labels))] += value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """
+        Sets a gauge to an absolute value.
+        """
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def add_gauge(self, name: str, delta: float, **labels):
+        """
+        Adjusts a gauge by a relative amount (e.g. +1 on enter, -1 on exit).
+        """
+        with self._lock:
+            key = (name, _label_key(labels))
+            self._gauges[key] = self._gauges.get(key, 0) + delta
+
+    def observe(self, name: str, value: float, **labels):
+        """
+        Records an observation (e.g. a latency in seconds) into a summary.
+        """
+        with self._lock:
+            key = (name, _label_key(labels))
+            summary = self._summaries.setdefault(
+                key, {"count": 0, "sum": 0.0, "max": 0.0}
+            )
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["max"] = max(summary["max"], value)
+
+    def get(self, name: str, **labels) -> float:
+        """
+        Returns the current value of a counter or gauge (0 if unset).
+        """
+        key = (name, _label_key(labels))
+        with self._lock:
+            if key in self._gauges:
+                return self._gauges[key]
+            return self._counters.get(key, 0)
+
+    def snapshot(self) -> dict:
+        """
+        Returns a JSON-serialisable snapshot of all metrics.
+        """
+
+        def _render(items, value_fn):
+            rendered = defaultdict(list)
+            for (name, labels), value in sorted(items):
+                rendered[name].append(
+                    {"labels": dict(labels), "value": value_fn(value)}
+                )
+            return dict(rendered)
+
+        with self._lock:
+            return {
+                "counters": _render(self._counters.items(), lambda v: v),
+                "gauges": _render(self._gauges.items(), lambda v: v),
+                "summaries": _render(self._summaries.items(), dict),
+            }
+
+    def reset(self):
+        """
+        Clears all metrics. Intended for tests.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+# Process-wide registry shared by all modules
+metrics = MetricsRegistry()
@@ -0,0 +1,321 @@
+import cProfile
+import gc
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from contextvars import ContextVar
+from functools import reduce
+from typing import Optional
+
+from fastapi import Request
+
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+# On-demand request profiling; the middleware and executor hooks are only
+# installed when enabled, so there is no overhead otherwise
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+# CPU profiler: "cprofile" (deterministic, stdlib) or "pyinstrument" (sampling)
+PROFILER = os.getenv("PROFILER", "cprofile").lower()
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "40"))
+# Frames kept per allocation traceback while tracemalloc is running
+PROFILE_TRACEMALLOC_FRAMES = int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", "10"))
+
+# Request header / query parameter asking for a profile, e.g. "cpu", "memory" or
+# "cpu,memory" ("1", "true" and "all" select both)
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_KINDS = ("cpu", "memory")
+
+# Profile collecting work done on behalf of the current request
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "request_profile", default=None
+)
+
+# tracemalloc is process-wide; it runs while at least one memory profile is open
+_tracemalloc_users = 0
+_tracemalloc_lock = threading.Lock()
+
+
+def parse_profile_kinds(value: Optional[str]) -> frozenset:
+    """
+    Parses the value of the profile header / query parameter.
+
+    Args:
+        value (str, optional): e.g. "cpu", "memory", "cpu,memory" or "1".
+
+    Returns:
+        frozenset: The requested profile kinds (empty if none are valid).
+    """
+    if not value:
+        return frozenset()
+    value = value.strip().lower()
+    if value in ("1", "true", "all"):
+        return frozenset(PROFILE_KINDS)
+    return frozenset(k.strip() for k in value.split(",")) & frozenset(PROFILE_KINDS)
+
+
+def _start_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+        _tracemalloc_users += 1
+
+
+def _stop_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+
+
+class RequestProfile:
+    """
+    CPU and memory profile of a single request.
+
+    The CPU profile covers the blocking work the request hands to the agent and
+    ingestion executors (each call is profiled on its worker thread and the
+    results are merged). The memory profile is a tracemalloc snapshot diff taken
+    around the whole request; tracemalloc is process-wide, so allocations made by
+    concurrent requests show up as well.
+    """
+
+    def __init__(self, kinds: frozenset, label: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.kinds = kinds
+        self.label = label
+        self.cpu_calls = 0
+        self.skipped_calls = 0
+        self._lock = threading.Lock()
+        self._stats: Optional[pstats.Stats] = None
+        self._sessions = []
+        self._snapshot = None
+        self._started = None
+        self.duration = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        if "memory" in self.kinds:
+            _start_tracemalloc()
+            self._snapshot = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+
+    def wrap(self, fn):
+        """
+        Wraps a blocking function so that it runs under the CPU profiler.
+        """
+
+        def profiled(*args, **kwargs):
+            if PROFILER == "pyinstrument":
+                return self._run_pyinstrument(fn, *args, **kwargs)
+            return self._run_cprofile(fn, *args, **kwargs)
+
+        return profiled
+
+    def _run_cprofile(self, fn, *args, **kwargs):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active (only one is allowed on 3.12+)
+            with self._lock:
+                self.skipped_calls += 1
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with self._lock:
+                self.cpu_calls += 1
+                if self._stats is None:
+                    self._stats = pstats.Stats(profiler)
+                else:
+                    self._stats.add(profiler)
+
+    def _run_pyinstrument(self, fn, *args, **kwargs):
+        try:
+            from pyinstrument import Profiler
+        except ImportError as e:
+            raise ImportError(
+                "PROFILER=pyinstrument requires the `pyinstrument` package."
+            ) from e
+        profiler = Profiler(async_mode="disabled")
+        profiler.start()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            session = profiler.stop()
+            with self._lock:
+                self.cpu_calls += 1
+                self._sessions.append(session)
+
+    def finish(self) -> str:
+        """
+        Stops the profile and writes the report to PROFILE_DIR.
+
+        Returns:
+            str: Path of the text report.
+        """
+        self.duration = time.perf_counter() - self._started
+        sections = [
+            f"Profile {self.id}: {self.label}",
+            f"Duration: {self.duration:.3f}s, kinds: {', '.join(sorted(self.kinds))}",
+        ]
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        # Snapshot memory before the CPU report allocates anything
+        memory = self._memory_report() if "memory" in self.kinds else None
+        if "cpu" in self.kinds:
+            sections.append(self._cpu_report())
+        if memory:
+            sections.append(memory)
+
+        path = os.path.join(PROFILE_DIR, f"{self.id}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(sections) + "\n")
+        metrics.inc("profiles_total", kind=",".join(sorted(self.kinds)))
+        logger.info("🔬 Profile %s written to %s (%s)", self.id, path, self.label)
+        return path
+
+    def _cpu_report(self) -> str:
+        header = f"CPU ({PROFILER}, {self.cpu_calls} executor calls profiled"
+        if self.skipped_calls:
+            header += f", {self.skipped_calls} skipped: another profiler was active"
+        header += ")"
+
+        if self._sessions:
+            from pyinstrument.renderers import ConsoleRenderer
+            from pyinstrument.session import Session
+
+            session = reduce(Session.combine, self._sessions)
+            text = ConsoleRenderer(unicode=True, color=False).render(session)
+            return f"{header}\n{text}"
+
+        if self._stats is None:
+            return f"{header}\nNo executor work was profiled."
+        # Raw stats for snakeviz / pstats, next to the text report
+        self._stats.dump_stats(os.path.join(PROFILE_DIR, f"{self.id}.prof"))
+        out = io.StringIO()
+        self._stats.stream = out
+        self._stats.sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+        return f"{header}\n{out.getvalue().strip()}"
+
+    def _memory_report(self) -> str:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        _stop_tracemalloc()
+
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        diff = snapshot.filter_traces(filters).compare_to(
+            self._snapshot.filter_traces(filters), "lineno"
+        )
+        self._snapshot = None
+        growth = sum(stat.size_diff for stat in diff)
+        lines = [
+            f"Memory (tracemalloc, process-wide): {growth / 1024:+.1f} KiB allocated "
+            f"and still held; traced {current / 1024:.1f} KiB, peak during the request "
+            f"{peak / 1024:.1f} KiB",
+        ]
+        lines += [str(stat) for stat in diff[:PROFILE_TOP_N]]
+        return "\n".join(lines)
+
+
+def profiled(fn):
+    """
+    Returns `fn` wrapped in the current request's CPU profile, or `fn` unchanged
+    when the request is not being profiled.
+    """
+    profile = _current_profile.get()
+    if profile is None or "cpu" not in profile.kinds:
+        return fn
+    return profile.wrap(fn)
+
+
+async def profile_requests(request: Request, call_next):
+    """
+    HTTP middleware profiling requests that carry the `X-Profile` header or the
+    `profile` query parameter. The report id is returned in `X-Profile-Id` and the
+    report is written once the response body has been sent.
+    """
+    kinds = parse_profile_kinds(
+        request.headers.get(PROFILE_HEADER)
+        or request.query_params.get(PROFILE_QUERY_PARAM)
+    )
+    if not kinds:
+        return await call_next(request)
+
+    profile = RequestProfile(kinds, f"{request.method} {request.url.path}")
+    profile.start()
+    token = _current_profile.set(profile)
+    try:
+        response = await call_next(request)
+    except BaseException:
+        profile.finish()
+        raise
+    finally:
+        _current_profile.reset(token)
+
+    body = response.body_iterator
+
+    async def body_then_finish():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            profile.finish()
+
+    response.body_iterator = body_then_finish()
+    response.headers["X-Profile-Id"] = profile.id
+    return response
+
+
+def get_profile_report(profile_id: str) -> Optional[str]:
+    """
+    Returns a written profile report, or None if it does not exist.
+    """
+    if not profile_id.isalnum():
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.txt")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def get_process_memory_stats() -> dict:
+    """
+    Returns process-level memory statistics (RSS, garbage collector, tracemalloc).
+    """
+    stats = {"pid": os.getpid()}
+    try:
+        with open("/proc/self/statm") as f:
+            stats["rss_bytes"] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+
+        # ru_maxrss is in KiB on Linux and in bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        stats["peak_rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:  # Windows
+        pass
+    stats["threads"] = threading.active_count()
+    stats["gc"] = {"counts": gc.get_count(), "tracked_objects": len(gc.get_objects())}
+    stats["tracemalloc"] = {"tracing": tracemalloc.is_tracing()}
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        stats["tracemalloc"].update(current_bytes=current, peak_bytes=peak)
+    return stats
@@ -1,21 +1,97 @@
 import os
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
+from llama_index.core.vector_stores.types import (
+    VectorStoreQuery,
+    VectorStoreQueryMode,
+    VectorStoreQueryResult,
+)
+from llama_index.vector_stores.qdrant import QdrantVectorStore
+from pydantic import PrivateAttr
 from qdrant_client import QdrantClient
+from qdrant_client.http import models as rest
 from qdrant_client.http.models import Distance, VectorParams
 
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Where vectors live: "remote" (Qdrant server or Cloud at QDRANT_HOST), "local"
+# (embedded in this process, persisted under QDRANT_PATH) or "memory" (embedded,
+# not persisted). Embedded modes search in-process with exact NumPy scoring and
+# allow a single process per QDRANT_PATH.
+VECTOR_STORE_MODE = os.getenv("VECTOR_STORE_MODE", "remote").lower()
+VECTOR_STORE_MODES = ("remote", "local", "memory")
+EMBEDDED_VECTOR_STORE = VECTOR_STORE_MODE in ("local", "memory")
+QDRANT_PATH = os.getenv("QDRANT_PATH", "./qdrant_data")
 QDRANT_HOST = os.getenv("QDRANT_HOST")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
 QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "langgraph-rag-vectordb")
+# Suffix the collection name with the embedding model, so re-embedded collections
+# can be built side by side and switched to by changing the model configuration
+QDRANT_COLLECTION_PER_MODEL = (
+    os.getenv("QDRANT_COLLECTION_PER_MODEL", "false").lower() == "true"
+)
+
+# Storage layout, applied when the collection is created
+QDRANT_QUANTIZATION = os.getenv("QDRANT_QUANTIZATION", "none").lower()
+QDRANT_QUANTIZATION_ALWAYS_RAM = (
+    os.getenv("QDRANT_QUANTIZATION_ALWAYS_RAM", "true").lower() == "true"
+)
+QDRANT_ON_DISK_VECTORS = os.getenv("QDRANT_ON_DISK_VECTORS", "false").lower() == "true"
+QDRANT_ON_DISK_PAYLOAD = os.getenv("QDRANT_ON_DISK_PAYLOAD", "false").lower() == "true"
+QDRANT_HNSW_M = os.getenv("QDRANT_HNSW_M")
+QDRANT_HNSW_EF_CONSTRUCT = os.getenv("QDRANT_HNSW_EF_CONSTRUCT")
+QDRANT_HNSW_ON_DISK = os.getenv("QDRANT_HNSW_ON_DISK", "false").lower() == "true"
+
+# Search-time parameters
+QDRANT_SEARCH_EF = os.getenv("QDRANT_SEARCH_EF")
+QDRANT_SEARCH_RESCORE = os.getenv("QDRANT_SEARCH_RESCORE", "true").lower() == "true"
+QDRANT_SEARCH_OVERSAMPLING = float(os.getenv("QDRANT_SEARCH_OVERSAMPLING", "2.0"))
 
+# Serializes collection/index creation between concurrent ingestions in this process
+_schema_lock = threading.Lock()
 
+
+@lru_cache(maxsize=1)
 def get_qdrant_client() -> QdrantClient:
     """
-    Initializes and returns a Qdrant client instance using credentials from environment variables.
+    Returns the process-wide Qdrant client (created on first use with credentials
+    from environment variables), so its connection pool is reused across calls.
+    In the embedded modes the client holds the collections itself.
     """
+    if VECTOR_STORE_MODE == "local":
+        logger.info(f"📁 Using embedded Qdrant storage at {QDRANT_PATH}")
+        return QdrantClient(path=QDRANT_PATH)
+    if VECTOR_STORE_MODE == "memory":
+        logger.info("🧪 Using in-memory Qdrant storage (not persisted)")
+        return QdrantClient(location=":memory:")
+    if VECTOR_STORE_MODE != "remote":
+        raise ValueError(
+            f"❌ Unsupported VECTOR_STORE_MODE: {VECTOR_STORE_MODE} "
+            f"(expected one of {VECTOR_STORE_MODES})"
+        )
     return QdrantClient(url=QDRANT_HOST, api_key=QDRANT_API_KEY)
 
 
-def qdrant_collection_exists() -> bool:
+def get_collection_name(
+    model_slug: Optional[str] = None, per_model: bool = QDRANT_COLLECTION_PER_MODEL
+) -> str:
+    """
+    Returns the collection name for an embedding model.
+
+    Args:
+        model_slug (str, optional): Embedding model identifier (see `get_embedding_slug`).
+        per_model (bool): Whether to suffix the name with the model identifier.
+    """
+    if per_model and model_slug:
+        return f"{QDRANT_COLLECTION}--{model_slug}"
+    return QDRANT_COLLECTION
+
+
+def qdrant_collection_exists(collection_name: str = QDRANT_COLLECTION) -> bool:
     """
     Checks whether the target vector collection exists in the Qdrant instance.
 
@@ -23,38 +99,214 @@ def qdrant_collection_exists() -> bool:
         bool: True if the collection exists, False otherwise.
     """
     client = get_qdrant_client()
-    return client.collection_exists(collection_name=QDRANT_COLLECTION)
+    return client.collection_exists(collection_name=collection_name)
 
 
-def ensure_collection_exists():
+def get_alias_target(alias_name: str) -> Optional[str]:
     """
-    Ensures that the target collection exists in Qdrant.
-    If it does not exist, it creates (or recreates) the collection
-    with a predefined vector configuration.
+    Returns the collection an alias points to, or None if the name is no alias
+    (e.g. a plain collection). Restored snapshots are served through aliases.
+    """
+    for alias in get_qdrant_client().get_aliases().aliases:
+        if alias.alias_name == alias_name:
+            return alias.collection_name
+    return None
+
 
-    Notes:
-        - Vector size is hardcoded to 1536 (for OpenAI embeddings).
-        - Uses cosine distance as the similarity metric.
+def delete_collection(collection_name: str = QDRANT_COLLECTION):
+    """
+    Deletes a collection, or the collection behind an alias (with the alias).
     """
     client = get_qdrant_client()
-    if not client.collection_exists(QDRANT_COLLECTION):
-        client.recreate_collection(
-            collection_name=QDRANT_COLLECTION,
-            vectors_config=VectorParams(size=1536, distance=Distance.COSINE),
+    client.delete_collection(get_alias_target(collection_name) or collection_name)
+
+
+def get_collection_vector_size(collection_name: str = QDRANT_COLLECTION) -> int:
+    """
+    Returns the dense vector size of an existing collection.
+    """
+    vectors = get_qdrant_client().get_collection(collection_name).config.params.vectors
+    if isinstance(vectors, dict):
+        vectors = next(iter(vectors.values()))
+    return vectors.size
+
+
+def build_quantization_config(
+    quantization: str = QDRANT_QUANTIZATION,
+) -> Optional[rest.QuantizationConfig]:
+    """
+    Builds the quantization config for the collection ('none', 'scalar' or 'binary').
+    Scalar quantization stores int8 vectors (~4x smaller); binary stores 1 bit per
+    dimension (~32x smaller) and relies on rescoring with the original vectors.
+    """
+    if quantization == "scalar":
+        return rest.ScalarQuantization(
+            scalar=rest.ScalarQuantizationConfig(
+                type=rest.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=QDRANT_QUANTIZATION_ALWAYS_RAM,
+            )
+        )
+    if quantization == "binary":
+        return rest.BinaryQuantization(
+            binary=rest.BinaryQuantizationConfig(
+                always_ram=QDRANT_QUANTIZATION_ALWAYS_RAM
+            )
         )
+    if quantization != "none":
+        raise ValueError(f"❌ Unsupported quantization: {quantization}")
+    return None
 
 
-# TODO: Remove duplicate function
+def build_hnsw_config() -> Optional[rest.HnswConfigDiff]:
+    """
+    Builds the HNSW index config from environment overrides (None keeps Qdrant defaults).
+    """
+    if not (QDRANT_HNSW_M or QDRANT_HNSW_EF_CONSTRUCT or QDRANT_HNSW_ON_DISK):
+        return None
+    return rest.HnswConfigDiff(
+        m=int(QDRANT_HNSW_M) if QDRANT_HNSW_M else None,
+        ef_construct=(
+            int(QDRANT_HNSW_EF_CONSTRUCT) if QDRANT_HNSW_EF_CONSTRUCT else None
+        ),
+        on_disk=QDRANT_HNSW_ON_DISK or None,
+    )
 
 
-def create_collection(vector_size: int = 1536):  # TODO: Make this configurable.
+def get_search_params(
+    hnsw_ef: Optional[int] = None, quantization: str = QDRANT_QUANTIZATION
+) -> Optional[rest.SearchParams]:
+    """
+    Returns the search-time parameters (HNSW ef, quantization rescoring),
+    or None when Qdrant defaults apply.
+    """
+    hnsw_ef = hnsw_ef or (int(QDRANT_SEARCH_EF) if QDRANT_SEARCH_EF else None)
+    quantization_params = None
+    if quantization != "none":
+        quantization_params = rest.QuantizationSearchParams(
+            rescore=QDRANT_SEARCH_RESCORE,
+            oversampling=QDRANT_SEARCH_OVERSAMPLING,
+        )
+    if hnsw_ef is None and quantization_params is None:
+        return None
+    return rest.SearchParams(hnsw_ef=hnsw_ef, quantization=quantization_params)
+
+
+def create_collection(vector_size: int, collection_name: str = QDRANT_COLLECTION):
     """
     Ensures the target Qdrant collection exists.
-    Creates it if missing, with the appropriate vector settings.
+    Creates it if missing, with the configured vector storage, quantization
+    and HNSW settings.
+
+    Args:
+        vector_size (int): Dimension of the embedding model's vectors.
+        collection_name (str): Collection to create.
     """
     client = get_qdrant_client()
-    if not client.collection_exists(collection_name=QDRANT_COLLECTION):
-        client.recreate_collection(
-            collection_name=QDRANT_COLLECTION,
-            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+    with _schema_lock:
+        if client.collection_exists(collection_name=collection_name):
+            return
+        logger.info(
+            "🆕 Creating Qdrant collection %s (dimension: %d)",
+            collection_name,
+            vector_size,
+        )
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=VectorParams(
+                size=vector_size,
+                distance=Distance.COSINE,
+                on_disk=QDRANT_ON_DISK_VECTORS,
+            ),
+            hnsw_config=build_hnsw_config(),
+            quantization_config=build_quantization_config(),
+            on_disk_payload=QDRANT_ON_DISK_PAYLOAD,
+        )
+
+
+def create_payload_indexes(
+    schema: Dict[str, str], collection_name: str = QDRANT_COLLECTION
+):
+    """
+    Creates payload indexes for filtered search (no-op for existing indexes,
+    and in the embedded modes, which filter by scanning the payloads).
+
+    Args:
+        schema (dict): Payload field -> index type ('keyword', 'integer', 'text', ...).
+        collection_name (str): Collection to index.
+    """
+    if EMBEDDED_VECTOR_STORE:
+        return
+    client = get_qdrant_client()
+    with _schema_lock:
+        existing = client.get_collection(collection_name).payload_schema or {}
+        for field_name, field_type in schema.items():
+            if field_name not in existing:
+                client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=rest.PayloadSchemaType(field_type),
+                )
+                logger.info(f"🗂️ Created {field_type} payload index on {field_name}")
+
+
+class TunedQdrantVectorStore(QdrantVectorStore):
+    """
+    QdrantVectorStore that applies search-time parameters (HNSW ef,
+    quantization rescoring/oversampling) to dense similarity searches.
+    """
+
+    _search_params: Optional[rest.SearchParams] = PrivateAttr(default=None)
+
+    def __init__(self, *args: Any, search_params=None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._search_params = search_params
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        if (
+            self._search_params is None
+            or self.enable_hybrid
+            or query.mode != VectorStoreQueryMode.DEFAULT
+        ):
+            return super().query(query, **kwargs)
+
+        query_filter = kwargs.get("qdrant_filters") or self._build_query_filter(query)
+        response = self._client.search(
+            collection_name=self.collection_name,
+            query_vector=rest.NamedVector(
+                name=self.dense_vector_name, vector=query.query_embedding
+            ),
+            limit=query.similarity_top_k,
+            query_filter=query_filter,
+            search_params=self._search_params,
         )
+        return self.parse_to_query_result(response)
+
+    def delete_ref_docs(self, ref_doc_ids: List[str]) -> None:
+        """
+        Deletes the nodes of several source documents in a single request.
+        """
+        if not ref_doc_ids:
+            return
+        self._client.delete(
+            collection_name=self.collection_name,
+            points_selector=rest.Filter(
+                must=[
+                    rest.FieldCondition(
+                        key="doc_id", match=rest.MatchAny(any=list(ref_doc_ids))
+                    )
+                ]
+            ),
+        )
+
+
+def get_vector_store(collection_name: str = QDRANT_COLLECTION) -> QdrantVectorStore:
+    """
+    Returns the vector store for the target collection, configured with the
+    search-time parameters (none in the embedded modes, which always score exactly).
+    """
+    return TunedQdrantVectorStore(
+        client=get_qdrant_client(),
+        collection_name=collection_name,
+        search_params=None if EMBEDDED_VECTOR_STORE else get_search_params(),
+    )
@@ -0,0 +1,85 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share the same key.
+
+    The first caller for a key (the leader) executes the function; callers that
+    arrive while it is still running wait on the same future and receive its
+    result (or exception). Nothing is cached once the call completes.
+
+    Args:
+        name (str): Group name used to label the coalescing metrics.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._inflight: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Executes `fn` once per in-flight key and shares the outcome.
+
+        Args:
+            key (Hashable): Identity of the call; equal keys are coalesced.
+            fn (Callable): Zero-argument function performing the actual work.
+
+        Returns:
+            Any: The result of `fn`, either computed or shared from the leader.
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_leader:
+            metrics.inc("singleflight_coalesced_total", group=self.name)
+            logger.debug("🔗 Coalesced in-flight call for group %s", self.name)
+            return future.result()
+
+        metrics.inc("singleflight_executions_total", group=self.name)
+        try:
+            result = fn()
+        except BaseException as e:
+            self._forget(key)
+            future.set_exception(e)
+            raise
+        self._forget(key)
+        future.set_result(result)
+        return result
+
+    def _forget(self, key: Hashable):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        """
+        Returns execution/coalescing counts and the coalescing rate for this group.
+        """
+        executed = metrics.get("singleflight_executions_total", group=self.name)
+        coalesced = metrics.get("singleflight_coalesced_total", group=self.name)
+        total = executed + coalesced
+        return {
+            "executions": executed,
+            "coalesced": coalesced,
+            "coalescing_rate": coalesced / total if total else 0.0,
+        }
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizes a free-text query for coalescing/caching keys
+    (case-folded, whitespace collapsed).
+    """
+    return " ".join(str(query).lower().split())
@@ -1,11 +1,32 @@
+import itertools
+import json
 import requests
 import streamlit as st
 import os
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 import uuid
 
 load_dotenv()
 BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+# (connect, read) timeouts in seconds; ingestion can take much longer than a chat turn
+API_TIMEOUT = (float(os.getenv("API_CONNECT_TIMEOUT", "5")), float(os.getenv("API_READ_TIMEOUT", "120")))
+INGEST_TIMEOUT = (API_TIMEOUT[0], float(os.getenv("API_INGEST_TIMEOUT", "600")))
+
+
+@st.cache_resource
+def get_http_session():
+    """
+    One pooled keep-alive session per Streamlit server process, shared across reruns and users.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=int(os.getenv("API_POOL_SIZE", "20")))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+http = get_http_session()
 
 if 'chat_session_id' not in st.session_state:
     st.session_state.chat_session_id = str(uuid.uuid4())
@@ -17,7 +38,11 @@ if 'vector_store_ready' not in st.session_state:
 st.set_page_config(page_title="Langchain RAG Agent", layout="centered")
 st.title('LangGraph Agent Chat App')
 
-with st.expander("📥 Ingest Custom Data into Vector Store (if required)", expanded=False):
+@st.fragment
+def ingestion_panel():
+    """
+    Runs as a fragment: its widgets rerun only this panel, not the chat history.
+    """
     st.markdown("##### Select a Data Source")
     source_type = st.selectbox("Select data source type:", ["website", "docs", "sql"])
 
@@ -26,10 +51,10 @@ with st.expander("📥 Ingest Custom Data into Vector Store (if required)", expa
         if st.button("Ingest and Update Vector Store"):
             if source_path:
                 with st.spinner("Ingesting and updating vector store..."):
-                    response = requests.post(f"{BASE_URL}/vectordb/create", json={
+                    response = http.post(f"{BASE_URL}/vectordb/create", json={
                         "source_type": source_type,
                         "source_path": source_path
-                    })
+                    }, timeout=INGEST_TIMEOUT)
                     if response.ok and "message" in response.json():
                         st.success("✅ Vector store updated successfully!")
                         st.session_state.vector_store_ready = True
@@ -38,20 +63,25 @@ with st.expander("📥 Ingest Custom Data into Vector Store (if required)", expa
             else:
                 st.warning("⚠️ Please enter a valid source path.")
     else:
-        uploaded_file = st.file_uploader("Upload a file (PDF, TXT, DOCX, DB, etc.):", type=["pdf", "txt", "docx", "db"])
-        if st.button("Upload and Ingest File"):
-            if uploaded_file:
-                with st.spinner("Uploading and indexing file..."):
-                    files = {"file": (uploaded_file.name, uploaded_file.getvalue())}
-                    response = requests.post(f"{BASE_URL}/vectordb/upload", files=files)
+        uploaded_files = st.file_uploader("Upload files (PDF, TXT, DOCX, DB, etc.):", type=["pdf", "txt", "docx", "db"], accept_multiple_files=True)
+        if st.button("Upload and Ingest Files"):
+            if uploaded_files:
+                with st.spinner("Uploading and indexing files..."):
+                    files = [("files", (f.name, f.getvalue())) for f in uploaded_files]
+                    response = http.post(f"{BASE_URL}/vectordb/upload", files=files, timeout=INGEST_TIMEOUT)
                     if response.ok and "message" in response.json():
                         st.success(f"✅ {response.json()['message']}")
+                        for result in response.json().get("files", []):
+                            if "error" in result:
+                                st.error(f"❌ {result['filename']}: {result['error']}")
                         st.session_state.vector_store_ready = True
                     else:
                         st.error(f"❌ Upload failed. {response.json().get('error', '')}")
             else:
-                st.warning("⚠️ Please upload a valid file.")
+                st.warning("⚠️ Please upload at least one valid file.")
 
+with st.expander("📥 Ingest Custom Data into Vector Store (if required)", expanded=False):
+    ingestion_panel()
 
 if st.button("🧹 Clear Chat"):
     st.session_state.chat_history = []
@@ -65,10 +95,11 @@ model_label_map = {
 model_choice_label = st.selectbox("Choose a model:", list(model_label_map.keys()))
 model_choice = model_label_map[model_choice_label]
 
-def render_response(response_data):
+def render_details(response_data):
+    """
+    Tools, retrieved data and intermediate steps of one response (latest turn only).
+    """
     if "final_output" in response_data:
-        st.chat_message("assistant").markdown(response_data["final_output"])
-
         with st.expander("🛠 Tools Used", expanded=False):
             if response_data.get("tools_used"):
                 for tool in response_data["tools_used"]:
@@ -101,32 +132,73 @@ def render_response(response_data):
             else:
                 st.markdown("_None_")
 
-for chat in st.session_state.chat_history:
-    st.chat_message("user").markdown(chat["user"])
-    render_response(chat["response"])
+def render_summary(response_data):
+    """
+    Compact one-line summary for earlier turns, so reruns stay cheap as the chat grows.
+    """
+    tools = ", ".join(dict.fromkeys(response_data.get("tools_used") or [])) or "none"
+    latency = sum(step.get("latency_ms", 0) for step in response_data.get("llm_steps", []))
+    st.caption(f"🛠 Tools: {tools} · ⏱️ LLM {latency / 1000:.1f}s")
+
+
+def stream_agent(prompt, result):
+    """
+    Yields answer tokens from /agent/stream; the final payload is stored in `result`.
+    """
+    with http.post(
+        f"{BASE_URL}/agent/stream",
+        json={
+            "input": prompt,
+            "model": model_choice,
+            "session_id": st.session_state.chat_session_id
+        },
+        stream=True,
+        timeout=API_TIMEOUT,
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            if event["type"] == "token":
+                yield event["content"]
+            elif event["type"] == "result":
+                result.update(event)
+            elif event["type"] == "error":
+                raise RuntimeError(event["detail"])
+
 
 prompt = st.chat_input("Enter your question...")
+
+# Earlier turns: answer text and a summary line; full details only for the latest one
+for idx, chat in enumerate(st.session_state.chat_history):
+    st.chat_message("user").markdown(chat["user"])
+    with st.chat_message("assistant"):
+        st.markdown(chat["response"].get("final_output") or "")
+        if idx == len(st.session_state.chat_history) - 1 and not prompt:
+            render_details(chat["response"])
+        else:
+            render_summary(chat["response"])
+
 if prompt:
     st.chat_message("user").markdown(prompt)
 
-    with st.spinner("Thinking..."):
+    with st.chat_message("assistant"):
+        result = {}
         try:
-            response = requests.post(
-                f"{BASE_URL}/agent/invoke",
-                json={
-                    "input": {"input": prompt},
-                    "model": model_choice,
-                    "session_id": st.session_state.chat_session_id
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
+            # Render tokens as they arrive instead of waiting for the whole answer
+            tokens = stream_agent(prompt, result)
+            with st.spinner("Thinking..."):
+                first = next(tokens, "")
+            streamed = st.write_stream(itertools.chain([first], tokens))
+            if not streamed and result.get("final_output"):
+                st.markdown(result["final_output"])
 
             st.session_state.chat_history.append({
                 "user": prompt,
-                "response": data
+                "response": result
             })
-            render_response(data)
+            render_details(result)
 
         except Exception as e:
             st.error(f"❌ Error occurred: {e}")